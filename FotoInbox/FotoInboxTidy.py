@@ -1,110 +1,514 @@
+import argparse
 import datetime
+import json
 import logging
 import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Define paths
 FOTO_INBOX_DIR = '/Users/fluffyoctopus/Documents/FotoInbox'
 FOTOS_DIR = '/Users/fluffyoctopus/kDrive/Common documents/Fotos'
+# Directory listings of the last run, so unchanged folders of the library are not listed again
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.fotos_manifest.json')
 
+# Only JPGs modified within this window are matched
+RECENCY_WINDOW = datetime.timedelta(days=1)
 
-def find_jpg_match(raw_filename):
+# Journal of the last run in the inbox, used to resume or undo it
+JOURNAL_NAME = '.fotoinbox_journal.jsonl'
+
+# Concurrent copies when the inbox and the library are on different filesystems
+MOVE_WORKERS = 4
+
+
+def load_manifest(manifest_path, fotos_dir, since):
+    """
+    Load the directory manifest of the last scan, if it still applies.
+
+    It only applies to the same Fotos directory and a recency window that is not larger than the
+    one it was built with, because older JPGs were never recorded.
+    """
+    if not manifest_path or not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('root') != fotos_dir or manifest.get('since', float('inf')) > since:
+        return {}
+    return manifest.get('dirs', {})
+
+
+def save_manifest(manifest_path, fotos_dir, since, dirs):
+    tmp_path = f'{manifest_path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump({'root': fotos_dir, 'since': since, 'dirs': dirs}, file)
+    os.replace(tmp_path, manifest_path)
+
+
+def build_jpg_index(fotos_dir=FOTOS_DIR, since=None, manifest_path=None, rescan=False, update_manifest=True):
+    """
+    Index all JPGs in the Fotos directory structure in one os.scandir pass.
+
+    With a manifest_path, every directory's mtime, subdirectories and recent JPGs are persisted.
+    A directory whose mtime did not change since the last run is neither listed again nor are its
+    files stat'ed, only the directory itself is. Adding, removing or renaming a file changes the
+    mtime of its directory, so new exports are always found. A JPG overwritten in place does not
+    change it though, such a re-export is only found with rescan. That is the trade-off: checking
+    every JPG on every run would cost the full walk the manifest exists to avoid.
+
+    Args:
+        since (float, optional): Only index JPGs modified after this timestamp, defaults to RECENCY_WINDOW ago
+        manifest_path (str, optional): Where to persist the directory manifest between runs
+        rescan (bool): List every directory again, the manifest is only written
+        update_manifest (bool): Write the manifest, False leaves it untouched (dry runs)
+
+    Returns:
+        dict: lowercase filename -> list of paths, in directory traversal order
+    """
+    if since is None:
+        since = (datetime.datetime.now() - RECENCY_WINDOW).timestamp()
+
+    known_dirs = {} if rescan else load_manifest(manifest_path, fotos_dir, since)
+    dirs = {}
+    jpg_index = {}
+    stack = [fotos_dir]
+    while stack:
+        directory = stack.pop()
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            continue
+
+        known = known_dirs.get(directory)
+        if known and known['mtime'] == mtime:
+            subdirs = known['subdirs']
+            jpgs = {name: jpg_mtime for name, jpg_mtime in known['jpgs'].items() if jpg_mtime > since}
+        else:
+            subdirs, jpgs = scan_directory(directory, since)
+        dirs[directory] = {'mtime': mtime, 'subdirs': subdirs, 'jpgs': jpgs}
+
+        for name in jpgs:
+            jpg_index.setdefault(name.lower(), []).append(os.path.join(directory, name))
+        # visit subdirectories in listing order, like os.walk
+        stack.extend(reversed(subdirs))
+
+    if manifest_path and update_manifest:
+        save_manifest(manifest_path, fotos_dir, since, dirs)
+    return jpg_index
+
+
+def scan_directory(directory, since):
+    """
+    Returns:
+        tuple: (subdirectory paths, {jpg filename: mtime} of the JPGs modified after since)
+    """
+    subdirs = []
+    jpgs = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.lower().endswith('.jpg'):
+                        jpg_mtime = entry.stat().st_mtime
+                        if jpg_mtime > since:
+                            jpgs[entry.name] = jpg_mtime
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return subdirs, jpgs
+
+
+def find_jpg_match(raw_filename, jpg_index=None):
     """Find the matching JPG file in the Fotos directory structure."""
+    if jpg_index is None:
+        since = (datetime.datetime.now() - RECENCY_WINDOW).timestamp()
+        jpg_index = build_jpg_index(FOTOS_DIR, since, MANIFEST_PATH)
+
     # Get the base name without extension
     base_name = os.path.splitext(os.path.basename(raw_filename))[0]
 
     # Create the jpg filename pattern to search for
     jpg_filename = f"{base_name}.jpg"
 
-    # Search for the jpg file in all subdirectories
-    jpg_matches = []
-    for root, dirs, files in os.walk(FOTOS_DIR):
-        for file in files:
-            if file.lower() == jpg_filename.lower():
-                # if file was modified in the last 24h, only then add it
-                file_path = os.path.join(root, file)
-                if os.path.getmtime(file_path) > (datetime.datetime.now() - datetime.timedelta(days=1)).timestamp():
-                    jpg_matches.append(os.path.join(root, file))
+    return list(jpg_index.get(jpg_filename.lower(), []))
+
 
-    return jpg_matches
+def list_subdirectories(path):
+    """Names of all subdirectories of path, in listing order."""
+    try:
+        with os.scandir(path) as entries:
+            return [entry.name for entry in entries if entry.is_dir()]
+    except OSError:
+        return []
 
 
-def find_closest_raw_folder(jpg_path):
-    """Find the closest RAW folder starting from the JPG's path and going up."""
+def find_closest_raw_folder(jpg_path, cache=None):
+    """
+    Find the closest RAW folder starting from the JPG's path and going up.
+
+    Args:
+        cache (dict, optional): directory -> resolved RAW folder (or None), shared by all files of a
+                                run so every directory is listed at most once
+    """
+    if cache is None:
+        cache = {}
     path = Path(jpg_path).parent
+    visited = []
+    raw_folder = None
 
     while str(path).startswith(FOTOS_DIR):
+        if path in cache:
+            raw_folder = cache[path]
+            break
+        visited.append(path)
+
+        subdirs = list_subdirectories(path)
         # Check if this directory has a RAW subfolder
-        raw_dir = path / "RAW"
-        if raw_dir.exists() and raw_dir.is_dir():
-            return raw_dir
+        if "RAW" in subdirs:
+            raw_folder = path / "RAW"
+            break
 
         # Check if this directory has any subfolder containing "RAW" in its name
-        for item in path.iterdir():
-            if item.is_dir() and "RAW" in item.name.upper():
-                return item
+        raw_folder = next((path / name for name in subdirs if "RAW" in name.upper()), None)
+        if raw_folder:
+            break
 
         # Move up one directory
         path = path.parent
 
-    return None
+    # every directory on the way up resolves to the same folder, including negative results
+    for directory in visited:
+        cache[directory] = raw_folder
+    return raw_folder
 
 
-def process_inbox():
-    """Process all files in the FotoInbox directory."""
+def is_same_device(src, dest):
+    """True if dest (which may not exist yet) is on the same filesystem as src, so a rename is enough."""
+    try:
+        return os.stat(src).st_dev == os.stat(os.path.dirname(dest) or '.').st_dev
+    except OSError:
+        return False
+
+
+def copy_and_remove(src, dest):
+    """Move a file across filesystems: copy to a temp file next to dest, verify the size, then unlink src."""
+    tmp_dest = f'{dest}.part'
+    try:
+        # copyfile uses sendfile (Linux) or fcopyfile (macOS) instead of a userspace copy loop
+        shutil.copyfile(src, tmp_dest)
+        shutil.copystat(src, tmp_dest)
+        src_size, dest_size = os.path.getsize(src), os.path.getsize(tmp_dest)
+        if src_size != dest_size:
+            raise OSError(f'Size mismatch after copy: {src_size} != {dest_size} bytes')
+        os.replace(tmp_dest, dest)
+    except BaseException:
+        if os.path.exists(tmp_dest):
+            os.remove(tmp_dest)
+        raise
+    os.remove(src)
+
+
+def move_file(src, dest):
+    if is_same_device(src, dest):
+        os.replace(src, dest)
+    else:
+        copy_and_remove(src, dest)
+
+
+def move_files(jobs, max_workers=MOVE_WORKERS, on_moved=None):
+    """
+    Execute moves concurrently: renames on the same filesystem, otherwise copies in a bounded thread pool.
+
+    Args:
+        jobs (list): Every job is a list of (src, dest) pairs that are moved in order, the job stops
+                     at its first failure (e.g. the sidecar is not moved if its RAW could not be)
+
+    Returns:
+        list: (moved pairs, error or None) per job, in the order of jobs
+    """
+    def run(job):
+        moved = []
+        try:
+            for src, dest in job:
+                move_file(src, dest)
+                moved.append((src, dest))
+                if on_moved:
+                    on_moved(src, dest)
+        except Exception as e:
+            return moved, e
+        return moved, None
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(run, jobs))
+
+
+def plan_inbox(recency_window=RECENCY_WINDOW, update_manifest=True, rescan=False):
+    """
+    Match all RAW files in the FotoInbox directory without moving anything.
+
+    Args:
+        update_manifest (bool): Persist the directory manifest, False for dry runs
+        rescan (bool): Ignore the manifest and list the whole Fotos directory, finds JPGs that were
+                       re-exported in place of an older file (unmatched RAWs are deleted)
+
+    Returns:
+        dict: moves (raw, jpg and the [src, dest] pairs of the RAW and its .dop), no_match (RAWs without
+              a recent JPG), no_raw_folder (RAWs whose JPG has no RAW folder nearby) and conflicts
+              (RAWs whose destination already exists or is claimed by another RAW)
+    """
     # Get all .ARW files
     raw_files = [f for f in os.listdir(FOTO_INBOX_DIR)
                  if f.lower().endswith('.arw') and not f.lower().endswith('.dop')]
 
-    moved_files = []
-    no_match_found = []
+    plan = {'moves': [], 'no_match': [], 'no_raw_folder': [], 'conflicts': []}
+    destinations = set()
+
+    # One walk of the Fotos directory for all RAW files
+    since = (datetime.datetime.now() - recency_window).timestamp()
+    jpg_index = build_jpg_index(FOTOS_DIR, since, MANIFEST_PATH, rescan, update_manifest)
+    raw_folder_cache = {}
 
-    for raw_file in raw_files:
+    for raw_file in sorted(raw_files):
         raw_path = os.path.join(FOTO_INBOX_DIR, raw_file)
         dop_file = raw_file + '.dop'
         dop_path = os.path.join(FOTO_INBOX_DIR, dop_file)
 
         # Find matching JPG files
-        jpg_matches = find_jpg_match(raw_file)
+        jpg_matches = find_jpg_match(raw_file, jpg_index)
 
         if not jpg_matches:
-            no_match_found.append(raw_file)
+            plan['no_match'].append(raw_file)
             continue
 
         # If multiple matches, use the first one
         jpg_path = jpg_matches[0]
 
         # Find closest RAW folder
-        raw_folder = find_closest_raw_folder(jpg_path)
+        raw_folder = find_closest_raw_folder(jpg_path, raw_folder_cache)
 
         if not raw_folder:
+            plan['no_raw_folder'].append(raw_file)
             continue
 
-        # Move the RAW file
-        dest_raw_path = os.path.join(raw_folder, raw_file)
-        try:
-            shutil.move(raw_path, dest_raw_path)
-            moved_files.append(raw_file)
-
-            # Move the DOP file if it exists
-            if os.path.exists(dop_path):
-                dest_dop_path = os.path.join(raw_folder, dop_file)
-                shutil.move(dop_path, dest_dop_path)
-                moved_files.append(dop_file)
-        except Exception as e:
-            print(f"Error moving {raw_file}: {str(e)}")
+        # Move the RAW file, then the DOP file if it exists
+        files = [[raw_path, os.path.join(raw_folder, raw_file)]]
+        if os.path.exists(dop_path):
+            files.append([dop_path, os.path.join(raw_folder, dop_file)])
+
+        for _, dest in files:
+            if os.path.exists(dest):
+                plan['conflicts'].append({'raw': raw_file, 'dest': dest, 'reason': 'destination exists'})
+                break
+            if dest in destinations:
+                plan['conflicts'].append({'raw': raw_file, 'dest': dest, 'reason': 'destination claimed twice'})
+                break
+        else:
+            destinations.update(dest for _, dest in files)
+            plan['moves'].append({'raw': raw_file, 'jpg': jpg_path, 'files': files})
+
+    return plan
+
+
+def format_plan(plan):
+    """Human readable plan, the dry-run output."""
+    lines = []
+    for move in plan['moves']:
+        for src, dest in move['files']:
+            lines.append(f"move {os.path.basename(src)} -> {dest}")
+    for conflict in plan['conflicts']:
+        lines.append(f"skip {conflict['raw']}: {conflict['reason']} ({conflict['dest']})")
+    for raw_file in plan['no_raw_folder']:
+        lines.append(f"skip {raw_file}: no RAW folder near its JPG")
+    lines.append(f"{len(plan['moves'])} to move, {len(plan['conflicts'])} conflicts, "
+                 f"{len(plan['no_raw_folder'])} without RAW folder, {len(plan['no_match'])} without match")
+    return '\n'.join(lines)
+
+
+def get_journal_path():
+    return os.path.join(FOTO_INBOX_DIR, JOURNAL_NAME)
+
+
+def read_journal(journal_path):
+    """
+    Returns:
+        dict: plan, moved ((src, dest) pairs in order that are moved now, a pair undone since is
+              left out until it is moved again) and done of the journaled run, or None if there is
+              no journal
+    """
+    if not os.path.exists(journal_path):
+        return None
+    state = {'plan': None, 'moved': [], 'done': False}
+    with open(journal_path, 'r', encoding='utf-8') as journal:
+        for line in journal:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # the last line of an interrupted run may be incomplete
+                continue
+            if record['type'] == 'plan':
+                state['plan'] = record['plan']
+            elif record['type'] == 'moved':
+                state['moved'].append((record['src'], record['dest']))
+            elif record['type'] == 'undone':
+                pair = (record['src'], record['dest'])
+                if pair in state['moved']:
+                    state['moved'].remove(pair)
+            elif record['type'] == 'done':
+                state['done'] = True
+    return state
+
+
+def open_journal(journal_path):
+    """Open the journal for appending, after terminating a line an interrupted run left incomplete."""
+    journal = open(journal_path, 'a+', encoding='utf-8')
+    if journal.tell():
+        journal.seek(journal.tell() - 1)
+        if journal.read(1) != '\n':
+            journal.write('\n')
+    return journal
+
+
+def write_journal_record(journal, record):
+    journal.write(json.dumps(record) + '\n')
+    journal.flush()
+    os.fsync(journal.fileno())
+
+
+def execute_plan(plan, journal_path, already_moved=()):
+    """
+    Apply a plan in one batch, every finished move is appended to the journal right away.
+
+    Moves that are already journaled, or whose source is gone while the destination exists (the
+    move finished but was not journaled anymore), are skipped, so an interrupted run can be resumed.
+
+    Returns:
+        tuple: (names of all moved files, names of the files that could not be moved)
+    """
+    already_moved = {tuple(pair) for pair in already_moved}
+    moved_files = [os.path.basename(src) for src, _ in already_moved]
+    jobs = []
+    for move in plan['moves']:
+        job = []
+        for src, dest in move['files']:
+            if (src, dest) in already_moved:
+                continue
+            if not os.path.exists(src) and os.path.exists(dest):
+                moved_files.append(os.path.basename(src))
+                continue
+            job.append((src, dest))
+        if job:
+            jobs.append(job)
+
+    failed_files = []
+    lock = threading.Lock()
+    with open_journal(journal_path) as journal:
+        def on_moved(src, dest):
+            with lock:
+                write_journal_record(journal, {'type': 'moved', 'src': src, 'dest': dest})
+
+        for job, (moved, error) in zip(jobs, move_files(jobs, on_moved=on_moved)):
+            moved_files += [os.path.basename(src) for src, _ in moved]
+            if error:
+                print(f"Error moving {os.path.basename(job[0][0])}: {str(error)}")
+                failed_files += [os.path.basename(src) for src, _ in job[len(moved):]]
+
+        if not failed_files:
+            write_journal_record(journal, {'type': 'done'})
+
+    return moved_files, failed_files
+
+
+def undo_last_run():
+    """Move all files of the journaled run back into the FotoInbox, newest first."""
+    journal_path = get_journal_path()
+    state = read_journal(journal_path)
+    if not state:
+        print("Nothing to undo")
+        return
+
+    restored = 0
+    with open_journal(journal_path) as journal:
+        for src, dest in reversed(state['moved']):
+            try:
+                move_file(dest, src)
+            except Exception as e:
+                print(f"Error restoring {os.path.basename(src)}: {str(e)}")
+                return
+            write_journal_record(journal, {'type': 'undone', 'src': src, 'dest': dest})
+            restored += 1
+
+    os.remove(journal_path)
+    print(f"Restored {restored} files")
+
+
+def finish_last_run():
+    """
+    Mark the interrupted last run as finished, e.g. when a move keeps failing.
+
+    Files that could not be moved stay in the FotoInbox and are planned again by the next run.
+    """
+    journal_path = get_journal_path()
+    state = read_journal(journal_path)
+    if not state or state['done']:
+        print("Nothing to finish")
+        return
+    with open_journal(journal_path) as journal:
+        write_journal_record(journal, {'type': 'done'})
+    print("Finished the last run, files that could not be moved are left in the inbox")
+
+
+def process_inbox(recency_window=RECENCY_WINDOW, dry_run=False, resume=False, rescan=False):
+    """Process all files in the FotoInbox directory."""
+    journal_path = get_journal_path()
+    state = read_journal(journal_path)
+    already_moved = []
+
+    if resume:
+        if not state or state['done'] or not state['plan']:
+            print("Nothing to resume")
+            return
+        plan = state['plan']
+        already_moved = state['moved']
+    else:
+        if state and not state['done']:
+            print("The last run was interrupted, use --resume, --undo or --finish")
+            return
+        plan = plan_inbox(recency_window, update_manifest=not dry_run, rescan=rescan)
+        if dry_run:
+            print(format_plan(plan))
+            return
+        with open(journal_path, 'w', encoding='utf-8') as journal:
+            write_journal_record(journal, {'type': 'plan', 'plan': plan})
+
+    moved_files, failed_files = execute_plan(plan, journal_path, already_moved)
 
     # Clean up remaining files (excluding moved files)
     print(f"Moved {int(len(moved_files) / 2)} files")
-    print(f"Found no match for {len(no_match_found)} files")
-    cleanup_inbox(moved_files)
+    print(f"Found no match for {len(plan['no_match'])} files")
+    # Keep RAWs that could not be moved, so they can be resumed
+    cleanup_inbox(plan, keep=failed_files)
+
 
+def cleanup_inbox(plan, keep=()):
+    """
+    Delete the files of the plan that are left in the FotoInbox directory: RAWs without a match or
+    without a RAW folder and the sources of moves, each with its .dop.
 
-def cleanup_inbox(moved_files):
-    """Delete all remaining files in the FotoInbox directory."""
-    remaining_files = [f for f in os.listdir(FOTO_INBOX_DIR)
-                       if os.path.isfile(os.path.join(FOTO_INBOX_DIR, f))]
+    Files the plan does not name (e.g. RAWs added after planning), conflicts and the files in keep
+    (failed moves that can be resumed) are not deleted.
+    """
+    raw_files = plan['no_match'] + plan['no_raw_folder'] + [move['raw'] for move in plan['moves']]
+    keep = set(keep)
+    remaining_files = [f for raw_file in raw_files for f in (raw_file, raw_file + '.dop')
+                       if f not in keep and os.path.isfile(os.path.join(FOTO_INBOX_DIR, f))]
 
     for file in remaining_files:
         file_path = os.path.join(FOTO_INBOX_DIR, file)
@@ -117,4 +521,21 @@ def cleanup_inbox(moved_files):
 
 
 if __name__ == "__main__":
-    process_inbox()
+    parser = argparse.ArgumentParser(description='Move RAW files from the FotoInbox next to their JPGs')
+    parser.add_argument('--days', type=float, default=RECENCY_WINDOW.days,
+                        help='only match JPGs modified within this many days (default: %(default)s)')
+    parser.add_argument('--dry-run', action='store_true', help='only print what would be moved')
+    parser.add_argument('--rescan', action='store_true',
+                        help='list the whole Fotos directory again, to find JPGs re-exported in place of older ones')
+    parser.add_argument('--resume', action='store_true', help='finish the interrupted last run')
+    parser.add_argument('--undo', action='store_true', help='move the files of the last run back into the inbox')
+    parser.add_argument('--finish', action='store_true',
+                        help='end the interrupted last run, files that could not be moved stay in the inbox')
+    args = parser.parse_args()
+    if args.undo:
+        undo_last_run()
+    elif args.finish:
+        finish_last_run()
+    else:
+        process_inbox(datetime.timedelta(days=args.days), dry_run=args.dry_run, resume=args.resume,
+                      rescan=args.rescan)
@@ -0,0 +1,427 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import time
+import unittest
+from unittest.mock import patch
+
+from FotoInbox import FotoInboxTidy
+
+TEMP = os.path.abspath('temp')
+FOTOS_DIR = os.path.join(TEMP, 'Fotos')
+FOTO_INBOX_DIR = os.path.join(TEMP, 'FotoInbox')
+MANIFEST_PATH = os.path.join(TEMP, 'manifest.json')
+
+NOW = time.time()
+OLD = NOW - 3 * 24 * 3600
+SINCE = NOW - 24 * 3600
+
+
+def write(path, content='data', mtime=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(content)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+class FotoInboxTestCase(unittest.TestCase):
+    """Builds a temp Fotos library and FotoInbox and points FotoInboxTidy to them."""
+
+    def setUp(self):
+        if os.path.exists(TEMP):
+            shutil.rmtree(TEMP)
+        os.makedirs(FOTOS_DIR)
+        os.makedirs(FOTO_INBOX_DIR)
+        for name, value in (('FOTOS_DIR', FOTOS_DIR), ('FOTO_INBOX_DIR', FOTO_INBOX_DIR),
+                            ('MANIFEST_PATH', MANIFEST_PATH)):
+            patcher = patch.object(FotoInboxTidy, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(TEMP)
+
+
+class TestJpgIndex(FotoInboxTestCase):
+    def test_buildJpgIndex_nestedFolders_RecentJpgsAreIndexedByLowercaseName(self):
+        recent = write(os.path.join(FOTOS_DIR, '2026', 'Trip', 'JPG', 'DSC01.JPG'))
+        write(os.path.join(FOTOS_DIR, '2026', 'Trip', 'JPG', 'DSC02.jpg'), mtime=OLD)
+        write(os.path.join(FOTOS_DIR, '2026', 'Trip', 'JPG', 'notes.txt'))
+
+        result = FotoInboxTidy.build_jpg_index(FOTOS_DIR, SINCE)
+
+        self.assertEqual({'dsc01.jpg': [recent]}, result)
+
+    def test_findJpgMatch_sameNameInTwoFolders_AllMatchesAreReturned(self):
+        first = write(os.path.join(FOTOS_DIR, 'a', 'DSC01.jpg'))
+        second = write(os.path.join(FOTOS_DIR, 'b', 'DSC01.jpg'))
+        jpg_index = FotoInboxTidy.build_jpg_index(FOTOS_DIR, SINCE)
+
+        self.assertCountEqual([first, second], FotoInboxTidy.find_jpg_match('DSC01.ARW', jpg_index))
+        self.assertEqual([], FotoInboxTidy.find_jpg_match('DSC02.ARW', jpg_index))
+
+    def test_findJpgMatch_noIndexPassed_IndexIsBuilt(self):
+        jpg = write(os.path.join(FOTOS_DIR, 'a', 'DSC01.jpg'))
+
+        self.assertEqual([jpg], FotoInboxTidy.find_jpg_match('DSC01.ARW'))
+
+
+class TestManifest(FotoInboxTestCase):
+    def setUp(self):
+        super().setUp()
+        self.jpg_dir = os.path.join(FOTOS_DIR, '2026', 'JPG')
+        self.jpg = write(os.path.join(self.jpg_dir, 'DSC01.jpg'))
+
+    def test_buildJpgIndex_unchangedDirectories_DirectoriesAreNotListedAgain(self):
+        FotoInboxTidy.build_jpg_index(FOTOS_DIR, SINCE, MANIFEST_PATH)
+
+        with patch.object(FotoInboxTidy, 'scan_directory', wraps=FotoInboxTidy.scan_directory) as scan_directory:
+            result = FotoInboxTidy.build_jpg_index(FOTOS_DIR, SINCE, MANIFEST_PATH)
+
+        scan_directory.assert_not_called()
+        self.assertEqual({'dsc01.jpg': [self.jpg]}, result)
+
+    def test_buildJpgIndex_jpgAddedToKnownDirectory_JpgIsFound(self):
+        FotoInboxTidy.build_jpg_index(FOTOS_DIR, SINCE, MANIFEST_PATH)
+        dir_mtime = os.stat(self.jpg_dir).st_mtime
+        new_jpg = write(os.path.join(self.jpg_dir, 'DSC02.jpg'))
+        os.utime(self.jpg_dir, (dir_mtime + 1, dir_mtime + 1))
+
+        result = FotoInboxTidy.build_jpg_index(FOTOS_DIR, SINCE, MANIFEST_PATH)
+
+        self.assertEqual([new_jpg], result['dsc02.jpg'])
+
+    def test_buildJpgIndex_largerRecencyWindowThanManifest_ManifestIsIgnored(self):
+        old_jpg = write(os.path.join(self.jpg_dir, 'DSC02.jpg'), mtime=OLD)
+        FotoInboxTidy.build_jpg_index(FOTOS_DIR, SINCE, MANIFEST_PATH)
+
+        result = FotoInboxTidy.build_jpg_index(FOTOS_DIR, OLD - 1, MANIFEST_PATH)
+
+        self.assertEqual([old_jpg], result['dsc02.jpg'])
+
+    def test_planInbox_jpgOverwrittenInPlace_OnlyFoundByRescan(self):
+        old_jpg = write(os.path.join(self.jpg_dir, 'DSC02.jpg'), mtime=OLD)
+        os.makedirs(os.path.join(FOTOS_DIR, '2026', 'RAW'))
+        FotoInboxTidy.build_jpg_index(FOTOS_DIR, SINCE, MANIFEST_PATH)
+        dir_mtime = os.stat(self.jpg_dir).st_mtime_ns
+        # a re-export over the old JPG changes the file, but not its directory
+        write(old_jpg, 'new export')
+        os.utime(self.jpg_dir, ns=(dir_mtime, dir_mtime))
+        write(os.path.join(FOTO_INBOX_DIR, 'DSC02.ARW'))
+
+        self.assertEqual(['DSC02.ARW'], FotoInboxTidy.plan_inbox()['no_match'])
+        plan = FotoInboxTidy.plan_inbox(rescan=True)
+
+        self.assertEqual(['DSC02.ARW'], [move['raw'] for move in plan['moves']])
+        self.assertEqual([], plan['no_match'])
+
+    def test_planInbox_unmatchedRaw_LibraryIsNotListedAgain(self):
+        FotoInboxTidy.build_jpg_index(FOTOS_DIR, SINCE, MANIFEST_PATH)
+        write(os.path.join(FOTO_INBOX_DIR, 'DSC09.ARW'))
+
+        with patch.object(FotoInboxTidy, 'scan_directory', wraps=FotoInboxTidy.scan_directory) as scan_directory:
+            plan = FotoInboxTidy.plan_inbox()
+
+        scan_directory.assert_not_called()
+        self.assertEqual(['DSC09.ARW'], plan['no_match'])
+
+    def test_processInbox_dryRun_ManifestIsNotWritten(self):
+        write(os.path.join(FOTO_INBOX_DIR, 'DSC01.ARW'))
+
+        FotoInboxTidy.process_inbox(dry_run=True)
+
+        self.assertFalse(os.path.exists(MANIFEST_PATH))
+        self.assertTrue(os.path.exists(os.path.join(FOTO_INBOX_DIR, 'DSC01.ARW')))
+
+
+class TestRawFolder(FotoInboxTestCase):
+    def test_findClosestRawFolder_rawFolderNextToJpgFolder_RawFolderIsReturned(self):
+        os.makedirs(os.path.join(FOTOS_DIR, 'Trip', 'RAW'))
+        jpg = write(os.path.join(FOTOS_DIR, 'Trip', 'JPG', 'DSC01.jpg'))
+
+        result = FotoInboxTidy.find_closest_raw_folder(jpg)
+
+        self.assertEqual(os.path.join(FOTOS_DIR, 'Trip', 'RAW'), str(result))
+
+    def test_findClosestRawFolder_folderNameContainsRaw_FolderIsReturned(self):
+        os.makedirs(os.path.join(FOTOS_DIR, 'Trip', 'Day 1', 'Sony raw files'))
+        jpg = write(os.path.join(FOTOS_DIR, 'Trip', 'Day 1', 'DSC01.jpg'))
+
+        result = FotoInboxTidy.find_closest_raw_folder(jpg)
+
+        self.assertEqual(os.path.join(FOTOS_DIR, 'Trip', 'Day 1', 'Sony raw files'), str(result))
+
+    def test_findClosestRawFolder_sharedCache_EveryDirectoryIsListedOnce(self):
+        os.makedirs(os.path.join(FOTOS_DIR, 'Trip', 'RAW'))
+        first = write(os.path.join(FOTOS_DIR, 'Trip', 'JPG', 'Day 1', 'DSC01.jpg'))
+        second = write(os.path.join(FOTOS_DIR, 'Trip', 'JPG', 'Day 2', 'DSC02.jpg'))
+        cache = {}
+
+        with patch.object(FotoInboxTidy, 'list_subdirectories',
+                          wraps=FotoInboxTidy.list_subdirectories) as list_subdirectories:
+            results = [FotoInboxTidy.find_closest_raw_folder(jpg, cache) for jpg in (first, second, first)]
+
+        self.assertEqual({os.path.join(FOTOS_DIR, 'Trip', 'RAW')}, {str(result) for result in results})
+        listed = [str(call.args[0]) for call in list_subdirectories.call_args_list]
+        self.assertEqual(len(listed), len(set(listed)))
+        self.assertEqual(4, len(listed))
+
+    def test_findClosestRawFolder_noRawFolder_NegativeResultIsCached(self):
+        first = write(os.path.join(FOTOS_DIR, 'Trip', 'JPG', 'DSC01.jpg'))
+        second = write(os.path.join(FOTOS_DIR, 'Trip', 'JPG', 'DSC02.jpg'))
+        cache = {}
+
+        self.assertIsNone(FotoInboxTidy.find_closest_raw_folder(first, cache))
+        with patch.object(FotoInboxTidy, 'list_subdirectories') as list_subdirectories:
+            self.assertIsNone(FotoInboxTidy.find_closest_raw_folder(second, cache))
+
+        list_subdirectories.assert_not_called()
+
+    def test_findClosestRawFolder_rawFolderOutsideFotos_NotFound(self):
+        os.makedirs(os.path.join(TEMP, 'RAW'))
+        jpg = write(os.path.join(FOTOS_DIR, 'Trip', 'DSC01.jpg'))
+
+        self.assertIsNone(FotoInboxTidy.find_closest_raw_folder(jpg))
+
+
+class TestMoveFiles(FotoInboxTestCase):
+    def setUp(self):
+        super().setUp()
+        self.src = write(os.path.join(FOTO_INBOX_DIR, 'DSC01.ARW'), 'raw data', mtime=OLD)
+        self.dest = os.path.join(FOTOS_DIR, 'RAW', 'DSC01.ARW')
+        os.makedirs(os.path.dirname(self.dest))
+
+    def test_copyAndRemove_success_SourceIsMovedWithItsMtime(self):
+        FotoInboxTidy.copy_and_remove(self.src, self.dest)
+
+        self.assertEqual('raw data', read(self.dest))
+        self.assertEqual(int(OLD), int(os.stat(self.dest).st_mtime))
+        self.assertFalse(os.path.exists(self.src))
+        self.assertFalse(os.path.exists(self.dest + '.part'))
+
+    def test_copyAndRemove_sizeMismatch_PartFileIsRemovedAndSourceKept(self):
+        def truncated_copy(src, dest):
+            write(dest, 'raw')
+
+        with patch.object(FotoInboxTidy.shutil, 'copyfile', side_effect=truncated_copy):
+            self.assertRaises(OSError, FotoInboxTidy.copy_and_remove, self.src, self.dest)
+
+        self.assertEqual('raw data', read(self.src))
+        self.assertFalse(os.path.exists(self.dest))
+        self.assertFalse(os.path.exists(self.dest + '.part'))
+
+    def test_copyAndRemove_copyInterrupted_PartFileIsRemoved(self):
+        def failing_copy(src, dest):
+            write(dest, 'raw')
+            raise KeyboardInterrupt
+
+        with patch.object(FotoInboxTidy.shutil, 'copyfile', side_effect=failing_copy):
+            self.assertRaises(KeyboardInterrupt, FotoInboxTidy.copy_and_remove, self.src, self.dest)
+
+        self.assertTrue(os.path.exists(self.src))
+        self.assertFalse(os.path.exists(self.dest + '.part'))
+
+    def test_moveFile_otherFilesystem_FileIsCopied(self):
+        with patch.object(FotoInboxTidy, 'is_same_device', return_value=False), \
+                patch.object(FotoInboxTidy, 'copy_and_remove') as copy_and_remove:
+            FotoInboxTidy.move_file(self.src, self.dest)
+
+        copy_and_remove.assert_called_once_with(self.src, self.dest)
+
+    def test_moveFiles_rawFails_SidecarIsNotMoved(self):
+        dop = write(os.path.join(FOTO_INBOX_DIR, 'DSC01.ARW.dop'))
+        other = write(os.path.join(FOTO_INBOX_DIR, 'DSC02.ARW'))
+        missing = os.path.join(FOTO_INBOX_DIR, 'DSC03.ARW')
+        missing_dop = write(os.path.join(FOTO_INBOX_DIR, 'DSC03.ARW.dop'))
+        jobs = [[(self.src, self.dest), (dop, self.dest + '.dop')],
+                [(missing, os.path.join(FOTOS_DIR, 'RAW', 'DSC03.ARW')),
+                 (missing_dop, os.path.join(FOTOS_DIR, 'RAW', 'DSC03.ARW.dop'))],
+                [(other, os.path.join(FOTOS_DIR, 'RAW', 'DSC02.ARW'))]]
+        moved = []
+
+        results = FotoInboxTidy.move_files(jobs, on_moved=lambda src, dest: moved.append(src))
+
+        self.assertEqual([jobs[0], [], jobs[2]], [result[0] for result in results])
+        self.assertEqual([None, FileNotFoundError, None], [type(result[1]) if result[1] else None for result in results])
+        self.assertCountEqual([self.src, dop, other], moved)
+        self.assertTrue(os.path.exists(missing_dop))
+
+
+class TestPlanAndJournal(FotoInboxTestCase):
+    def setUp(self):
+        super().setUp()
+        self.raw_dir = os.path.join(FOTOS_DIR, 'Trip', 'RAW')
+        os.makedirs(self.raw_dir)
+        for name in ('DSC01', 'DSC02', 'DSC03'):
+            write(os.path.join(FOTOS_DIR, 'Trip', 'JPG', f'{name}.jpg'))
+            write(os.path.join(FOTO_INBOX_DIR, f'{name}.ARW'), name)
+        write(os.path.join(FOTO_INBOX_DIR, 'DSC01.ARW.dop'), 'sidecar')
+        # DSC03 was moved before, its destination is taken
+        write(os.path.join(self.raw_dir, 'DSC03.ARW'), 'other')
+        write(os.path.join(FOTO_INBOX_DIR, 'DSC09.ARW'))
+        write(os.path.join(FOTO_INBOX_DIR, 'readme.txt'))
+        self.journal_path = os.path.join(FOTO_INBOX_DIR, FotoInboxTidy.JOURNAL_NAME)
+
+    def process(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            FotoInboxTidy.process_inbox(**kwargs)
+        return output.getvalue()
+
+    def undo(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            FotoInboxTidy.undo_last_run()
+        return output.getvalue()
+
+    def inbox(self):
+        return sorted(os.listdir(FOTO_INBOX_DIR))
+
+    def test_planInbox_inbox_MovesConflictsAndMissesArePlanned(self):
+        plan = FotoInboxTidy.plan_inbox()
+
+        self.assertEqual([[os.path.join(FOTO_INBOX_DIR, 'DSC01.ARW'), os.path.join(self.raw_dir, 'DSC01.ARW')],
+                          [os.path.join(FOTO_INBOX_DIR, 'DSC01.ARW.dop'), os.path.join(self.raw_dir, 'DSC01.ARW.dop')]],
+                         plan['moves'][0]['files'])
+        self.assertEqual(['DSC01.ARW', 'DSC02.ARW'], [move['raw'] for move in plan['moves']])
+        self.assertEqual([{'raw': 'DSC03.ARW', 'dest': os.path.join(self.raw_dir, 'DSC03.ARW'),
+                           'reason': 'destination exists'}], plan['conflicts'])
+        self.assertEqual(['DSC09.ARW'], plan['no_match'])
+        self.assertIn('2 to move, 1 conflicts', FotoInboxTidy.format_plan(plan))
+
+    def test_processInbox_dryRun_NothingIsMoved(self):
+        before = self.inbox()
+
+        output = self.process(dry_run=True)
+
+        self.assertIn('move DSC01.ARW -> ' + os.path.join(self.raw_dir, 'DSC01.ARW'), output)
+        self.assertEqual(before, self.inbox())
+
+    def test_processInbox_run_FilesAreMovedAndJournaled(self):
+        self.process()
+
+        self.assertEqual(['DSC01.ARW', 'DSC01.ARW.dop', 'DSC02.ARW', 'DSC03.ARW'], sorted(os.listdir(self.raw_dir)))
+        # the unmatched RAW is cleaned up, the conflicting RAW and files the plan does not name are kept
+        self.assertEqual([FotoInboxTidy.JOURNAL_NAME, 'DSC03.ARW', 'readme.txt'], self.inbox())
+        state = FotoInboxTidy.read_journal(self.journal_path)
+        self.assertTrue(state['done'])
+        self.assertEqual(3, len(state['moved']))
+
+    def test_processInbox_moveFails_SourceIsKeptForResume(self):
+        real_move_file = FotoInboxTidy.move_file
+
+        def move_file(src, dest):
+            if src.endswith('DSC02.ARW'):
+                raise OSError('disk full')
+            real_move_file(src, dest)
+
+        with patch.object(FotoInboxTidy, 'move_file', side_effect=move_file):
+            self.process()
+
+        self.assertIn('DSC02.ARW', self.inbox())
+        self.assertFalse(FotoInboxTidy.read_journal(self.journal_path)['done'])
+        self.assertIn('use --resume, --undo or --finish', self.process())
+
+        self.process(resume=True)
+
+        self.assertTrue(os.path.exists(os.path.join(self.raw_dir, 'DSC02.ARW')))
+        self.assertTrue(FotoInboxTidy.read_journal(self.journal_path)['done'])
+
+    def fail_moves_of(self, name):
+        real_move_file = FotoInboxTidy.move_file
+
+        def move_file(src, dest):
+            if os.path.basename(src) == name:
+                raise OSError('disk full')
+            real_move_file(src, dest)
+
+        return patch.object(FotoInboxTidy, 'move_file', side_effect=move_file)
+
+    def test_processInbox_resumeAfterPartialUndo_RestoredFilesAreMovedAgain(self):
+        with self.fail_moves_of('DSC02.ARW'):
+            self.process()
+        with self.fail_moves_of('DSC01.ARW'):
+            # the undo restores the newest move, DSC01.ARW.dop, then fails
+            self.assertIn('Error restoring DSC01.ARW', self.undo())
+        self.assertIn('DSC01.ARW.dop', self.inbox())
+
+        self.process(resume=True)
+
+        self.assertEqual('sidecar', read(os.path.join(self.raw_dir, 'DSC01.ARW.dop')))
+        self.assertEqual(['DSC01.ARW', 'DSC01.ARW.dop', 'DSC02.ARW', 'DSC03.ARW'], sorted(os.listdir(self.raw_dir)))
+        self.assertIn('Restored 3 files', self.undo())
+        self.assertEqual(['DSC03.ARW'], os.listdir(self.raw_dir))
+
+    def test_processInbox_rawAddedBeforeResume_RawIsNotDeleted(self):
+        with self.fail_moves_of('DSC02.ARW'):
+            self.process()
+        write(os.path.join(FOTO_INBOX_DIR, 'DSC10.ARW'))
+
+        self.process(resume=True)
+
+        self.assertIn('DSC10.ARW', self.inbox())
+
+    def test_finishLastRun_moveKeepsFailing_RunIsDoneAndFileIsKept(self):
+        with self.fail_moves_of('DSC02.ARW'):
+            self.process()
+            self.process(resume=True)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            FotoInboxTidy.finish_last_run()
+
+        self.assertTrue(FotoInboxTidy.read_journal(self.journal_path)['done'])
+        self.assertIn('DSC02.ARW', self.inbox())
+        self.assertEqual(['DSC02.ARW'], [move['raw'] for move in FotoInboxTidy.plan_inbox()['moves']])
+
+    def test_processInbox_resumeAfterCrash_UnjournaledMoveIsNotRepeated(self):
+        plan = FotoInboxTidy.plan_inbox()
+        with open(self.journal_path, 'w', encoding='utf-8') as journal:
+            FotoInboxTidy.write_journal_record(journal, {'type': 'plan', 'plan': plan})
+            # DSC01.ARW was moved, the process died before the move was journaled, mid-line
+            journal.write('{"type": "mov')
+        os.replace(os.path.join(FOTO_INBOX_DIR, 'DSC01.ARW'), os.path.join(self.raw_dir, 'DSC01.ARW'))
+
+        self.process(resume=True)
+
+        state = FotoInboxTidy.read_journal(self.journal_path)
+        self.assertTrue(state['done'])
+        self.assertEqual({'DSC01.ARW.dop', 'DSC02.ARW'}, {os.path.basename(src) for src, _ in state['moved']})
+        self.assertEqual('DSC01', read(os.path.join(self.raw_dir, 'DSC01.ARW')))
+
+    def test_processInbox_nothingInterrupted_NothingToResume(self):
+        self.assertIn('Nothing to resume', self.process(resume=True))
+
+    def test_undoLastRun_completedRun_FilesAreMovedBackAndJournalRemoved(self):
+        self.process()
+
+        output = self.undo()
+
+        self.assertIn('Restored 3 files', output)
+        self.assertEqual(['DSC03.ARW'], sorted(os.listdir(self.raw_dir)))
+        self.assertEqual(['DSC01.ARW', 'DSC01.ARW.dop', 'DSC02.ARW', 'DSC03.ARW', 'readme.txt'], self.inbox())
+        self.assertEqual('sidecar', read(os.path.join(FOTO_INBOX_DIR, 'DSC01.ARW.dop')))
+
+    def test_undoLastRun_interruptedUndo_RemainingFilesAreRestored(self):
+        self.process()
+        with open(self.journal_path, 'r', encoding='utf-8') as journal:
+            last_moved = json.loads(journal.readlines()[-2])
+        os.replace(last_moved['dest'], last_moved['src'])
+        with open(self.journal_path, 'a', encoding='utf-8') as journal:
+            journal.write(json.dumps(dict(last_moved, type='undone')) + '\n')
+
+        self.assertIn('Restored 2 files', self.undo())
+        self.assertEqual(['DSC03.ARW'], sorted(os.listdir(self.raw_dir)))
+
+    def test_undoLastRun_noJournal_NothingToUndo(self):
+        self.assertIn('Nothing to undo', self.undo())
+
+
+if __name__ == '__main__':
+    unittest.main()
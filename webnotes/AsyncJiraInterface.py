@@ -0,0 +1,116 @@
+import asyncio
+from urllib.parse import urlparse
+
+from webnotes import JiraInterface
+from webnotes.Settings import get_settings
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE_LIMIT = 10.0  # requests per second and host
+
+
+def init_config():
+    config = get_settings()
+    concurrency = config.getint('API', 'concurrency', fallback=DEFAULT_CONCURRENCY)
+    rate_limit = config.getfloat('API', 'rate_limit', fallback=DEFAULT_RATE_LIMIT)
+    return concurrency, rate_limit
+
+
+class RateLimiter:
+    """Spaces out request starts, so that at most `rate` requests per second are started."""
+
+    def __init__(self, rate):
+        self._interval = 1 / rate if rate > 0 else 0
+        self._next_start = 0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncJiraClient:
+    """
+    Runs JiraInterface calls concurrently on top of the shared, pooled JiraClient session.
+
+    Every call runs in a worker thread; a bounded semaphore caps the number of requests in
+    flight and a per-host RateLimiter keeps Jira from answering with 429s.
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, rate_limit=DEFAULT_RATE_LIMIT):
+        self._semaphore = asyncio.BoundedSemaphore(concurrency)
+        self._rate_limit = rate_limit
+        self._rate_limiters = {}
+        # Create the shared client and cache up front, so worker threads do not race to create them
+        self._host = urlparse(JiraInterface.get_client().base_url).netloc
+        JiraInterface.get_issue_cache()
+
+    def _rate_limiter(self, host):
+        if host not in self._rate_limiters:
+            self._rate_limiters[host] = RateLimiter(self._rate_limit)
+        return self._rate_limiters[host]
+
+    async def _call(self, func, *args):
+        async with self._semaphore:
+            await self._rate_limiter(self._host).wait()
+            return await asyncio.to_thread(func, *args)
+
+    async def fetch_issues(self, issue_keys, force_refresh=False):
+        """
+        Returns:
+            dict: issue key -> JiraIssue (or None if the issue could not be retrieved)
+        """
+        issue_keys = list(dict.fromkeys(issue_keys))
+        issues = await asyncio.gather(*[
+            self._call(JiraInterface.get_jira_issue, issue_key, force_refresh) for issue_key in issue_keys
+        ])
+        return dict(zip(issue_keys, issues))
+
+    async def get_transitions_many(self, issue_keys):
+        """
+        Returns:
+            dict: issue key -> list of available transitions
+        """
+        issue_keys = list(dict.fromkeys(issue_keys))
+        transitions = await asyncio.gather(*[
+            self._call(JiraInterface.get_transitions, issue_key) for issue_key in issue_keys
+        ])
+        return dict(zip(issue_keys, transitions))
+
+    async def transition_many(self, transitions):
+        """
+        Args:
+            transitions (iterable): (issue_key, transition_id) pairs
+
+        Returns:
+            list: The result of JiraInterface.transition_issue for every pair, in order
+        """
+        return await asyncio.gather(*[
+            self._call(JiraInterface.transition_issue, issue_key, transition_id)
+            for issue_key, transition_id in transitions
+        ])
+
+
+def _run(method_name, *args):
+    async def main():
+        client = AsyncJiraClient(*init_config())
+        return await getattr(client, method_name)(*args)
+
+    return asyncio.run(main())
+
+
+# Synchronous facade for the alfred workflow scripts
+
+def fetch_issues(issue_keys, force_refresh=False):
+    return _run('fetch_issues', issue_keys, force_refresh)
+
+
+def get_transitions_many(issue_keys):
+    return _run('get_transitions_many', issue_keys)
+
+
+def transition_many(transitions):
+    return _run('transition_many', list(transitions))
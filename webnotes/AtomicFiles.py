@@ -0,0 +1,87 @@
+import os
+import stat
+import tempfile
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # no advisory locks on this platform, writes are still atomic
+    fcntl = None
+
+DEFAULT_LOCK_TIMEOUT = 5.0
+LOCK_POLL_INTERVAL = 0.01
+
+
+class LockTimeoutError(TimeoutError):
+    pass
+
+
+@contextmanager
+def file_lock(path, timeout=DEFAULT_LOCK_TIMEOUT):
+    """
+    Hold an exclusive lock on `path`.lock for the duration of the with block.
+
+    Only writers take the lock. Readers don't need it, because files are only ever replaced
+    atomically or appended to.
+
+    Raises:
+        LockTimeoutError: If the lock could not be acquired within timeout seconds
+    """
+    lock_path = f'{path}.lock'
+    with open(lock_path, 'a') as lock_file:
+        if fcntl is not None:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise LockTimeoutError(f'Could not lock {path} within {timeout} seconds')
+                    time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def atomic_open(path, mode='w', encoding='utf-8'):
+    """
+    Open a temp file next to path for writing, which replaces path once the with block completes.
+
+    Readers never see a partial file, and path stays untouched if the block raises. The
+    permissions of an existing file are kept.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        if os.path.exists(path):
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write(path, text, encoding='utf-8'):
+    """Write text to a temp file next to path and move it into place, so readers never see a partial file."""
+    with atomic_open(path, 'w', encoding) as file:
+        file.write(text)
+
+
+def append_line(path, text, encoding='utf-8'):
+    """Append text with a single write on an O_APPEND descriptor, so concurrent appends never interleave."""
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, text.encode(encoding))
+    finally:
+        os.close(fd)
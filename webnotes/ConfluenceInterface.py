@@ -1,17 +1,14 @@
-import configparser
 import os
 import json
 
-import requests
-from requests.auth import HTTPBasicAuth
+from webnotes.Settings import get_settings
 
-from webnotes.ConfluencePageNodes.ConfPageCreator import create_review_page, create_1to1_page
+# requests and the page node tree are imported inside the functions that need them,
+# so importing this module stays cheap for the workflow scripts
 
 
 def init_config():
-    # Read configuration from config.ini
-    config = configparser.ConfigParser()
-    config.read(os.path.join(os.path.dirname(__file__), 'config.ini'))
+    config = get_settings()
     jira_token = config.get('API', 'jira_token')
     jira_email = config.get('API', 'jira_email')
     conf_custom_domain = config.get('API', 'conf_custom_domain')
@@ -19,6 +16,9 @@ def init_config():
 
 
 def get_conf_page(page_id):
+    import requests
+    from requests.auth import HTTPBasicAuth
+
     conf_custom_domain, jira_email, jira_token = init_config()
     url = f"https://{conf_custom_domain}/wiki/api/v2/pages/{page_id}?body-format=atlas_doc_format"
 
@@ -61,15 +61,20 @@ def get_conf_page(page_id):
 
 
 def create_confluence_review_page():
+    from webnotes.ConfluencePageNodes.ConfPageCreator import create_review_page
     review_page = create_review_page()
     return _create_confluence_page(review_page)
 
 def create_confluence_1to1_page():
+    from webnotes.ConfluencePageNodes.ConfPageCreator import create_1to1_page
     one_to_one_page = create_1to1_page()
     return _create_confluence_page(one_to_one_page)
 
 
 def _create_confluence_page(new_page):
+    import requests
+    from requests.auth import HTTPBasicAuth
+
     conf_custom_domain, jira_email, jira_token = init_config()
     url = f"https://{conf_custom_domain}/wiki/api/v2/pages/"
 
@@ -1,6 +1,4 @@
-import configparser
 import json
-import os
 from datetime import datetime, timedelta
 
 from webnotes.ConfluencePageNodes import ParagraphNode
@@ -14,11 +12,10 @@ from .ExtensionNode import ExtensionNode
 from .RootNode import RootNode
 from .Table.BulletListNode import BulletListNode
 from .. import utilities, JiraInterface
+from ..Settings import get_settings
 
 def init_config():
-    # Read configuration from config.ini
-    config = configparser.ConfigParser()
-    config.read(os.path.join(os.path.dirname(__file__), os.path.pardir, 'config.ini'))
+    config = get_settings()
     space_id = config.get('CONF', 'spaceId')
     author_id = config.get('CONF', 'authorId')
     review_parent_id = config.get('CONF', 'review_parentId')
@@ -40,9 +37,7 @@ def get_review_table():
 
 
 def get_1to1_table_data():
-    config = configparser.ConfigParser()
-    config.read(os.path.join(os.path.dirname(__file__), os.path.pardir, 'config.ini'))
-    ep_link = config.get('CONF', 'ep_link')
+    ep_link = get_settings().get('CONF', 'ep_link')
 
 
     rows = []
@@ -0,0 +1,120 @@
+import contextlib
+import importlib
+import io
+import json
+import os
+import socketserver
+import sys
+import time
+import traceback
+
+from webnotes.AtomicFiles import file_lock
+from webnotes.DaemonClient import WORKFLOWS, DaemonError, connect, get_socket_path
+from webnotes.Settings import get_settings
+
+DEFAULT_IDLE_TIMEOUT = 3600  # seconds without requests before the daemon exits
+
+
+class DaemonRunningError(DaemonError):
+    pass
+
+
+class WorkflowHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            response = {'ok': False, 'error': 'Invalid request'}
+        else:
+            response = self.server.dispatch(request)
+        self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+class Daemon(socketserver.UnixStreamServer):
+    """
+    Runs the alfred workflows in one long-lived process, so config, index, HTTP session and issue
+    cache stay warm between invocations.
+
+    Requests are handled one at a time, workflows share the process wide state and are not
+    written to run concurrently. The daemon exits after idle_timeout seconds without a request.
+    """
+
+    def __init__(self, main_path, socket_path=None, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        """
+        Raises:
+            DaemonRunningError: If another daemon already answers on socket_path
+        """
+        self.main_path = main_path
+        self.socket_path = socket_path or get_socket_path()
+        self.idle_timeout = idle_timeout
+        self.timeout = min(idle_timeout, 60)
+        self._last_request = time.monotonic()
+        self._stopped = False
+
+        # daemons started concurrently by several clients must not take the socket from each other
+        with file_lock(self.socket_path):
+            if os.path.exists(self.socket_path):
+                if is_running(self.socket_path):
+                    raise DaemonRunningError(f'A daemon is already listening on {self.socket_path}')
+                # a leftover of a daemon that did not shut down cleanly
+                os.remove(self.socket_path)
+            # the socket must never be reachable by other users, not even right after bind
+            umask = os.umask(0o177)
+            try:
+                super().__init__(self.socket_path, WorkflowHandler)
+            finally:
+                os.umask(umask)
+
+    def dispatch(self, request):
+        self._last_request = time.monotonic()
+        command = request.get('command')
+        if command == 'ping':
+            return {'ok': True, 'output': 'pong', 'pid': os.getpid()}
+        if command == 'shutdown':
+            self._stopped = True
+            return {'ok': True, 'output': 'stopped'}
+        if command == 'run':
+            return self.run_workflow(request.get('workflow'), request.get('args', []),
+                                     request.get('main_path') or self.main_path)
+        return {'ok': False, 'error': f'Unknown command: {command}'}
+
+    def run_workflow(self, name, args, main_path):
+        if name not in WORKFLOWS:
+            return {'ok': False, 'error': f'Unknown workflow: {name}'}
+        try:
+            module = importlib.import_module(f'webnotes.alfredWorkflows.{name}')
+            # workflows must only answer through their return value
+            with contextlib.redirect_stdout(io.StringIO()):
+                output = module.main(args, main_path)
+        except Exception:
+            return {'ok': False, 'error': traceback.format_exc()}
+        return {'ok': True, 'output': output}
+
+    def serve(self):
+        try:
+            while not self._stopped and time.monotonic() - self._last_request < self.idle_timeout:
+                self.handle_request()
+        finally:
+            self.server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+def is_running(socket_path=None):
+    try:
+        connect(socket_path).close()
+        return True
+    except OSError:
+        return False
+
+
+if __name__ == '__main__':
+    # python -m webnotes.Daemon [path/to/folder/with/config.ini], usually started by DaemonClient
+    main_path = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    config = get_settings(os.path.join(main_path, 'config.ini'))
+    idle_timeout = config.getfloat('DAEMON', 'idle_timeout', fallback=DEFAULT_IDLE_TIMEOUT)
+    try:
+        daemon = Daemon(main_path, idle_timeout=idle_timeout)
+    except DaemonRunningError:
+        sys.exit(0)
+    daemon.serve()
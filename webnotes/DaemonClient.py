@@ -0,0 +1,142 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+# Kept free of heavy imports: this module is loaded by every alfred workflow invocation
+
+# Workflows the daemon may run, the module names in webnotes/alfredWorkflows
+WORKFLOWS = ('notes', 'close', 'remaining', 'hyperlinks', 'addStoryPoints', 'JiraClose', 'JiraBulkClose',
+             'CreateConfPage', 'SprintRefinement', 'sp_report')
+START_TIMEOUT = 3.0
+DEFAULT_REQUEST_TIMEOUT = 30.0  # seconds to wait for a response before giving up on the daemon
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class DaemonError(Exception):
+    pass
+
+
+class DaemonUnavailableError(DaemonError):
+    """The request could not be sent, so the daemon did not start to run it."""
+
+
+def get_socket_path():
+    return os.path.join(tempfile.gettempdir(), f'webnotes-{os.getuid()}.sock')
+
+
+def is_enabled(main_path):
+    if not hasattr(socket, 'AF_UNIX'):
+        return False
+    from webnotes.Settings import get_settings
+    config = get_settings(os.path.join(main_path, 'config.ini'))
+    return config.getboolean('DAEMON', 'enabled', fallback=False)
+
+
+def get_request_timeout(main_path):
+    from webnotes.Settings import get_settings
+    config = get_settings(os.path.join(main_path, 'config.ini'))
+    return config.getfloat('DAEMON', 'request_timeout', fallback=DEFAULT_REQUEST_TIMEOUT)
+
+
+def connect(socket_path=None):
+    """
+    Raises:
+        OSError: If no daemon is listening
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path or get_socket_path())
+    except OSError:
+        client.close()
+        raise
+    return client
+
+
+def communicate(client, request, timeout=DEFAULT_REQUEST_TIMEOUT):
+    """
+    Send one request and wait for its response, one JSON document per line.
+
+    Raises:
+        DaemonUnavailableError: If the request could not be sent
+        DaemonError: If the daemon does not respond within timeout seconds or closes the connection
+    """
+    with client:
+        client.settimeout(timeout)
+        try:
+            client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        except OSError as e:
+            raise DaemonUnavailableError(f'Could not send the request to the daemon: {e}') from None
+        try:
+            data = b''
+            while not data.endswith(b'\n'):
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        except socket.timeout:
+            raise DaemonError(f'Daemon did not respond within {timeout} seconds') from None
+    if not data:
+        raise DaemonError('Daemon closed the connection without a response')
+    return json.loads(data)
+
+
+def send(request, socket_path=None, timeout=DEFAULT_REQUEST_TIMEOUT):
+    return communicate(connect(socket_path), request, timeout)
+
+
+def start_daemon(main_path):
+    """Start the daemon detached from this process and wait until it accepts connections."""
+    subprocess.Popen([sys.executable, '-m', 'webnotes.Daemon', str(main_path)], cwd=PROJECT_ROOT,
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     start_new_session=True)
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            return connect()
+        except OSError:
+            time.sleep(0.02)
+    return None
+
+
+def run_workflow(name, main, args, main_path):
+    """
+    Run a workflow in the daemon, starting the daemon if it is not running yet.
+
+    Falls back to calling main(args, main_path) in this process if the daemon is disabled
+    ([DAEMON] enabled), could not be started or the request could not be sent to it.
+
+    Raises:
+        DaemonError: If the daemon did not respond within [DAEMON] request_timeout. The workflow is
+                     not run again in this process, the daemon may still be running it.
+    """
+    main_path = str(main_path)
+    args = list(args)
+    if is_enabled(main_path):
+        try:
+            client = connect()
+        except OSError:
+            client = start_daemon(main_path)
+        if client is not None:
+            request = {'command': 'run', 'workflow': name, 'args': args, 'main_path': main_path}
+            try:
+                response = communicate(client, request, get_request_timeout(main_path))
+            except DaemonUnavailableError:
+                # the daemon died before it got the request
+                return main(args, main_path)
+            if not response.get('ok'):
+                raise DaemonError(response.get('error'))
+            return response.get('output')
+    return main(args, main_path)
+
+
+if __name__ == '__main__':
+    # python -m webnotes.DaemonClient ping|shutdown
+    command = sys.argv[1] if len(sys.argv) > 1 else 'ping'
+    try:
+        print(send({'command': command}))
+    except OSError:
+        print('Daemon is not running')
@@ -1,119 +1,190 @@
-import re
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+from webnotes import Frontmatter
 from webnotes.utilities import get_issue_number_from_url, get_current_sprint
-from webnotes.JiraInterface import get_jira_issue
 
+DEFAULT_WORKERS = 8
 
-def adjust_file(file_path, done_sp_in_sprint=None, return_remaining_sp=False):
+
+def read_note(file_path):
+    """
+    Read the SP relevant properties of a note.
+
+    Returns:
+        dict: total_sp, sp_done, jira_link and issue_key of the note,
+              or a str explaining why the note can't be adjusted
+    """
     if not os.path.exists(file_path):
         return "File does not exist: " + file_path
 
-    try:
-        with open(file_path, 'r') as file:
-            content = file.read()
+    # Only the frontmatter (properties between --- markers) is read, not the body
+    properties = Frontmatter.read_properties(file_path)
 
-        # Check if the file has frontmatter (properties between --- markers)
-        frontmatter_match = re.search(r'^---\s*\n(.*?)\n---', content, re.DOTALL)
+    if properties is None:
+        return "Not a jira story"
 
-        if not frontmatter_match:
-            return "Not a jira story"
+    total_sp = properties.get('Total-SP') or None
+    sp_done = properties.get('SP-done') or ""
+    jira_link = properties.get('jira-link')
 
-        frontmatter = frontmatter_match.group(1)
+    # If we don't have jira-link, it's not a valid Jira story
+    if not jira_link:
+        return "Not a jira story"
 
-        # Process frontmatter line by line to properly extract the properties
-        frontmatter_lines = frontmatter.split('\n')
+    # An empty Total-SP has to be fetched from Jira
+    if not total_sp or total_sp.strip() == '""' or total_sp.strip() == "''":
         total_sp = None
-        sp_done = ""
-        jira_link = None
-
-        for line in frontmatter_lines:
-            if line.strip().startswith('Total-SP:'):
-                value = line.split('Total-SP:', 1)[1].strip()
-                total_sp = value if value else None
-            elif line.strip().startswith('SP-done:'):
-                value = line.split('SP-done:', 1)[1].strip()
-                sp_done = value if value else ""
-            elif line.strip().startswith('jira-link:'):
-                jira_link = line.split('jira-link:', 1)[1].strip()
-
-        # If we don't have jira-link, it's not a valid Jira story
-        if not jira_link:
-            return "Not a jira story"
+
+    return {
+        'total_sp': total_sp,
+        'sp_done': sp_done,
+        'jira_link': jira_link,
+        'issue_key': get_issue_number_from_url(jira_link),
+    }
+
+
+def parse_sp_done(sp_done):
+    """
+    Parse an SP-done value, looks like this: 375: 2, 376: 1, 377: 1
+
+    Returns:
+        dict: sprint number -> story points done in that sprint
+    """
+    sp_done_dict = {}
+    if sp_done:
+        pairs = [p.strip() for p in sp_done.strip('"\'').split(',') if p.strip()]
+        for pair in pairs:
+            if ':' in pair:
+                sprint, points = pair.split(':', 1)
+                try:
+                    sprint_num = int(sprint.strip())
+                    points_num = int(points.strip())
+                    sp_done_dict[sprint_num] = points_num
+                except ValueError:
+                    continue  # skip malformed entries
+    return sp_done_dict
+
+
+def update_note(file_path, note, done_sp_in_sprint=None, return_remaining_sp=False):
+    """Add the done SP of the current sprint to a note read with read_note, Total-SP must be set by now."""
+    total_sp = note['total_sp']
+    sp_done = note['sp_done']
+
+    # Clean up the values (remove quotes if present)
+    if total_sp:
+        total_sp = int(str(total_sp).strip('"\''))
+
+    if sp_done:
+        sp_done = sp_done.strip('"\'')
+
+    # Calculate remainind SP
+    sp_done_dict = parse_sp_done(sp_done)
+
+    # Sum up the story points done
+    total_sp_done = sum(sp_done_dict.values())
+    # calculate remaining SP: all nums in sp_done, subtract from total_sp
+    remaining_sp = total_sp - total_sp_done
+
+    if return_remaining_sp:
+        return remaining_sp
+
+    # append to SP-done: currentSprint: remainingSP (even if 0)
+    current_sprint = get_current_sprint()
+    if current_sprint in sp_done_dict.keys():
+        remaining_sp += sp_done_dict[current_sprint]
+
+    if done_sp_in_sprint:
+        remaining_sp = done_sp_in_sprint
+    sp_done_dict[current_sprint] = remaining_sp
+
+    new_sp_done = ', '.join(f'{k}: {sp_done_dict[k]}' for k in sorted(sp_done_dict, key=int))
+
+    # Update the SP-done property in the file, surrounded with double quotes
+    # Only the frontmatter is rewritten, the body is streamed through unchanged
+    Frontmatter.update_properties(file_path, {'SP-done': f'"{new_sp_done}"'}, add_missing=False)
+
+    # save file
+    # return ok and remaining SP
+    if done_sp_in_sprint:
+        return f'Added {done_sp_in_sprint} SP to current Sprint ({current_sprint})'
+    else:
+        return f'Added remaining SP ({sp_done_dict[current_sprint]}) to current Sprint ({current_sprint})'
+
+
+def adjust_file(file_path, done_sp_in_sprint=None, return_remaining_sp=False):
+    try:
+        note = read_note(file_path)
+        if isinstance(note, str):
+            return note
 
         # If Total-SP doesn't exist or is empty, get it from the Jira API
-        if not total_sp or total_sp.strip() == '""' or total_sp.strip() == "''":
-            issue_key = get_issue_number_from_url(jira_link)
-            if issue_key:
-                jira_issue = get_jira_issue(issue_key)
-                if jira_issue and hasattr(jira_issue, 'story_points'):
-                    total_sp = jira_issue.story_points
-                    print('Total-SP not found in file, fetched from Jira API:', total_sp)
-
-        # Clean up the values (remove quotes if present)
-        if total_sp:
-            total_sp = int(total_sp.strip('"\''))
-
-        if sp_done:
-            sp_done = sp_done.strip('"\'')
-
-        # Calculate remainind SP, looks like this: 375: 2 376: 1 377: 1
-        sp_done_dict = {}
-        if sp_done:
-            pairs = [p.strip() for p in sp_done.split(',') if p.strip()]
-            for pair in pairs:
-                if ':' in pair:
-                    sprint, points = pair.split(':', 1)
-                    try:
-                        sprint_num = int(sprint.strip())
-                        points_num = int(points.strip())
-                        sp_done_dict[sprint_num] = points_num
-                    except ValueError:
-                        continue  # skip malformed entries
-
-        # Sum up the story points done
-        total_sp_done = sum(sp_done_dict.values())
-        # calculate remaining SP: all nums in sp_done, subtract from total_sp
-        remaining_sp = total_sp - total_sp_done
-
-        if return_remaining_sp:
-            return remaining_sp
-
-        # append to SP-done: currentSprint: remainingSP (even if 0)
-        current_sprint = get_current_sprint()
-        if current_sprint in sp_done_dict.keys():
-            remaining_sp += sp_done_dict[current_sprint]
-
-        if done_sp_in_sprint:
-            remaining_sp = done_sp_in_sprint
-        sp_done_dict[current_sprint] = remaining_sp
-
-        new_sp_done = ', '.join(f'{k}: {sp_done_dict[k]}' for k in sorted(sp_done_dict, key=int))
-
-        # Update the SP-done property in the file
-        # Surround new_sp_done with double quotes
-        new_sp_done_quoted = f'"{new_sp_done}"'
-        # Replace the SP-done property in the frontmatter
-        def replace_sp_done(match):
-            frontmatter = match.group(1)
-            lines = frontmatter.split('\n')
-            new_lines = []
-            for line in lines:
-                if line.strip().startswith('SP-done:'):
-                    new_lines.append(f'SP-done: {new_sp_done_quoted}')
-                else:
-                    new_lines.append(line)
-            return f"---\n{chr(10).join(new_lines)}\n---"
-        new_content = re.sub(r'^---\s*\n(.*?)\n---', replace_sp_done, content, flags=re.DOTALL)
-        # Write the updated content back to the file
-        with open(file_path, 'w') as file:
-            file.write(new_content)
-
-        # save file
-        # return ok and remaining SP
-        if done_sp_in_sprint:
-            return f'Added {done_sp_in_sprint} SP to current Sprint ({current_sprint})'
-        else:
-            return f'Added remaining SP ({sp_done_dict[current_sprint]}) to current Sprint ({current_sprint})'
+        if note['total_sp'] is None and note['issue_key']:
+            # Import inside function, JiraInterface is only needed when Total-SP is missing
+            from webnotes.JiraInterface import get_jira_issue
+            jira_issue = get_jira_issue(note['issue_key'])
+            if jira_issue and hasattr(jira_issue, 'story_points'):
+                note['total_sp'] = jira_issue.story_points
+                print('Total-SP not found in file, fetched from Jira API:', note['total_sp'])
+
+        return update_note(file_path, note, done_sp_in_sprint, return_remaining_sp)
 
     except Exception as e:
         return f"Error processing file: {str(e)}"
+
+
+def adjust_files(file_paths, done_sp_in_sprint=None, return_remaining_sp=False, jira_issues=None,
+                 max_workers=DEFAULT_WORKERS):
+    """
+    adjust_file for many notes: all notes are read concurrently, the missing Total-SP of all of
+    them are fetched with one bulk Jira request and the notes are written back concurrently.
+
+    Args:
+        file_paths (list): Full paths of the notes
+        jira_issues (dict, optional): issue key -> JiraIssue already at hand, these are not fetched again
+        max_workers (int): Number of threads reading and writing notes
+
+    Returns:
+        list: One report per note, in the order of file_paths (without duplicates), a dict with
+              path, issue_key, fetched_sp (Total-SP came from Jira), ok and result (what adjust_file returns)
+    """
+    # a note must not be written by two threads
+    file_paths = list(dict.fromkeys(file_paths))
+
+    def read(file_path):
+        try:
+            return read_note(file_path)
+        except Exception as e:
+            return f"Error processing file: {str(e)}"
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        notes = list(executor.map(read, file_paths))
+
+    missing = {note['issue_key'] for note in notes
+               if isinstance(note, dict) and note['total_sp'] is None and note['issue_key']}
+    issues = {key: issue for key, issue in (jira_issues or {}).items() if key in missing}
+    if missing - set(issues):
+        # Import inside function, JiraInterface is only needed when Total-SP is missing
+        from webnotes.JiraInterface import get_jira_issues
+        try:
+            issues.update((issue.key, issue) for issue in get_jira_issues(sorted(missing - set(issues))))
+        except Exception as e:
+            # the affected notes report the missing Total-SP
+            print('Could not fetch Total-SP from Jira API:', e)
+
+    def update(file_path, note):
+        report = {'path': file_path, 'issue_key': None, 'fetched_sp': False, 'ok': False}
+        if isinstance(note, str):
+            return {**report, 'result': note}
+        report['issue_key'] = note['issue_key']
+        if note['total_sp'] is None and note['issue_key'] in issues:
+            note['total_sp'] = issues[note['issue_key']].story_points
+            report['fetched_sp'] = True
+        try:
+            result = update_note(file_path, note, done_sp_in_sprint, return_remaining_sp)
+        except Exception as e:
+            return {**report, 'result': f"Error processing file: {str(e)}"}
+        return {**report, 'ok': True, 'result': result}
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(update, file_paths, notes))
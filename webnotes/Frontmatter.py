@@ -0,0 +1,144 @@
+import os
+import shutil
+
+from webnotes.AtomicFiles import atomic_open
+
+MARKER = b'---'
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def _read_header_lines(file):
+    """
+    Read the frontmatter block from the start of a binary file, up to and including the closing `---`.
+
+    Returns:
+        list: The raw header lines including line endings, or None if the file has no frontmatter.
+              The file is positioned right after the header.
+    """
+    first_line = file.readline()
+    if first_line.rstrip() != MARKER:
+        return None
+    lines = [first_line]
+    while True:
+        line = file.readline()
+        if not line:
+            # unterminated frontmatter
+            return None
+        lines.append(line)
+        if line.startswith(MARKER):
+            return lines
+
+
+def _split_property(line):
+    """Return (key, value) of a `key: value` line, or None for list items and comments. Indented lines count, as they always did."""
+    line = line.strip()
+    if not line or line[0] in '-#' or ':' not in line:
+        return None
+    key, value = line.split(':', 1)
+    return key.strip(), value.strip()
+
+
+def parse_properties(lines):
+    """
+    Args:
+        lines (iterable): The lines between the `---` markers
+
+    Returns:
+        dict: property -> raw value (quotes are kept) in file order, the last occurrence of a property wins
+    """
+    properties = {}
+    for line in lines:
+        prop = _split_property(line.rstrip('\r\n'))
+        if prop:
+            properties[prop[0]] = prop[1]
+    return properties
+
+
+def read_properties(path):
+    """
+    Read and parse only the frontmatter of a note, the body is never read.
+
+    Returns:
+        dict: property -> raw value, or None if the note has no frontmatter
+    """
+    with open(path, 'rb') as file:
+        lines = _read_header_lines(file)
+    if lines is None:
+        return None
+    return parse_properties(line.decode('utf-8') for line in lines[1:-1])
+
+
+def unquote(value):
+    return value.strip('"\'') if value else value
+
+
+def _line_ending(line):
+    if line.endswith(b'\r\n'):
+        return b'\r\n'
+    return b'\n' if line.endswith(b'\n') else b''
+
+
+def _update_header(lines, updates, add_missing):
+    new_lines = [lines[0]]
+    found = set()
+    for line in lines[1:-1]:
+        prop = _split_property(line.decode('utf-8').rstrip('\r\n'))
+        if prop and prop[0] in updates:
+            key = prop[0]
+            found.add(key)
+            line = f'{key}: {updates[key]}'.encode('utf-8') + _line_ending(line)
+        new_lines.append(line)
+    if add_missing:
+        ending = _line_ending(lines[0]) or b'\n'
+        new_lines += [f'{key}: {value}'.encode('utf-8') + ending for key, value in updates.items() if key not in found]
+    new_lines.append(lines[-1])
+    return new_lines
+
+
+def _copy_xattrs(path, fd):
+    """Copy the extended attributes (e.g. Finder tags) of path to the open file fd, where the platform supports them."""
+    if not hasattr(os, 'listxattr'):
+        return
+    try:
+        names = os.listxattr(path)
+    except OSError:
+        return
+    for name in names:
+        try:
+            os.setxattr(fd, name, os.getxattr(path, name))
+        except OSError:
+            # e.g. security.* attributes that need privileges
+            pass
+
+
+def update_properties(path, updates, add_missing=True):
+    """
+    Set properties in the frontmatter of a note, all other lines are kept byte for byte.
+
+    The new header and the body are written to a temp file next to the note, which replaces the note
+    once complete, so an interrupted update never leaves a half-written note. A symlinked note stays
+    a symlink, its target is replaced. Permissions and extended attributes (Finder tags) are kept. The
+    body is streamed in chunks of COPY_BUFFER_SIZE and never read as a whole. Nothing is written if no
+    value changes.
+
+    Args:
+        updates (dict): property -> raw value, e.g. {'SP-done': '"377: 2"'}
+        add_missing (bool): Append properties the header doesn't have yet
+
+    Returns:
+        bool: False if the note has no frontmatter
+    """
+    path = os.path.realpath(path)
+    with open(path, 'rb') as file:
+        lines = _read_header_lines(file)
+        if lines is None:
+            return False
+        new_lines = _update_header(lines, updates, add_missing)
+        if new_lines == lines:
+            return True
+
+        with atomic_open(path, 'wb') as new_file:
+            new_file.writelines(new_lines)
+            shutil.copyfileobj(file, new_file, COPY_BUFFER_SIZE)
+            _copy_xattrs(path, new_file.fileno())
+    return True
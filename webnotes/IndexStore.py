@@ -0,0 +1,223 @@
+import os
+import sqlite3
+import threading
+
+from webnotes.AtomicFiles import DEFAULT_LOCK_TIMEOUT, append_line, atomic_write, file_lock
+from webnotes.utilities import DELIMITER, parse_index, get_issue_number_from_url, get_issue_number_from_filename
+
+# Compact the journal once it holds this many times more lines than entries
+COMPACT_RATIO = 2
+COMPACT_MIN_LINES = 1000
+
+
+class TextIndexStore:
+    """
+    url -> filename index, persisted in index.txt with one `url漢filename` line per entry.
+
+    index.txt is used as an append-only journal: new or changed entries are appended and the
+    last line for a url wins, so a lookup never has to rewrite the whole file. Once the file
+    holds many superseded lines it is compacted. The parsed index is kept in-process for as
+    long as the file's mtime, size and inode stay the same.
+
+    Writers serialize on index.txt.lock and rewrites go through a temp file and os.replace, so
+    concurrent workflow invocations can't truncate or interleave the index. Readers never lock.
+    """
+
+    def __init__(self, path, lock_timeout=DEFAULT_LOCK_TIMEOUT):
+        self.path = path
+        self.lock_timeout = lock_timeout
+        self._index = None
+        self._signature = None
+        self._lines = 0
+
+    def _get_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _load(self):
+        signature = self._get_signature()
+        if self._index is not None and signature == self._signature:
+            return self._index
+
+        lines = []
+        if signature is not None:
+            with open(self.path, 'r', encoding='utf-8') as index_file:
+                lines = index_file.readlines()
+        self._index = parse_index(lines)
+        self._lines = len(lines)
+        self._signature = signature
+        return self._index
+
+    def get(self):
+        return dict(self._load())
+
+    def lookup(self, url):
+        return self._load().get(url)
+
+    def find_by_basename(self, basename):
+        return [path for path in self._load().values() if os.path.basename(path) == basename]
+
+    def find_by_issue_key(self, issue_key):
+        return [path for path in self._load().values() if os.path.basename(path).startswith(issue_key)]
+
+    def set(self, url, filename, template=None):
+        self.update({url: filename})
+
+    def update(self, entries, templates=None):
+        """Append all entries that differ from the current index, unchanged entries are not written at all."""
+        if not any(self._load().get(url) != filename for url, filename in entries.items()):
+            return
+
+        with file_lock(self.path, self.lock_timeout):
+            # reload, another process may have written in the meantime
+            index = self._load()
+            changed = {url: filename for url, filename in entries.items() if index.get(url) != filename}
+            if not changed:
+                return
+
+            append_line(self.path, ''.join(f'{url}{DELIMITER}{filename}\n' for url, filename in changed.items()))
+            index.update(changed)
+            self._lines += len(changed)
+            self._signature = self._get_signature()
+
+            if self._lines > max(COMPACT_MIN_LINES, COMPACT_RATIO * len(index)):
+                self._write(index)
+
+    def remove(self, urls):
+        """Remove entries, the journal has no tombstones so the index is rewritten."""
+        if not any(url in self._load() for url in urls):
+            return
+        with file_lock(self.path, self.lock_timeout):
+            index = self._load()
+            self._write({url: filename for url, filename in index.items() if url not in urls})
+
+    def _write(self, index):
+        # callers hold the lock
+        atomic_write(self.path, ''.join(f'{url}{DELIMITER}{filename}\n' for url, filename in index.items()))
+        self._index = dict(index)
+        self._lines = len(index)
+        self._signature = self._get_signature()
+
+    def write(self, index):
+        """Replace the whole index."""
+        with file_lock(self.path, self.lock_timeout):
+            self._write(index)
+
+    def compact(self):
+        """Rewrite the journal with one line per entry."""
+        with file_lock(self.path, self.lock_timeout):
+            self._write(self._load())
+
+
+class SqliteIndexStore:
+    """
+    url -> filename index in an SQLite database, with secondary lookups by basename and issue key.
+
+    Besides url and relative path every row holds the basename, the issue key (from the url or
+    the filename), the template type and the note's mtime, all of them indexed. On first use
+    the entries of an existing index.txt are migrated.
+    """
+
+    def __init__(self, path, notes_path, migrate_from=None):
+        """
+        Args:
+            path (str): The SQLite file
+            notes_path (str): The root folder of the notes, paths are stored relative to it
+            migrate_from (str, optional): An index.txt to import if it was not migrated yet
+        """
+        self.path = path
+        self.notes_path = notes_path
+        # sqlite connections must not be shared between threads, the watcher writes from its own thread
+        self._local = threading.local()
+        self._connect().executescript(
+            'CREATE TABLE IF NOT EXISTS notes ('
+            'url TEXT PRIMARY KEY, path TEXT NOT NULL, basename TEXT NOT NULL, '
+            'issue_key TEXT, template TEXT, mtime REAL);'
+            'CREATE INDEX IF NOT EXISTS notes_path ON notes(path);'
+            'CREATE INDEX IF NOT EXISTS notes_basename ON notes(basename);'
+            'CREATE INDEX IF NOT EXISTS notes_issue_key ON notes(issue_key);'
+            'CREATE INDEX IF NOT EXISTS notes_template ON notes(template);'
+            'CREATE INDEX IF NOT EXISTS notes_mtime ON notes(mtime);'
+        )
+        if migrate_from:
+            self._migrate(migrate_from)
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path, timeout=5)
+        return connection
+
+    def _migrate(self, index_filename):
+        migrated = self._connect().execute('PRAGMA user_version').fetchone()[0]
+        if migrated or not os.path.exists(index_filename):
+            return
+        with open(index_filename, 'r', encoding='utf-8') as index_file:
+            index = parse_index(index_file)
+        self.update(index)
+        with self._connect() as connection:
+            connection.execute('PRAGMA user_version = 1')
+
+    def _row(self, url, filename, template):
+        basename = os.path.basename(filename)
+        issue_key = get_issue_number_from_url(url) or (get_issue_number_from_filename(basename) if basename else None)
+        try:
+            mtime = os.path.getmtime(os.path.join(self.notes_path, filename))
+        except OSError:
+            mtime = None
+        return url, filename, basename, issue_key, template, mtime
+
+    def get(self):
+        return dict(self._connect().execute('SELECT url, path FROM notes'))
+
+    def lookup(self, url):
+        row = self._connect().execute('SELECT path FROM notes WHERE url = ?', (url,)).fetchone()
+        return row[0] if row else None
+
+    def find_by_basename(self, basename):
+        rows = self._connect().execute('SELECT path FROM notes WHERE basename = ?', (basename,))
+        return [row[0] for row in rows]
+
+    def find_by_issue_key(self, issue_key):
+        rows = self._connect().execute('SELECT path FROM notes WHERE issue_key = ? ORDER BY mtime DESC', (issue_key,))
+        return [row[0] for row in rows]
+
+    def set(self, url, filename, template=None):
+        self.update({url: filename}, {url: template})
+
+    def update(self, entries, templates=None):
+        templates = templates or {}
+        rows = [self._row(url, filename, templates.get(url)) for url, filename in entries.items()]
+        with self._connect() as connection:
+            connection.executemany('INSERT OR REPLACE INTO notes VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+    def remove(self, urls):
+        with self._connect() as connection:
+            connection.executemany('DELETE FROM notes WHERE url = ?', [(url,) for url in urls])
+
+    def write(self, index):
+        """Replace the whole index."""
+        with self._connect() as connection:
+            connection.execute('DELETE FROM notes')
+        self.update(index)
+
+
+_stores = {}
+
+
+def get_index_store(path, backend='text', notes_path=None):
+    """
+    Return the store for the given index.txt, shared within the process so its cache is reused.
+
+    With backend 'sqlite' the index lives in index.sqlite next to index.txt, which is migrated on first use.
+    """
+    if (path, backend) not in _stores:
+        if backend == 'sqlite':
+            sqlite_path = os.path.join(os.path.dirname(path), 'index.sqlite')
+            _stores[(path, backend)] = SqliteIndexStore(sqlite_path, notes_path, migrate_from=path)
+        else:
+            _stores[(path, backend)] = TextIndexStore(path)
+    return _stores[(path, backend)]
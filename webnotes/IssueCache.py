@@ -0,0 +1,101 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+from webnotes.JiraClient import loads
+
+DEFAULT_TTL = 3600
+CACHE_FILENAME = 'issue_cache.sqlite'
+
+
+class IssueCache:
+    """
+    Persistent on-disk cache of Jira issues, shared by all workflow invocations.
+
+    Every entry holds the raw (projected) issue JSON as returned by Jira, the issue's
+    `updated` timestamp and the time it was fetched. Entries younger than the TTL are
+    fresh; older entries can be revalidated cheaply by comparing `updated`.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL, stale_while_revalidate=False):
+        """
+        Args:
+            path (str): The SQLite file to store the cache in
+            ttl (float): Seconds an entry is served without revalidation
+            stale_while_revalidate (bool): Serve stale entries immediately and revalidate them in the background
+        """
+        self.path = path
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        # sqlite connections must not be shared between threads
+        self._local = threading.local()
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS issues ('
+                'key TEXT PRIMARY KEY, data TEXT NOT NULL, updated TEXT, fetched_at REAL NOT NULL)'
+            )
+            self._local.connection = connection
+        return connection
+
+    def get(self, issue_key):
+        """
+        Look up an issue.
+
+        Returns:
+            tuple: (jira_data, is_fresh) or None if the issue is not cached
+        """
+        row = self._connect().execute(
+            'SELECT data, fetched_at FROM issues WHERE key = ?', (issue_key,)
+        ).fetchone()
+        if not row:
+            return None
+        data, fetched_at = row
+        return loads(data), time.time() - fetched_at < self.ttl
+
+    def put(self, jira_data):
+        self.put_many([jira_data])
+
+    def put_many(self, jira_data_list):
+        now = time.time()
+        rows = [
+            (jira_data['key'], json.dumps(jira_data), jira_data.get('fields', {}).get('updated'), now)
+            for jira_data in jira_data_list if 'key' in jira_data
+        ]
+        with self._connect() as connection:
+            connection.executemany('INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?)', rows)
+
+    def touch(self, issue_key):
+        """Mark an entry as fresh again after Jira confirmed it did not change."""
+        with self._connect() as connection:
+            connection.execute('UPDATE issues SET fetched_at = ? WHERE key = ?', (time.time(), issue_key))
+
+    def invalidate(self, issue_key):
+        with self._connect() as connection:
+            connection.execute('DELETE FROM issues WHERE key = ?', (issue_key,))
+
+    def revalidate_in_background(self, issue_key):
+        """Revalidate an entry in a detached process, so the current (short-lived) workflow can return right away."""
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.Popen(
+            [sys.executable, '-m', 'webnotes.IssueCache', 'revalidate', issue_key],
+            cwd=project_root,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+
+if __name__ == '__main__':
+    # Used by revalidate_in_background: python -m webnotes.IssueCache revalidate <issue_key>
+    if len(sys.argv) > 2 and sys.argv[1] == 'revalidate':
+        from webnotes import JiraInterface
+        JiraInterface.revalidate_jira_issue(sys.argv[2])
@@ -0,0 +1,94 @@
+import json
+
+try:
+    # orjson parses large issue payloads several times faster, but is optional
+    import orjson
+
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class JiraRequestError(Exception):
+    """Raised when Jira answers a request with an unexpected status code."""
+
+    def __init__(self, response):
+        super().__init__(f"{response.status_code} - {response.text}")
+        self.status_code = response.status_code
+        self.text = response.text
+
+
+def parse_json(response):
+    """Parse a response body with the fastest available JSON backend, raises json.JSONDecodeError."""
+    return loads(response.content)
+
+
+class JiraClient:
+    """
+    Thin wrapper around one pooled, keep-alive requests.Session for the Jira REST API.
+
+    All calls share the same connection pool, so consecutive requests against the
+    same Jira host reuse the TCP/TLS connection instead of doing a new handshake.
+    """
+
+    def __init__(self, custom_domain, email, token, board_id=None, pool_size=DEFAULT_POOL_SIZE,
+                 timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+        """
+        Args:
+            custom_domain (str): The Jira host, e.g. domain.atlassian.net
+            email (str): The email used for basic auth
+            token (str): The API token used for basic auth
+            board_id (str, optional): The id of the agile board
+            pool_size (int): Maximum number of kept-alive connections
+            timeout (float): Connect/read timeout in seconds for every request
+            retries (int): How many times a request is retried on 429/5xx
+            backoff (float): Backoff factor between retries (Retry-After is respected)
+        """
+        # requests is only imported once a client is created, it dominates the import time otherwise
+        import requests
+        from requests.adapters import HTTPAdapter
+        from requests.auth import HTTPBasicAuth
+        from urllib3.util.retry import Retry
+
+        self.base_url = f"https://{custom_domain}"
+        self.board_id = board_id
+        self.timeout = timeout
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUS_CODES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.auth = HTTPBasicAuth(email, token)
+        self.session.headers.update({
+            "Accept": "application/json"
+        })
+        self.session.mount("https://", adapter)
+
+    def request(self, method, path, **kwargs):
+        """Send a request to the given REST path (e.g. /rest/api/3/issue/KEY) over the shared session."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, f"{self.base_url}{path}", **kwargs)
+
+    def get(self, path, params=None, **kwargs):
+        return self.request("GET", path, params=params, **kwargs)
+
+    def post(self, path, data=None, **kwargs):
+        headers = {"Content-Type": "application/json"}
+        headers.update(kwargs.pop('headers', {}))
+        return self.request("POST", path, data=data, headers=headers, **kwargs)
+
+    def close(self):
+        self.session.close()
@@ -1,165 +1,309 @@
-import configparser
 import json
 import os
-import requests
-from requests.auth import HTTPBasicAuth
+from concurrent.futures import ThreadPoolExecutor
 
-from webnotes import utilities
+from webnotes.IssueCache import IssueCache, CACHE_FILENAME, DEFAULT_TTL
+from webnotes.JiraClient import JiraClient, JiraRequestError, parse_json, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT, DEFAULT_RETRIES, DEFAULT_BACKOFF
+from webnotes.JiraObjects.JiraIssue import JiraIssue
 from webnotes.JiraObjects.Sprint import Sprint
+from webnotes.Settings import get_settings
+from webnotes.TransitionResolver import TransitionResolver
 
 
-def get_story_points(story_points):
-    if '.' in str(story_points):
-        story_points = str(story_points).split('.')[0]  # Take only the integer part
-    return story_points
+def init_config():
+    config = get_settings()
+    jira_token = config.get('API', 'jira_token')
+    jira_email = config.get('API', 'jira_email')
+    jira_custom_domain = config.get('API', 'jira_custom_domain')
+    jira_board_id = config.get('API', 'jira_board_id')
+    return jira_custom_domain, jira_email, jira_token, jira_board_id
 
 
-def get_parent(parent, summary):
-    parent_number, parent_summary = parent
-    possible_topics = ['ATK', 'ETK', 'Briefzentrum', 'Fastlane', 'FlexPack', 'Sorting', 'VAS', 'C-Hand', 'ON1', 'Sortierung', 'Komponentisierung']
-    for topic in possible_topics:
-        if topic.lower() in parent_summary.lower():
-            return parent_number, topic
+def get_close_status():
+    return get_settings().get('API', 'close_status', fallback='Closed')
 
-    # Check issues title as fallback
-    for topic in possible_topics:
-        if topic.lower() in summary.lower():
-            return parent_number, topic
 
-    return parent_number, None
+def init_client_options():
+    # Optional connection settings, all with sensible defaults
+    config = get_settings()
+    return {
+        'pool_size': config.getint('API', 'pool_size', fallback=DEFAULT_POOL_SIZE),
+        'timeout': config.getfloat('API', 'timeout', fallback=DEFAULT_TIMEOUT),
+        'retries': config.getint('API', 'retries', fallback=DEFAULT_RETRIES),
+        'backoff': config.getfloat('API', 'backoff', fallback=DEFAULT_BACKOFF),
+    }
 
 
-class JiraIssue:
-    def __init__(self, key, summary, status, story_points, description, assignee, reporter, parent):
-        self.key = key
-        self.summary = summary
-        self.status = status
-        self.story_points = get_story_points(story_points)
-        self.description = description
-        self.assignee = assignee
-        self.reporter = reporter
-        parent_number, topic = get_parent(parent, summary)  # Tuple of (parent_key, parent_topic)
-        self.parent_key = parent_number
-        self.parent_topic = topic
+# The process wide objects below are created again whenever get_settings() reloaded a changed config.ini,
+# so a long running daemon picks up a new token, pool size, cache TTL, etc.
+_client = None
+_client_settings = None
 
-    def __str__(self):
-        return f"{self.key} ({self.parent_topic}), {self.summary}, {self.status}, {self.story_points}, {self.description[:100]}..."
 
-    def get_link(self):
-        return utilities.get_jira_url(self.key)
+def get_client():
+    """Return the process wide JiraClient, so all calls share one pooled session."""
+    global _client, _client_settings
+    settings = get_settings()
+    if _client is None or _client_settings is not settings:
+        jira_custom_domain, jira_email, jira_token, jira_board_id = init_config()
+        _client = JiraClient(jira_custom_domain, jira_email, jira_token, jira_board_id, **init_client_options())
+        _client_settings = settings
+    return _client
 
 
-def init_config():
-    # Read configuration from config.ini
-    config = configparser.ConfigParser()
-    config.read(os.path.join(os.path.dirname(__file__), 'config.ini'))
-    jira_token = config.get('API', 'jira_token')
-    jira_email = config.get('API', 'jira_email')
-    jira_custom_domain = config.get('API', 'jira_custom_domain')
-    jira_board_id = config.get('API', 'jira_board_id')
-    return jira_custom_domain, jira_email, jira_token, jira_board_id
+def init_cache_options():
+    config = get_settings()
+    return {
+        'enabled': config.getboolean('CACHE', 'enabled', fallback=True),
+        'path': config.get('CACHE', 'path', fallback=os.path.join(os.path.dirname(__file__), CACHE_FILENAME)),
+        'ttl': config.getfloat('CACHE', 'ttl', fallback=DEFAULT_TTL),
+        'stale_while_revalidate': config.getboolean('CACHE', 'stale_while_revalidate', fallback=False),
+    }
 
 
-def get_jira_issue(issue_key):
-    jira_custom_domain, jira_email, jira_token, _ = init_config()
+_issue_cache = None
+_issue_cache_settings = None
+
+
+def get_issue_cache():
+    """Return the process wide IssueCache, or None if the cache is disabled in config.ini."""
+    global _issue_cache, _issue_cache_settings
+    settings = get_settings()
+    if _issue_cache is None or _issue_cache_settings is not settings:
+        options = init_cache_options()
+        _issue_cache = IssueCache(options['path'], options['ttl'], options['stale_while_revalidate']) if options['enabled'] else False
+        _issue_cache_settings = settings
+    return _issue_cache or None
+
+
+_transition_resolver = None
+_transition_resolver_settings = None
+
+
+def get_transition_resolver():
+    """Return the process wide TransitionResolver, persisted next to the issue cache if that is enabled."""
+    global _transition_resolver, _transition_resolver_settings
+    settings = get_settings()
+    if _transition_resolver is None or _transition_resolver_settings is not settings:
+        options = init_cache_options()
+        path = options['path'] if options['enabled'] else ':memory:'
+        _transition_resolver = TransitionResolver(path, get_transitions)
+        _transition_resolver_settings = settings
+    return _transition_resolver
+
+
+# Fields needed to build a JiraIssue, requested explicitly for bulk searches
+ISSUE_FIELDS = ['summary', 'status', 'customfield_10013', 'assignee', 'reporter', 'parent', 'description', 'updated', 'issuetype']
+# The review table never reads descriptions, which are by far the largest field
+TABLE_FIELDS = [field for field in ISSUE_FIELDS if field != 'description']
+SEARCH_PAGE_SIZE = 100
+SPRINT_PAGE_SIZE = 50
+
+DONE_ISSUES_JQL = 'sprint IN openSprints() AND "Team[Team]" = 26 AND status IN (Resolved, Closed) AND project = "Operations Area" AND type = Story'
 
-    url = f"https://{jira_custom_domain}/rest/api/3/issue/{issue_key}"
-    auth = HTTPBasicAuth(jira_email, jira_token)
-    headers = {
-        "Accept": "application/json"
-    }
 
-    response = requests.get(url, headers=headers, auth=auth)
+def get_jira_issue(issue_key, force_refresh=False):
+    """
+    Get an issue, served from the on-disk IssueCache as long as the cached entry is fresh.
+
+    Args:
+        issue_key (str): The issue key, e.g. OPA-1234
+        force_refresh (bool): Bypass the cache, e.g. when the current status matters
+    """
+    cache = get_issue_cache()
+    if cache and not force_refresh:
+        cached = cache.get(issue_key)
+        if cached:
+            jira_data, is_fresh = cached
+            if is_fresh:
+                return JiraIssue.from_json(jira_data)
+            if cache.stale_while_revalidate:
+                cache.revalidate_in_background(issue_key)
+                return JiraIssue.from_json(jira_data)
+            return revalidate_jira_issue(issue_key)
+    return fetch_jira_issue(issue_key)
+
+
+def fetch_jira_issue(issue_key):
+    # Only request the fields a JiraIssue is built from, full issues with rendered fields can be hundreds of KB
+    response = get_client().get(f"/rest/api/3/issue/{issue_key}", params={'fields': ','.join(ISSUE_FIELDS)})
 
     # Parse the JSON data
     try:
-        jira_data = json.loads(response.text)
-        default = 'N/A'
-
-        # Extract the requested fields
-        key = jira_data.get('key', default)
-        summary = jira_data.get('fields', {}).get('summary', default)
-
-        # Get story points (usually stored in customfield_10013 in Jira Cloud)
-        story_points = jira_data.get('fields', {}).get('customfield_10013', default)
-
-        # Get status name
-        status = jira_data.get('fields', {}).get('status', {}).get('name', default)
-
-        # Get description - might be complex formatted content
-        description = jira_data.get('fields', {}).get('description', {})
-        description_text = "Description not available in simple text format"
-
-        try:
-            # get Assignee information
-            assignee_id = jira_data.get('fields', {}).get('assignee', {}).get('accountId', default)
-            assignee_name = jira_data.get('fields', {}).get('assignee', {}).get('displayName', default)
-        except AttributeError:
-            assignee_id = None
-            assignee_name = 'Unassigned'
-
-        try:
-            # get Reporter information
-            reporter_id = jira_data.get('fields', {}).get('reporter', {}).get('accountId', default)
-            reporter_name = jira_data.get('fields', {}).get('reporter', {}).get('displayName', default)
-        except AttributeError:
-            reporter_id = None
-            reporter_name = 'Unassigned'
-
-        # Get Parent information if it exists
-        parent_key = jira_data.get('fields', {}).get('parent', {}).get('key', default)
-        parent_summary = jira_data.get('fields', {}).get('parent', {}).get('fields', {}).get('summary', default)
-
-        # Try to extract plain text from the description if it exists and has content
-        if isinstance(description, dict) and 'content' in description:
-            try:
-                # Simple extraction attempt for plain text
-                description_text = "".join([
-                    node.get('text', '')
-                    for content in description.get('content', [])
-                    for node in content.get('content', [])
-                    if 'text' in node
-                ])
-                if not description_text:
-                    description_text = "Description exists but couldn't extract plain text"
-            except Exception as e:
-                description_text = f"Error extracting description text: {str(e)}"
-
-        if key == default or summary == default or status == default or story_points == default:
-            return None
-        return JiraIssue(key, summary, status, story_points, description_text, (assignee_id, assignee_name), (reporter_id, reporter_name), (parent_key, parent_summary))
-
+        jira_data = parse_json(response)
     except json.JSONDecodeError as e:
         return None
 
+    jira_issue = JiraIssue.from_json(jira_data)
+    if jira_issue:
+        cache_jira_data([jira_data])
+    return jira_issue
+
+
+def revalidate_jira_issue(issue_key):
+    """Refetch a cached issue only if its `updated` timestamp on Jira differs from the cached one."""
+    cache = get_issue_cache()
+    cached = cache.get(issue_key) if cache else None
+    if cached:
+        jira_data, _ = cached
+        response = get_client().get(f"/rest/api/3/issue/{issue_key}", params={'fields': 'updated'})
+        if response.status_code == 200:
+            updated = parse_json(response).get('fields', {}).get('updated')
+            if updated and updated == jira_data.get('fields', {}).get('updated'):
+                cache.touch(issue_key)
+                return JiraIssue.from_json(jira_data)
+    return fetch_jira_issue(issue_key)
+
+
+def cache_jira_data(jira_data_list):
+    cache = get_issue_cache()
+    if not cache:
+        return
+    # Only keep the fields a JiraIssue is built from
+    cache.put_many([
+        {
+            'key': jira_data.get('key'),
+            'fields': {field: value for field, value in jira_data.get('fields', {}).items() if field in ISSUE_FIELDS}
+        }
+        for jira_data in jira_data_list
+    ])
+
+
+def iter_pages(fetch_page, cursor):
+    """
+    Yield the items of all pages returned by fetch_page(cursor) -> (items, next_cursor).
+
+    The next page is already requested in the background while the caller consumes the
+    current one. Pages stop being fetched as soon as the caller stops iterating.
+    """
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(fetch_page, cursor)
+    try:
+        while future:
+            items, next_cursor = future.result()
+            future = executor.submit(fetch_page, next_cursor) if next_cursor is not None else None
+            yield from items
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
 
-def get_transitions(issue_key):
-    jira_custom_domain, jira_email, jira_token, _ = init_config()
+def iter_search(jql, fields=('key',), page_size=SEARCH_PAGE_SIZE):
+    """
+    Yield the raw JSON of every issue matching the JQL, following nextPageToken.
 
-    url = f"https://{jira_custom_domain}/rest/api/3/issue/{issue_key}/transitions"
-    auth = HTTPBasicAuth(jira_email, jira_token)
-    headers = {
-        "Accept": "application/json"
+    Raises:
+        JiraRequestError: If Jira rejects the search
+    """
+    query = {
+        'jql': jql,
+        'fields': ','.join(fields),
+        'maxResults': page_size,
     }
 
-    response = requests.get(url, headers=headers, auth=auth)
+    def fetch_page(next_page_token):
+        params = dict(query, nextPageToken=next_page_token) if next_page_token else query
+        response = get_client().get("/rest/api/3/search/jql", params=params)
+        if response.status_code != 200:
+            raise JiraRequestError(response)
+
+        search_data = parse_json(response)
+        next_page_token = search_data.get('nextPageToken')
+        if search_data.get('isLast', True) or not next_page_token:
+            next_page_token = None
+        return search_data.get('issues', []), next_page_token
+
+    return iter_pages(fetch_page, '')
+
+
+def iter_board_sprints(state="active,future", page_size=SPRINT_PAGE_SIZE):
+    """
+    Yield a Sprint for every sprint of the configured board in the given state(s), following startAt.
+
+    Raises:
+        JiraRequestError: If Jira rejects the request
+    """
+    client = get_client()
+
+    def fetch_page(start_at):
+        params = {
+            "state": state,
+            "startAt": start_at,
+            "maxResults": page_size,
+        }
+        response = client.get(f"/rest/agile/1.0/board/{client.board_id}/sprint", params=params)
+        if response.status_code != 200:
+            raise JiraRequestError(response)
+
+        sprints_data = parse_json(response)
+        values = sprints_data.get("values", [])
+        next_start_at = None if sprints_data.get("isLast", True) or not values else start_at + len(values)
+        return [Sprint(sprint_data) for sprint_data in values], next_start_at
+
+    return iter_pages(fetch_page, 0)
+
+
+def iter_story_keys(filter_query, page_size=SEARCH_PAGE_SIZE):
+    """Yield the keys of all issues matching the JQL, callers can stop as soon as they have enough."""
+    for issue_data in iter_search(filter_query, ['key'], page_size):
+        if 'key' in issue_data:
+            yield issue_data['key']
+
+
+def search_jira_issues(jql, fields=ISSUE_FIELDS):
+    """
+    Run a JQL search and build a JiraIssue for every result, following all result pages.
+
+    Returns:
+        list: The found JiraIssues, or None if Jira rejected the search
+    """
+    issues = []
+    found_data = []
+    try:
+        for issue_data in iter_search(jql, fields):
+            jira_issue = JiraIssue.from_json(issue_data)
+            if jira_issue:
+                issues.append(jira_issue)
+                found_data.append(issue_data)
+    except JiraRequestError:
+        return None
+
+    if set(ISSUE_FIELDS) <= set(fields):
+        cache_jira_data(found_data)
+    return issues
+
+
+def get_jira_issues(issue_keys, fields=ISSUE_FIELDS):
+    """
+    Fetch several issues with one JQL search per SEARCH_PAGE_SIZE keys instead of one request per issue.
+
+    Returns:
+        list: The found JiraIssues in the order of issue_keys, unknown keys are skipped
+    """
+    issue_keys = list(dict.fromkeys(issue_keys))
+    issues_by_key = {}
+
+    for start in range(0, len(issue_keys), SEARCH_PAGE_SIZE):
+        chunk = issue_keys[start:start + SEARCH_PAGE_SIZE]
+        issues = search_jira_issues(f'key IN ({", ".join(chunk)})', fields)
+        if issues is None:
+            # Jira rejects the whole query if one key does not exist (anymore), fetch this chunk one by one
+            issues = [issue for issue in map(get_jira_issue, chunk) if issue]
+        for jira_issue in issues:
+            issues_by_key[jira_issue.key] = jira_issue
+
+    return [issues_by_key[key] for key in issue_keys if key in issues_by_key]
+
+
+def get_transitions(issue_key):
+    response = get_client().get(f"/rest/api/3/issue/{issue_key}/transitions")
 
     if response.status_code == 200:
-        return response.json().get('transitions', [])
+        return parse_json(response).get('transitions', [])
     else:
         return []
 
 
 def transition_issue(issue_key, transition_id):
-    jira_custom_domain, jira_email, jira_token, _ = init_config()
-
-    url = f"https://{jira_custom_domain}/rest/api/3/issue/{issue_key}/transitions"
-    auth = HTTPBasicAuth(jira_email, jira_token)
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json"
-    }
-
     payload = json.dumps({
         "fields": {
             "resolution": {
@@ -172,106 +316,65 @@ def transition_issue(issue_key, transition_id):
 
     })
 
-    response = requests.request(
-        "POST",
-        url,
-        data=payload,
-        headers=headers,
-        auth=auth
-    )
+    response = get_client().post(f"/rest/api/3/issue/{issue_key}/transitions", data=payload)
 
     if response.status_code == 204:
+        # the cached status is outdated now
+        cache = get_issue_cache()
+        if cache:
+            cache.invalidate(issue_key)
         return issue_key
     else:
         return 'Failed to close issue: ' + issue_key + ' - ' + response.text
 
 
-def get_all_done_issues_from_current_sprint():
-    jira_custom_domain, jira_email, jira_token, _ = init_config()
+def resolve_transitions(jira_issues, status_name):
+    """
+    Resolve the transition leading each issue to status_name, with at most one transitions lookup per workflow state.
 
-    url = f"https://{jira_custom_domain}/rest/api/2/search/jql"
-    auth = HTTPBasicAuth(jira_email, jira_token)
-    headers = {
-        "Accept": "application/json"
-    }
+    Returns:
+        list: (jira_issue, transition_id) pairs, transition_id is None if the issue cannot reach status_name
+    """
+    resolver = get_transition_resolver()
+    return [(jira_issue, resolver.resolve(jira_issue, status_name)) for jira_issue in jira_issues]
 
-    query = {
-        'jql': 'sprint IN openSprints() AND "Team[Team]" = 26 AND status IN (Resolved, Closed) AND project = "Operations Area" AND type = Story',
-        'fields': 'key',
-    }
 
-    response = requests.get(url, headers=headers, params=query, auth=auth)
+def transition_issue_to(jira_issue, status_name):
+    """Transition an issue to the given target status (e.g. "Closed") instead of a hard-coded transition id."""
+    transition_id = get_transition_resolver().resolve(jira_issue, status_name)
+    if transition_id is None:
+        return f'Failed to close issue: {jira_issue.key} - no transition to {status_name}'
 
-    if response.status_code == 200:
-        return extract_issues_numbers(response.json().get('issues', []))
-    else:
-        return []
-
-
-def get_story_keys_from_backlog(filter_query):
-    jira_custom_domain, jira_email, jira_token, _ = init_config()
+    result = transition_issue(jira_issue.key, transition_id)
+    if result != jira_issue.key:
+        # the workflow might have changed since the transitions were cached
+        get_transition_resolver().forget(jira_issue)
+    return result
 
-    url = f"https://{jira_custom_domain}/rest/api/2/search/jql"
-    auth = HTTPBasicAuth(jira_email, jira_token)
-    headers = {
-        "Accept": "application/json"
-    }
 
-    query = {
-        'jql': filter_query,
-        'fields': 'key',
-    }
+def get_all_done_issues_from_current_sprint():
+    try:
+        return extract_issues_numbers(iter_search(DONE_ISSUES_JQL))
+    except JiraRequestError:
+        return []
 
-    response = requests.get(url, headers=headers, params=query, auth=auth)
 
-    if response.status_code == 200:
-        return extract_issues_numbers(response.json().get('issues', []))
-    else:
+def get_story_keys_from_backlog(filter_query):
+    try:
+        return list(iter_story_keys(filter_query))
+    except JiraRequestError:
         return []
 
 
 def get_all_open_sprints():
-    jira_custom_domain, jira_email, jira_token, board_id = init_config()
-
-    url = f"https://{jira_custom_domain}/rest/agile/1.0/board/{board_id}/sprint"
-    auth = HTTPBasicAuth(jira_email, jira_token)
-    headers = {
-        "Accept": "application/json"
-    }
-
-    params = {
-        "state": "active,future"
-    }
-
-    response = requests.get(url, headers=headers, auth=auth, params=params)
-    sprint_list = []
-
-    if response.status_code == 200:
-        sprints_data = response.json()["values"]
-
-        for sprint_data in sprints_data:
-            sprint = Sprint(sprint_data)
-            sprint_list.append(sprint)
-            # print(f"Sprint ID: {sprint.id}, Name: {sprint.name}, State: {sprint.state}")
+    try:
+        return list(iter_board_sprints("active,future"))
+    except JiraRequestError:
+        return []
 
-    return sprint_list
 
 def get_open_stories_from_sprint(sprint_id):
-    jira_custom_domain, jira_email, jira_token, board_id = init_config()
-
-    url = f"https://{jira_custom_domain}/rest/agile/1.0/sprint/{sprint_id}/issue"
-    auth = HTTPBasicAuth(jira_email, jira_token)
-    headers = {
-        "Accept": "application/json",
-        "Authorization": f"{jira_token}"
-    }
-
-    response = requests.request(
-        "GET",
-        url,
-        headers=headers,
-        auth=auth
-    )
+    response = get_client().get(f"/rest/agile/1.0/sprint/{sprint_id}/issue")
 
     if response.status_code == 200:
         return 'found'
@@ -280,10 +383,10 @@ def get_open_stories_from_sprint(sprint_id):
 
 
 def get_finish_sprint_table_data():
-    issue_numbers = get_all_done_issues_from_current_sprint()
-    table_data = []
-    for issue_number in issue_numbers:
-        table_data.append(get_jira_issue(issue_number))
+    # One search returning all fields instead of a key search followed by one request per issue
+    table_data = search_jira_issues(DONE_ISSUES_JQL, TABLE_FIELDS)
+    if table_data is None:
+        return get_jira_issues(get_all_done_issues_from_current_sprint())
     return table_data
 
 
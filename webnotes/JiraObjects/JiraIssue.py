@@ -0,0 +1,143 @@
+from webnotes import utilities
+from webnotes.TopicClassifier import get_default_classifier
+
+_UNSET = object()
+
+
+def get_story_points(story_points):
+    if '.' in str(story_points):
+        story_points = str(story_points).split('.')[0]  # Take only the integer part
+    return story_points
+
+
+def get_parent(parent, summary):
+    parent_number, parent_summary = parent
+    return parent_number, get_default_classifier().classify(parent_number, parent_summary, summary)
+
+
+def get_description_text(description):
+    """Extract plain text from a description in Atlassian document format."""
+    if isinstance(description, str):
+        return description
+
+    description_text = "Description not available in simple text format"
+    # Try to extract plain text from the description if it exists and has content
+    if isinstance(description, dict) and 'content' in description:
+        try:
+            # Simple extraction attempt for plain text
+            description_text = "".join([
+                node.get('text', '')
+                for content in description.get('content', [])
+                for node in content.get('content', [])
+                if 'text' in node
+            ])
+            if not description_text:
+                description_text = "Description exists but couldn't extract plain text"
+        except Exception as e:
+            description_text = f"Error extracting description text: {str(e)}"
+    return description_text
+
+
+class JiraIssue:
+    """
+    Immutable record of a Jira issue.
+
+    The derived attributes parent_topic and description (plain text) are only computed
+    on first access, as most callers never read them.
+    """
+
+    __slots__ = ('key', 'summary', 'status', 'story_points', 'assignee', 'reporter', 'parent_key',
+                 'parent_summary', 'issue_type', '_raw_description', '_description', '_parent_topic')
+
+    def __init__(self, key, summary, status, story_points, description, assignee, reporter, parent, issue_type=None):
+        """
+        Args:
+            description: Plain text or the description in Atlassian document format
+            assignee (tuple): (account_id, display_name)
+            reporter (tuple): (account_id, display_name)
+            parent (tuple): (parent_key, parent_summary)
+        """
+        parent_key, parent_summary = parent
+        for name, value in (('key', key), ('summary', summary), ('status', status),
+                            ('story_points', get_story_points(story_points)), ('assignee', assignee),
+                            ('reporter', reporter), ('parent_key', parent_key), ('parent_summary', parent_summary),
+                            ('issue_type', issue_type), ('_raw_description', description),
+                            ('_description', _UNSET), ('_parent_topic', _UNSET)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @property
+    def description(self):
+        if self._description is _UNSET:
+            object.__setattr__(self, '_description', get_description_text(self._raw_description))
+            object.__setattr__(self, '_raw_description', None)
+        return self._description
+
+    @property
+    def parent_topic(self):
+        if self._parent_topic is _UNSET:
+            object.__setattr__(self, '_parent_topic', get_default_classifier().classify_issue(self))
+        return self._parent_topic
+
+    def __str__(self):
+        return f"{self.key} ({self.parent_topic}), {self.summary}, {self.status}, {self.story_points}, {self.description[:100]}..."
+
+    def get_link(self):
+        return utilities.get_jira_url(self.key)
+
+    @classmethod
+    def from_json(cls, jira_data):
+        """
+        Build a JiraIssue directly from the (projected) issue JSON returned by Jira.
+
+        Returns:
+            JiraIssue: The issue, or None if a required field is missing
+        """
+        default = 'N/A'
+
+        # Extract the requested fields
+        key = jira_data.get('key', default)
+        fields = jira_data.get('fields', {})
+        summary = fields.get('summary', default)
+
+        # Get story points (usually stored in customfield_10013 in Jira Cloud)
+        story_points = fields.get('customfield_10013', default)
+
+        # Get status name
+        status = fields.get('status', {}).get('name', default)
+
+        if key == default or summary == default or status == default or story_points == default:
+            return None
+
+        # Get issue type name, part of the workflow state transitions depend on
+        issue_type = (fields.get('issuetype') or {}).get('name')
+
+        try:
+            # get Assignee information
+            assignee_id = fields.get('assignee', {}).get('accountId', default)
+            assignee_name = fields.get('assignee', {}).get('displayName', default)
+        except AttributeError:
+            assignee_id = None
+            assignee_name = 'Unassigned'
+
+        try:
+            # get Reporter information
+            reporter_id = fields.get('reporter', {}).get('accountId', default)
+            reporter_name = fields.get('reporter', {}).get('displayName', default)
+        except AttributeError:
+            reporter_id = None
+            reporter_name = 'Unassigned'
+
+        # Get Parent information if it exists
+        parent_key = fields.get('parent', {}).get('key', default)
+        parent_summary = fields.get('parent', {}).get('fields', {}).get('summary', default)
+
+        # Description might be complex formatted content, it is only converted to plain text when read
+        description = fields.get('description', {})
+
+        return cls(key, summary, status, story_points, description, (assignee_id, assignee_name), (reporter_id, reporter_name), (parent_key, parent_summary), issue_type)
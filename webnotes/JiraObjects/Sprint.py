@@ -1,11 +1,17 @@
 from datetime import datetime
 
+_UNSET = object()
+
 
 class Sprint:
     """
     Represents a Jira Sprint with all its properties
+
+    Sprints are immutable; the dates are only parsed when they are first read.
     """
 
+    __slots__ = ('id', 'self_url', 'state', 'name', 'origin_board_id', 'goal', '_raw_dates', '_dates')
+
     def __init__(self, json_data):
         """
         Initialize a Sprint object from JSON data returned by Jira API
@@ -13,18 +19,41 @@ class Sprint:
         Args:
             json_data (dict): The JSON data representing a sprint
         """
-        self.id = json_data.get('id')
-        self.self_url = json_data.get('self')
-        self.state = json_data.get('state')
-        self.name = json_data.get('name')
-
-        # Parse dates if they exist
-        self.start_date = self._parse_date(json_data.get('startDate'))
-        self.end_date = self._parse_date(json_data.get('endDate'))
-        self.complete_date = self._parse_date(json_data.get('completeDate'))
-
-        self.origin_board_id = json_data.get('originBoardId')
-        self.goal = json_data.get('goal')
+        set_attribute = object.__setattr__
+        set_attribute(self, 'id', json_data.get('id'))
+        set_attribute(self, 'self_url', json_data.get('self'))
+        set_attribute(self, 'state', json_data.get('state'))
+        set_attribute(self, 'name', json_data.get('name'))
+
+        # Dates are parsed lazily, see _get_date
+        set_attribute(self, '_raw_dates', (json_data.get('startDate'), json_data.get('endDate'), json_data.get('completeDate')))
+        set_attribute(self, '_dates', [_UNSET, _UNSET, _UNSET])
+
+        set_attribute(self, 'origin_board_id', json_data.get('originBoardId'))
+        set_attribute(self, 'goal', json_data.get('goal'))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def _get_date(self, index):
+        if self._dates[index] is _UNSET:
+            self._dates[index] = self._parse_date(self._raw_dates[index])
+        return self._dates[index]
+
+    @property
+    def start_date(self):
+        return self._get_date(0)
+
+    @property
+    def end_date(self):
+        return self._get_date(1)
+
+    @property
+    def complete_date(self):
+        return self._get_date(2)
 
     def _parse_date(self, date_string):
         """
@@ -1,17 +1,23 @@
-import configparser
 import os.path
+from pathlib import Path
 from random import randint
 import shutil
 
-from webnotes.utilities import *
+from webnotes.utilities import (
+    FILE_EXTENSION, TEMPLATE, get_filename, get_header_with_link, get_issue_number_from_filename,
+    get_jira_issue_link_from_pr_title, handle_special_jira_cases, jira_pr_template_values,
+    jira_sup_template_values, jira_template_values,
+)
+from webnotes.Settings import get_settings
+from webnotes.IndexStore import get_index_store
+from webnotes.VaultIndex import get_vault_index
 
 
 class NotesInterface:
 
     def __init__(self, main_path: Path):
-        config = configparser.RawConfigParser()
-        config_path = os.path.join(main_path, 'config.ini')
-        config.read(config_path, encoding='utf8')
+        config = get_settings(os.path.join(main_path, 'config.ini'))
+        self._index_backend: str = config.get('OPTIONS', 'index_backend', fallback='text')
 
         try:
             self._path: str = config.get('OPTIONS', 'path')
@@ -29,11 +35,42 @@ class NotesInterface:
     def get_full_path(self, filename: str):
         return os.path.join(self._path, filename)
 
-    def get_index_file(self, option: str):
+    def get_jira_folders(self):
+        """Return the jira, jira-sup and jira-pr folders, every folder notes of Jira issues are created in."""
+        return [os.path.join(self._path, folder_name)
+                for folder_name in (self._jira_folder_name, self._jira_sup_folder_name, self._jira_pr_folder_name)]
+
+    def get_index_filename(self):
         index_path = self._index_path
         if index_path == 'SAMPLE/PATH':
             index_path = self._path
-        index_filename = os.path.join(index_path, 'index.txt')
+        return os.path.join(index_path, 'index.txt')
+
+    def get_index_store(self):
+        return get_index_store(self.get_index_filename(), self._index_backend, self._path)
+
+    def get_vault_index(self):
+        return get_vault_index(self._path, os.path.join(os.path.dirname(self.get_index_filename()), 'vault_index.json'))
+
+    def find_note(self, names):
+        """Find a note by filename, first among the indexed notes, then in the vault index."""
+        for name in names:
+            for path in self.get_index_store().find_by_basename(os.path.basename(name.rstrip())):
+                if os.path.exists(os.path.join(self._path, path)):
+                    return path
+        return self.get_vault_index().find(names)
+
+    def find_jira_note(self, issue_number, filename):
+        """Find the note of a Jira issue, first among the indexed notes, then in the vault index."""
+        if not issue_number:
+            return None
+        for path in self.get_index_store().find_by_issue_key(issue_number):
+            if os.path.exists(os.path.join(self._path, path)):
+                return path
+        return self.get_vault_index().find_jira(issue_number)
+
+    def get_index_file(self, option: str):
+        index_filename = self.get_index_filename()
         if not os.path.exists(index_filename):
             index_file = open(index_filename, "w", encoding='utf-8')
             index_file.close()
@@ -41,16 +78,10 @@ class NotesInterface:
         return index_file
 
     def get_index(self):
-        index_file = self.get_index_file('r')
-        result = parse_index(index_file)
-        index_file.close()
-        return result
+        return self.get_index_store().get()
 
     def write_index(self, index):
-        index_file = self.get_index_file('w')
-        for key, value in index.items():
-            index_file.write(f'{key}{DELIMITER}{value}\n')
-        index_file.close()
+        self.get_index_store().write(index)
 
     def is_jira(self, filename):
         return (self._jira_path != 'SAMPLE/JIRA/TEMPLATE/PATH'
@@ -157,13 +188,12 @@ class NotesInterface:
         return filename
 
     def get_or_create_file(self, url: str, website_title: str):
-        index = self.get_index()
-
         url, website_title = handle_special_jira_cases(url, website_title)
         url = url.split('?')[0]
         filename = get_filename(website_title)
+        indexed_filename = self.get_index_store().lookup(url)
 
-        if url not in index.keys():
+        if indexed_filename is None:
             # url not yet indexed, create new file
             filename = self.create_new_file(filename, website_title, url)
 
@@ -178,8 +208,7 @@ class NotesInterface:
 
             else:
                 # file was either renamed, moved or deleted
-                old_file_path = os.path.join(self._path, index[url])
-                file_found = find([index[url], filename], self._path)
+                old_file_path = os.path.join(self._path, indexed_filename)
                 if os.path.exists(old_file_path):
                     # file was renamed, but stayed at original location
                     head, _ = os.path.split(old_file_path)
@@ -187,7 +216,7 @@ class NotesInterface:
                     os.rename(old_file_path, new_path)
                     filename = Path(new_path).relative_to(self._path).as_posix()
 
-                elif file_found:
+                elif file_found := self.find_note([indexed_filename, filename]):
                     # file was moved, update location in index
                     filename = file_found
 
@@ -196,7 +225,7 @@ class NotesInterface:
 
                     # maybe we can find the file cause its jira
                     issue_number = get_issue_number_from_filename(filename)
-                    found_jira_filename = find_jira(issue_number, self._path, filename)
+                    found_jira_filename = self.find_jira_note(issue_number, filename)
                     if found_jira_filename:
                         # rename jira issue at its current location
                         existing_full_path = os.path.join(self._path, found_jira_filename)
@@ -209,7 +238,7 @@ class NotesInterface:
                         # file must have been deleted, create new one
                         filename = self.create_new_file(filename, website_title, url)
 
-        index[url] = filename
-        self.write_index(index)
+        # only appends to the index if the entry actually changed
+        self.get_index_store().set(url, filename, self.is_template(os.path.basename(filename)).name)
         return filename
 
@@ -0,0 +1,86 @@
+import configparser
+import os
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.ini')
+
+_NOT_SET = object()
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Read-only contents of a config.ini file.
+
+    Use get_settings() instead of creating instances directly: it parses every file only once
+    per process and transparently reloads it when its modification time changes.
+    """
+
+    path: str
+    mtime: int = None
+    sections: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+
+    def has_section(self, section):
+        return section in self.sections
+
+    def get(self, section, option, fallback=_NOT_SET):
+        """
+        Same semantics as ConfigParser.get: raises NoSectionError/NoOptionError unless a fallback is given.
+        """
+        try:
+            return self.sections[section][option.lower()]
+        except KeyError:
+            if fallback is not _NOT_SET:
+                return fallback
+            if section not in self.sections:
+                raise configparser.NoSectionError(section) from None
+            raise configparser.NoOptionError(option, section) from None
+
+    def _get_converted(self, converter, section, option, fallback):
+        value = self.get(section, option, None if fallback is not _NOT_SET else _NOT_SET)
+        if value is None:
+            return fallback
+        return converter(value)
+
+    def getint(self, section, option, fallback=_NOT_SET):
+        return self._get_converted(int, section, option, fallback)
+
+    def getfloat(self, section, option, fallback=_NOT_SET):
+        return self._get_converted(float, section, option, fallback)
+
+    def getboolean(self, section, option, fallback=_NOT_SET):
+        def to_boolean(value):
+            if value.lower() not in configparser.ConfigParser.BOOLEAN_STATES:
+                raise ValueError(f'Not a boolean: {value}')
+            return configparser.ConfigParser.BOOLEAN_STATES[value.lower()]
+
+        return self._get_converted(to_boolean, section, option, fallback)
+
+
+def load_settings(path, mtime=None):
+    config = configparser.RawConfigParser()
+    config.read(path, encoding='utf8')
+    sections = {section: MappingProxyType(dict(config.items(section))) for section in config.sections()}
+    return Settings(path, mtime, MappingProxyType(sections))
+
+
+_settings = {}
+
+
+def get_settings(path=CONFIG_PATH):
+    """
+    Return the Settings of the given config.ini (by default the one of the webnotes package).
+
+    The file is only parsed again if its modification time changed since it was last loaded.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    settings = _settings.get(path)
+    if settings is None or settings.mtime != mtime:
+        settings = load_settings(path, mtime)
+        _settings[path] = settings
+    return settings
@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from webnotes import Frontmatter
+from webnotes.FileAdjuster import parse_sp_done
+from webnotes.Settings import get_settings
+from webnotes.utilities import FILE_EXTENSION, get_current_sprint, get_issue_number_from_url
+
+DEFAULT_WORKERS = 16
+DEFAULT_INITIATIVE_PROPERTY = 'Initiative'
+DEFAULT_STATUS_PROPERTY = 'Status'
+NO_VALUE = 'Unknown'
+
+
+def init_config(main_path):
+    config = get_settings(os.path.join(main_path, 'config.ini'))
+    initiative_property = config.get('REPORT', 'initiative_property', fallback=DEFAULT_INITIATIVE_PROPERTY)
+    status_property = config.get('REPORT', 'status_property', fallback=DEFAULT_STATUS_PROPERTY)
+    return initiative_property, status_property
+
+
+def iter_note_paths(folders):
+    """Yield all notes below the given folders, using os.scandir instead of os.walk. Directory symlinks are not followed."""
+    stack = [folder for folder in folders if os.path.isdir(folder)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(FILE_EXTENSION):
+                    yield entry.path
+
+
+def get_status(total_sp, done_sp):
+    """Derive a status for notes without a status property."""
+    if total_sp is None:
+        return NO_VALUE
+    if done_sp >= total_sp:
+        return 'Done'
+    return 'In Progress' if done_sp else 'Open'
+
+
+def read_note_sp(path, initiative_property=DEFAULT_INITIATIVE_PROPERTY, status_property=DEFAULT_STATUS_PROPERTY):
+    """
+    Returns:
+        dict: path, issue_key, total_sp (int or None), sp_done (sprint -> SP), initiative and status of a
+              Jira note, or None if the note has no jira-link
+    """
+    try:
+        properties = Frontmatter.read_properties(path)
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not properties or not properties.get('jira-link'):
+        return None
+
+    try:
+        total_sp = int(Frontmatter.unquote(properties.get('Total-SP')))
+    except (TypeError, ValueError):
+        total_sp = None
+    sp_done = parse_sp_done(properties.get('SP-done'))
+
+    return {
+        'path': path,
+        'issue_key': get_issue_number_from_url(properties['jira-link']),
+        'total_sp': total_sp,
+        'sp_done': sp_done,
+        'initiative': Frontmatter.unquote(properties.get(initiative_property)) or NO_VALUE,
+        'status': (Frontmatter.unquote(properties.get(status_property))
+                   or get_status(total_sp, sum(sp_done.values()))),
+    }
+
+
+def scan_notes(folders, initiative_property=DEFAULT_INITIATIVE_PROPERTY, status_property=DEFAULT_STATUS_PROPERTY,
+               max_workers=DEFAULT_WORKERS):
+    """Read the SP properties of all Jira notes below folders, only the frontmatter of every note is read."""
+    with ThreadPoolExecutor(max_workers) as executor:
+        notes = executor.map(lambda path: read_note_sp(path, initiative_property, status_property),
+                             iter_note_paths(folders))
+        return [note for note in notes if note]
+
+
+def _add(group, total_sp, done_sp):
+    group['notes'] += 1
+    group['total_sp'] += total_sp or 0
+    group['done_sp'] += done_sp
+    group['remaining_sp'] += max((total_sp or 0) - done_sp, 0)
+
+
+def aggregate(notes, current_sprint=None):
+    """
+    Returns:
+        dict: current_sprint, and per sprint (SP done in that sprint), per initiative and per status
+              the number of notes and their total, done and remaining SP
+    """
+    current_sprint = current_sprint or get_current_sprint()
+    empty = {'notes': 0, 'total_sp': 0, 'done_sp': 0, 'remaining_sp': 0}
+    totals = dict(empty)
+    sprints, initiatives, statuses = {}, {}, {}
+
+    for note in notes:
+        done_sp = sum(note['sp_done'].values())
+        _add(totals, note['total_sp'], done_sp)
+        _add(initiatives.setdefault(note['initiative'], dict(empty)), note['total_sp'], done_sp)
+        _add(statuses.setdefault(note['status'], dict(empty)), note['total_sp'], done_sp)
+        for sprint, points in note['sp_done'].items():
+            sprint_group = sprints.setdefault(sprint, {'notes': 0, 'done_sp': 0})
+            sprint_group['notes'] += 1
+            sprint_group['done_sp'] += points
+
+    return {
+        'current_sprint': current_sprint,
+        'totals': totals,
+        'sprints': {sprint: sprints[sprint] for sprint in sorted(sprints)},
+        'initiatives': dict(sorted(initiatives.items())),
+        'statuses': dict(sorted(statuses.items())),
+    }
+
+
+def to_json(report):
+    return json.dumps(report, indent=2)
+
+
+def to_csv(report):
+    """One row per sprint, initiative and status: group, name, notes, total_sp, done_sp, remaining_sp."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(['group', 'name', 'notes', 'total_sp', 'done_sp', 'remaining_sp'])
+    writer.writerow(['total', '', *report['totals'].values()])
+    for sprint, group in report['sprints'].items():
+        name = f'{sprint} (current)' if sprint == report['current_sprint'] else sprint
+        writer.writerow(['sprint', name, group['notes'], '', group['done_sp'], ''])
+    for group_name, groups in (('initiative', report['initiatives']), ('status', report['statuses'])):
+        for name, group in groups.items():
+            writer.writerow([group_name, name, *group.values()])
+    return output.getvalue()
+
+
+def build_report(notes_interface, main_path, output_format='json'):
+    initiative_property, status_property = init_config(main_path)
+    notes = scan_notes(notes_interface.get_jira_folders(), initiative_property, status_property)
+    report = aggregate(notes)
+    return to_csv(report) if output_format == 'csv' else to_json(report)
@@ -0,0 +1,136 @@
+import json
+import re
+import time
+from collections import OrderedDict
+
+from webnotes.Settings import CONFIG_PATH, get_settings
+
+# Topics in order of priority, the first one mentioned in a summary wins
+DEFAULT_TOPICS = ['ATK', 'ETK', 'Briefzentrum', 'Fastlane', 'FlexPack', 'Sorting', 'VAS', 'C-Hand', 'ON1', 'Sortierung', 'Komponentisierung']
+# Parent topics are memoized for a while only, the classifier lives as long as the daemon
+DEFAULT_MEMO_SIZE = 1024
+DEFAULT_MEMO_TTL = 3600
+
+
+class TopicClassifier:
+    """
+    Assigns the topic of a Jira issue, based on the summary of its parent (epic) and, as fallback, its own summary.
+
+    All topics and aliases are compiled into one case-insensitive regex. The result for a parent
+    summary is memoized per parent key, so stories of the same epic are only classified once. The
+    memo is a bounded LRU whose entries expire, so a renamed epic is picked up again.
+    """
+
+    def __init__(self, topics=None, aliases=None, memo_size=DEFAULT_MEMO_SIZE, memo_ttl=DEFAULT_MEMO_TTL):
+        """
+        Args:
+            topics (list): Topic names in order of priority
+            aliases (dict): alias -> topic, e.g. {'Sortierung': 'Sorting'}
+            memo_size (int): Parent keys kept in the memo
+            memo_ttl (float): Seconds a memoized parent topic is used
+        """
+        self.topics = list(topics) if topics is not None else list(DEFAULT_TOPICS)
+        priorities = {topic: priority for priority, topic in enumerate(self.topics)}
+
+        # lowercased term -> (priority, topic)
+        self._terms = {topic.lower(): (priority, topic) for topic, priority in priorities.items()}
+        for alias, topic in (aliases or {}).items():
+            self._terms[alias.lower()] = (priorities.get(topic, len(self.topics)), topic)
+
+        # longer terms first, so an alias containing a shorter topic is matched as a whole
+        terms = sorted(self._terms, key=len, reverse=True)
+        self._pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE) if terms else None
+        self.memo_size = memo_size
+        self.memo_ttl = memo_ttl
+        # parent key -> (topic, expiry), least recently used first
+        self._parent_topics = OrderedDict()
+
+    def find_topic(self, text):
+        """Return the highest priority topic mentioned in text, or None."""
+        if not text or not self._pattern:
+            return None
+        matches = [self._terms[match.group(0).lower()] for match in self._pattern.finditer(text)]
+        return min(matches)[1] if matches else None
+
+    def _get_parent_topic(self, parent_key, parent_summary):
+        now = time.monotonic()
+        memoized = self._parent_topics.get(parent_key)
+        if memoized and memoized[1] > now:
+            self._parent_topics.move_to_end(parent_key)
+            return memoized[0]
+
+        topic = self.find_topic(parent_summary)
+        if parent_key is not None:
+            self._parent_topics[parent_key] = (topic, now + self.memo_ttl)
+            self._parent_topics.move_to_end(parent_key)
+            while len(self._parent_topics) > self.memo_size:
+                self._parent_topics.popitem(last=False)
+        return topic
+
+    def clear(self):
+        """Forget all memoized parent topics."""
+        self._parent_topics.clear()
+
+    def classify(self, parent_key, parent_summary, summary):
+        topic = self._get_parent_topic(parent_key, parent_summary)
+
+        # Check issues title as fallback
+        return topic or self.find_topic(summary)
+
+    def classify_issue(self, jira_issue):
+        return self.classify(jira_issue.parent_key, jira_issue.parent_summary, jira_issue.summary)
+
+    def classify_many(self, jira_issues):
+        """
+        Returns:
+            dict: issue key -> topic (or None)
+        """
+        return {jira_issue.key: self.classify_issue(jira_issue) for jira_issue in jira_issues}
+
+    @classmethod
+    def from_config(cls, config_path):
+        """
+        Load the classifier from the [TOPICS] section of config.ini, or from the JSON file it points to.
+
+        [TOPICS]
+        topics = ATK, ETK, Sorting
+        aliases = Sortierung: Sorting, Sort: Sorting
+        ; or instead: topics_file = /path/to/topics.json with {"topics": [...], "aliases": {...}}
+        """
+        config = get_settings(config_path)
+
+        topics_file = config.get('TOPICS', 'topics_file', fallback=None)
+        if topics_file:
+            with open(topics_file, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            return cls(data.get('topics'), data.get('aliases'))
+
+        topics = config.get('TOPICS', 'topics', fallback=None)
+        if topics is not None:
+            topics = [topic.strip() for topic in topics.split(',') if topic.strip()]
+
+        aliases = {}
+        for pair in config.get('TOPICS', 'aliases', fallback='').split(','):
+            if ':' in pair:
+                alias, topic = pair.split(':', 1)
+                aliases[alias.strip()] = topic.strip()
+
+        return cls(topics, aliases)
+
+
+_default_classifier = None
+_default_classifier_settings = None
+
+
+def get_default_classifier():
+    """
+    Return the process wide classifier configured in config.ini (DEFAULT_TOPICS if not configured).
+
+    The classifier is created again when config.ini changed, so a running daemon picks up new topics.
+    """
+    global _default_classifier, _default_classifier_settings
+    settings = get_settings(CONFIG_PATH)
+    if _default_classifier is None or _default_classifier_settings is not settings:
+        _default_classifier = TopicClassifier.from_config(CONFIG_PATH)
+        _default_classifier_settings = settings
+    return _default_classifier
@@ -0,0 +1,97 @@
+import json
+import sqlite3
+
+
+class TransitionResolver:
+    """
+    Resolves a target status (or transition) name like "Closed" to the transition id of an issue.
+
+    Available transitions only depend on the workflow state of an issue, so they are fetched once
+    per (project, issue type, current status) and kept on disk, instead of hard-coding ids or
+    requesting the transitions of every single issue.
+    """
+
+    def __init__(self, path, get_transitions):
+        """
+        Args:
+            path (str): The SQLite file to store the mappings in (':memory:' to not persist them)
+            get_transitions (callable): issue_key -> list of transitions as returned by Jira
+        """
+        self.path = path
+        self._get_transitions = get_transitions
+        self._mappings = {}
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=5)
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS transitions ('
+                'project TEXT, issue_type TEXT, status TEXT, mapping TEXT NOT NULL, '
+                'PRIMARY KEY (project, issue_type, status))'
+            )
+        return self._connection
+
+    @staticmethod
+    def get_workflow_state(jira_issue):
+        project = jira_issue.key.split('-')[0]
+        return project, str(jira_issue.issue_type), jira_issue.status
+
+    def get_mapping(self, jira_issue):
+        """
+        Returns:
+            dict: 'statuses' (lowercased target status name -> transition id) and 'names' (lowercased
+                  transition name -> transition id) for the workflow state of the issue
+        """
+        state = self.get_workflow_state(jira_issue)
+        if state in self._mappings:
+            return self._mappings[state]
+
+        row = self._connect().execute(
+            'SELECT mapping FROM transitions WHERE project = ? AND issue_type = ? AND status = ?', state
+        ).fetchone()
+        if row:
+            mapping = json.loads(row[0])
+        else:
+            mapping = self._build_mapping(self._get_transitions(jira_issue.key))
+            if not mapping['statuses'] and not mapping['names']:
+                # the request failed or the issue has no transitions, ask Jira again next time
+                return mapping
+            with self._connect() as connection:
+                connection.execute('INSERT OR REPLACE INTO transitions VALUES (?, ?, ?, ?)',
+                                   (*state, json.dumps(mapping)))
+
+        self._mappings[state] = mapping
+        return mapping
+
+    @staticmethod
+    def _build_mapping(transitions):
+        # Status and transition names are kept apart, a transition named "Done" may lead to "Closed"
+        statuses, names = {}, {}
+        for transition in transitions:
+            status_name = transition.get('to', {}).get('name', '').lower()
+            name = transition.get('name', '').lower()
+            if status_name:
+                statuses.setdefault(status_name, transition['id'])
+            if name:
+                names.setdefault(name, transition['id'])
+        return {'statuses': statuses, 'names': names}
+
+    def resolve(self, jira_issue, target_name):
+        """
+        Resolve by the target status first, the transition name is only used if no transition leads to a
+        status of that name.
+
+        Returns:
+            str: The transition id leading the issue to target_name, or None if there is none
+        """
+        mapping = self.get_mapping(jira_issue)
+        target_name = target_name.lower()
+        return mapping['statuses'].get(target_name) or mapping['names'].get(target_name)
+
+    def forget(self, jira_issue):
+        """Drop the cached mapping of the issue's workflow state, e.g. after the workflow changed."""
+        state = self.get_workflow_state(jira_issue)
+        self._mappings.pop(state, None)
+        with self._connect() as connection:
+            connection.execute('DELETE FROM transitions WHERE project = ? AND issue_type = ? AND status = ?', state)
@@ -0,0 +1,167 @@
+import json
+import os
+import re
+
+from webnotes.AtomicFiles import atomic_write
+
+# Leading issue key of a note filename, e.g. 'OPA-1234 Some story - Jira.md'
+ISSUE_KEY_PATTERN = re.compile(r'[A-Z][A-Z0-9]*-\d+')
+
+
+def get_issue_key_prefix(filename):
+    match = ISSUE_KEY_PATTERN.match(filename)
+    return match.group(0) if match else None
+
+
+class VaultIndex:
+    """
+    Filename index of the notes vault, so notes can be found without walking the whole tree.
+
+    Every directory is listed once with os.scandir and remembered together with its mtime. A
+    refresh only lists the directories whose mtime changed (a directory's mtime changes when an
+    entry is added, removed or renamed in it), all others just cost one stat. From the listings
+    two maps are built: basename -> paths and issue key prefix -> paths, both in os.walk order.
+    If a cache_path is given, the listings are persisted there as JSON between runs.
+    """
+
+    def __init__(self, root, cache_path=None):
+        self.root = root
+        self.cache_path = cache_path
+        # relative directory -> {'mtime': st_mtime_ns, 'files': [...], 'dirs': [...]}
+        self._dirs = None
+        self._by_basename = {}
+        self._by_issue_key = {}
+
+    def _load(self):
+        self._dirs = {}
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+        if data.get('root') == self.root:
+            self._dirs = data.get('dirs', {})
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        atomic_write(self.cache_path, json.dumps({'root': self.root, 'dirs': self._dirs}))
+
+    @staticmethod
+    def _scan(full_path):
+        files, dirs = [], []
+        with os.scandir(full_path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                    elif not entry.is_dir():
+                        # symlinked directories are not descended into, like os.walk
+                        files.append(entry.name)
+                except OSError:
+                    continue
+        return files, dirs
+
+    def refresh(self):
+        """Re-list all directories whose mtime changed, return True if anything changed."""
+        if self._dirs is None:
+            self._load()
+
+        changed = False
+        seen = []
+        stack = ['']
+        while stack:
+            directory = stack.pop()
+            full_path = os.path.join(self.root, directory)
+            try:
+                mtime = os.stat(full_path).st_mtime_ns
+                cached = self._dirs.get(directory)
+                if cached is None or cached['mtime'] != mtime:
+                    files, dirs = self._scan(full_path)
+                    cached = self._dirs[directory] = {'mtime': mtime, 'files': files, 'dirs': dirs}
+                    changed = True
+            except OSError:
+                # directory vanished between listing its parent and visiting it
+                continue
+            seen.append(directory)
+            stack.extend(os.path.join(directory, name) for name in reversed(cached['dirs']))
+
+        for directory in set(self._dirs) - set(seen):
+            del self._dirs[directory]
+            changed = True
+
+        if changed or not self._by_basename:
+            self._build(seen)
+        if changed:
+            self._save()
+        return changed
+
+    def _build(self, directories):
+        by_basename = {}
+        by_issue_key = {}
+        for directory in directories:
+            for name in self._dirs[directory]['files']:
+                path = os.path.join(directory, name).replace(os.sep, '/')
+                by_basename.setdefault(name.rstrip(), []).append(path)
+                issue_key = get_issue_key_prefix(name)
+                if issue_key:
+                    by_issue_key.setdefault(issue_key, []).append(path)
+        self._by_basename = by_basename
+        self._by_issue_key = by_issue_key
+
+    def paths(self):
+        """Return the set of all file paths in the vault, relative to its root, as of the last refresh."""
+        return {path for paths in self._by_basename.values() for path in paths}
+
+    def _lookup(self, lookup):
+        """Run lookup on the index, refreshing it once if the result is missing or no longer exists."""
+        refreshed = self._dirs is None
+        if refreshed:
+            self.refresh()
+        path = lookup()
+        if path is None or not os.path.exists(os.path.join(self.root, path)):
+            if not refreshed and self.refresh():
+                path = lookup()
+        return path
+
+    def find(self, names):
+        """
+        Args:
+            names (list): Filenames in order of preference
+
+        Returns:
+            str: Path of the first note found, relative to the vault root, or None
+        """
+        def lookup():
+            for name in names:
+                paths = self._by_basename.get(name.rstrip())
+                if paths:
+                    return paths[0]
+            return None
+
+        return self._lookup(lookup)
+
+    def find_jira(self, issue_number):
+        """Return the path of the first note whose filename starts with the issue key, or None."""
+        if not issue_number:
+            return None
+
+        def lookup():
+            paths = self._by_issue_key.get(issue_number)
+            return paths[0] if paths else None
+
+        return self._lookup(lookup)
+
+
+_vault_indexes = {}
+
+
+def get_vault_index(root, cache_path=None):
+    """Return the VaultIndex of root, shared within the process."""
+    if root not in _vault_indexes:
+        _vault_indexes[root] = VaultIndex(root, cache_path)
+    elif cache_path and not _vault_indexes[root].cache_path:
+        _vault_indexes[root].cache_path = cache_path
+    return _vault_indexes[root]
@@ -0,0 +1,200 @@
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+from webnotes import Frontmatter
+from webnotes.NotesInterface import NotesInterface
+from webnotes.utilities import FILE_EXTENSION
+from webnotes.VaultIndex import VaultIndex
+
+DEFAULT_DEBOUNCE = 1.0  # seconds without events before the index is written
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+def read_link(full_path):
+    """Return the url in the `link:` (or `jira-link:`) property of a note's frontmatter, or None."""
+    try:
+        properties = Frontmatter.read_properties(full_path)
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not properties:
+        return None
+    return Frontmatter.unquote(properties.get('link') or properties.get('jira-link')) or None
+
+
+class VaultWatcher:
+    """
+    Keeps the url -> note index in sync with renames, moves and deletions done in the vault.
+
+    Events are applied to an in-memory copy of the index right away and written to the store
+    in one batch once no event arrived for `debounce` seconds. Notes are watched with watchdog
+    (inotify, FSEvents) if it is installed, otherwise the vault is polled by diffing VaultIndex
+    listings.
+    """
+
+    def __init__(self, notes_path, index_store, debounce=DEFAULT_DEBOUNCE):
+        self.notes_path = os.path.abspath(notes_path)
+        self.index_store = index_store
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        self._index = None
+        self._changed = set()
+        self._removed = set()
+        self._last_event = None
+
+    def _relative(self, full_path):
+        return Path(os.path.abspath(full_path)).relative_to(self.notes_path).as_posix()
+
+    def _get_index(self):
+        if self._index is None:
+            self._index = self.index_store.get()
+        return self._index
+
+    def _set(self, url, path):
+        self._get_index()[url] = path
+        self._changed.add(url)
+        self._removed.discard(url)
+
+    def _remove(self, url):
+        self._get_index().pop(url, None)
+        self._removed.add(url)
+        self._changed.discard(url)
+
+    def _urls_under(self, path):
+        """(url, indexed path) of all entries for the note at path, or for the notes below it if it is a directory."""
+        prefix = f'{path}/'
+        return [(url, indexed) for url, indexed in self._get_index().items()
+                if indexed == path or indexed.startswith(prefix)]
+
+    def on_moved(self, src_path, dest_path):
+        src, dest = self._relative(src_path), self._relative(dest_path)
+        with self._lock:
+            for url, indexed in self._urls_under(src):
+                self._set(url, dest + indexed[len(src):])
+            self._last_event = time.monotonic()
+
+    def on_deleted(self, path):
+        path = self._relative(path)
+        with self._lock:
+            for url, _ in self._urls_under(path):
+                self._remove(url)
+            self._last_event = time.monotonic()
+
+    def on_created(self, path):
+        if not path.endswith(FILE_EXTENSION):
+            return
+        url = read_link(path)
+        if url:
+            url = url.split('?')[0]
+            with self._lock:
+                self._set(url, self._relative(path))
+                self._last_event = time.monotonic()
+
+    def flush(self, force=False):
+        """Write the pending changes, once the debounce period passed (or right away if forced)."""
+        with self._lock:
+            if self._last_event is None:
+                return False
+            if not force and time.monotonic() - self._last_event < self.debounce:
+                return False
+            changed = {url: self._index[url] for url in self._changed}
+            removed = set(self._removed)
+            self._changed.clear()
+            self._removed.clear()
+            self._last_event = None
+            # pick up entries other processes added in the meantime on the next event
+            self._index = None
+
+        if changed:
+            self.index_store.update(changed)
+        if removed:
+            self.index_store.remove(removed)
+        return True
+
+    def run(self, poll_interval=DEFAULT_POLL_INTERVAL):
+        if Observer is not None:
+            self.watch()
+        else:
+            self.poll(poll_interval)
+
+    def watch(self):
+        observer = Observer()
+        observer.schedule(_EventHandler(self), self.notes_path, recursive=True)
+        observer.start()
+        try:
+            while observer.is_alive():
+                time.sleep(self.debounce / 2)
+                self.flush()
+        finally:
+            observer.stop()
+            observer.join()
+            self.flush(force=True)
+
+    def poll(self, poll_interval=DEFAULT_POLL_INTERVAL):
+        vault_index = VaultIndex(self.notes_path)
+        vault_index.refresh()
+        paths = vault_index.paths()
+        try:
+            while True:
+                time.sleep(poll_interval)
+                if vault_index.refresh():
+                    new_paths = vault_index.paths()
+                    self.apply_diff(paths, new_paths)
+                    paths = new_paths
+                self.flush()
+        finally:
+            self.flush(force=True)
+
+    def apply_diff(self, old_paths, new_paths):
+        """Turn two vault listings into move, delete and create events, a removed and an added note with the same name count as a move."""
+        added = {}
+        for path in new_paths - old_paths:
+            added.setdefault(os.path.basename(path), []).append(path)
+
+        for path in sorted(old_paths - new_paths):
+            candidates = added.get(os.path.basename(path))
+            full_path = os.path.join(self.notes_path, path)
+            if candidates:
+                self.on_moved(full_path, os.path.join(self.notes_path, candidates.pop()))
+            else:
+                self.on_deleted(full_path)
+
+        for paths in added.values():
+            for path in paths:
+                self.on_created(os.path.join(self.notes_path, path))
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, watcher):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_moved(self, event):
+        self.watcher.on_moved(event.src_path, event.dest_path)
+
+    def on_deleted(self, event):
+        self.watcher.on_deleted(event.src_path)
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.watcher.on_created(event.src_path)
+
+
+if __name__ == '__main__':
+    # python -m webnotes.VaultWatcher [path/to/folder/with/config.ini]
+    main_path = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    notes_interface = NotesInterface(main_path)
+    watcher = VaultWatcher(notes_interface._path, notes_interface.get_index_store())
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
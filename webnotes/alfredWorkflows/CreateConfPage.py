@@ -2,17 +2,17 @@ import os
 import sys
 from pathlib import Path
 
-import pyperclip
-
 # Add the directory containing the webnotes package to sys.path
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from webnotes import ConfluenceInterface
+from webnotes import DaemonClient
 
 
 def create_review_page():
+    import pyperclip
+    from webnotes import ConfluenceInterface
     title, url = ConfluenceInterface.create_confluence_review_page()
     if url:
         pyperclip.copy(url)
@@ -20,6 +20,8 @@ def create_review_page():
 
 
 def create_1to1_page():
+    import pyperclip
+    from webnotes import ConfluenceInterface
     title, url = ConfluenceInterface.create_confluence_1to1_page()
     if url:
         pyperclip.copy(url)
@@ -31,17 +33,19 @@ cases = {
     "1to1": create_1to1_page
 }
 
-if __name__ == '__main__':
-    main_path = Path(sys.argv[0])
-    if len(sys.argv) < 2:
-        print('specify which type of page to create')
-        sys.exit(0)
+def main(args, main_path):
+    if len(args) < 1:
+        return 'specify which type of page to create'
 
-    case_arg = sys.argv[1]
+    case_arg = args[0]
     if case_arg not in cases.keys():
-        print(f'Unknown case: {case_arg}')
-        sys.exit(0)
+        return f'Unknown case: {case_arg}'
+
+    return cases[case_arg]()
 
-    result = cases[case_arg]()
+
+if __name__ == '__main__':
+    main_path = Path(sys.argv[0])
+    result = DaemonClient.run_workflow('CreateConfPage', main, sys.argv[1:], main_path.parent.parent)
 
     print(result, end='')
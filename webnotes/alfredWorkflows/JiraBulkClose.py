@@ -7,13 +7,11 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from webnotes import utilities
-from webnotes import JiraInterface
-from webnotes import NotesInterface
-from webnotes import FileAdjuster
+from webnotes import DaemonClient
 
 
 def get_all_issues():
+    from webnotes import JiraInterface
     issue_numbers = JiraInterface.get_all_done_issues_from_current_sprint()
     result = 'get_all_issues'
     if len(issue_numbers) == 0:
@@ -23,46 +21,65 @@ def get_all_issues():
     return result
 
 
-def close_all_issues(issue_numbers=None):
-    main_path = Path(sys.argv[0])
-    notes_interface = NotesInterface.NotesInterface(main_path.parent.parent)
+def close_all_issues(issue_numbers, main_path):
+    from webnotes import utilities
+    from webnotes import JiraInterface
+    from webnotes import AsyncJiraInterface
+    from webnotes import NotesInterface
+    from webnotes import FileAdjuster
+    notes_interface = NotesInterface.NotesInterface(main_path)
 
     if not issue_numbers:
         result = 'No issues provided to close'
     else:
-        closed_jira = 0
         closed_notes = 0
-        results = []
+        # fetch all issues with one search instead of one request per issue
+        jira_issues = {issue.key: issue for issue in JiraInterface.get_jira_issues(issue_numbers)}
+
+        # close Stories on Jira, all transitions run concurrently
+        close_status = JiraInterface.get_close_status()
+        to_close = [issue for issue in jira_issues.values() if not issue.status == close_status]
+        transitions = JiraInterface.resolve_transitions(to_close, close_status)
+        results = [f'Failed to close issue: {issue.key} - no transition to {close_status}'
+                   for issue, transition_id in transitions if transition_id is None]
+        results += AsyncJiraInterface.transition_many(
+            (issue.key, transition_id) for issue, transition_id in transitions if transition_id is not None)
+        closed_jira = len(to_close)
+
+        file_paths = []
         for issue_number in issue_numbers:
-            # close Story on Jira
-            jira_issue = JiraInterface.get_jira_issue(issue_number)
-            if jira_issue and not jira_issue.status == 'Closed':
-                res = JiraInterface.transition_issue(issue_number, 151)
-                closed_jira += 1
-                results.append(res)
+            jira_issue = jira_issues.get(issue_number)
 
             # close Story in notes
-            url, title = utilities.get_jira_url_and_title(issue_number)
+            url = utilities.get_jira_url(issue_number)
+            title = utilities.get_issue_title(jira_issue) if jira_issue else None
             file_to_open = notes_interface.get_or_create_file(url, title)
             if file_to_open:
-                complete_filepath = notes_interface.get_full_path(file_to_open)
-                _ = FileAdjuster.adjust_file(complete_filepath)
+                file_paths.append(notes_interface.get_full_path(file_to_open))
                 closed_notes += 1
 
+        # missing Total-SP come from the issues fetched above, Jira is not asked again per note
+        _ = FileAdjuster.adjust_files(file_paths, jira_issues=jira_issues)
+
         result = f'Closed issues: Jira: {closed_jira} | Notes: {closed_notes}: \n{", ".join(results)}'
     return result
 
 
-if __name__ == '__main__':
-    main_path = Path(sys.argv[0])
-    if len(sys.argv) < 2:
+def main(args, main_path):
+    if len(args) < 1:
         case_arg = 'get'
     else:
-        case_arg = sys.argv[1]
+        case_arg = args[0]
 
     result = 'main'
     if case_arg == 'get':
         result = get_all_issues()
     elif case_arg == 'close_stories':
-        result = close_all_issues(sys.argv[2:])
+        result = close_all_issues(args[1:], main_path)
+    return result
+
+
+if __name__ == '__main__':
+    main_path = Path(sys.argv[0])
+    result = DaemonClient.run_workflow('JiraBulkClose', main, sys.argv[1:], main_path.parent.parent)
     print(result, end='')
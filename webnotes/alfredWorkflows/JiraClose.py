@@ -7,32 +7,40 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from webnotes.utilities import get_issue_number_from_url
-from webnotes import JiraInterface
-from webnotes import NotesInterface
-from webnotes import FileAdjuster
+from webnotes import DaemonClient
+
 
 # Close Story on Jira and in notes
-if __name__ == '__main__':
-    # get url and title from command-line arguments
-    main_path = Path(sys.argv[0])
+def main(args, main_path):
+    from webnotes.utilities import get_issue_number_from_url
+    from webnotes import JiraInterface
+    from webnotes import NotesInterface
+    from webnotes import FileAdjuster
 
-    url_arg = sys.argv[1]
-    website_title_arg = ' '.join(sys.argv[2:])
+    url_arg = args[0]
+    website_title_arg = ' '.join(args[1:])
 
     # get jira issue number
     issue_number = get_issue_number_from_url(url_arg)
     result = 'Not a Jira issue'
     if issue_number:
-        jira_issue = JiraInterface.get_jira_issue(issue_number)
-        if jira_issue and not jira_issue.status == 'Closed':
-            result = JiraInterface.transition_issue(issue_number, 151)
+        close_status = JiraInterface.get_close_status()
+        jira_issue = JiraInterface.get_jira_issue(issue_number, force_refresh=True)
+        if jira_issue and not jira_issue.status == close_status:
+            result = JiraInterface.transition_issue_to(jira_issue, close_status)
 
-        notes_interface = NotesInterface.NotesInterface(main_path.parent.parent)
+        notes_interface = NotesInterface.NotesInterface(main_path)
         file_to_open = notes_interface.get_or_create_file(url_arg, website_title_arg)
 
         if file_to_open:
             complete_filepath = notes_interface.get_full_path(file_to_open)
             remaining_sp = FileAdjuster.adjust_file(complete_filepath)
 
+    return result
+
+
+if __name__ == '__main__':
+    # get url and title from command-line arguments
+    main_path = Path(sys.argv[0])
+    result = DaemonClient.run_workflow('JiraClose', main, sys.argv[1:], main_path.parent.parent)
     print(result, end='')
@@ -1,4 +1,5 @@
 import datetime
+import itertools
 import os
 import subprocess
 import sys
@@ -9,8 +10,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from webnotes import JiraInterface
-from webnotes import utilities
+from webnotes import DaemonClient
 
 
 def get_title(day: str = None) -> str:
@@ -57,30 +57,29 @@ def copy_as_html_to_clipboard(html_text):
 
 
 def get_issue_numbers(number_of_elements):
+    from webnotes import JiraInterface
     sprints = JiraInterface.get_all_open_sprints()
     sprints = [s for s in sprints if 'PHX' in s.name]
     sprints = sorted(sprints, key=lambda s: s.name)
-    issue_numbers = []
-    cur_sprint_index = 0
-    while len(issue_numbers) < number_of_elements:
-        sprint = sprints[cur_sprint_index]
-        filter_query = f'Sprint = {sprint.id} AND status IN (Open, "To be Discussed") ORDER BY RANK ASC'
-        sprint_stories = JiraInterface.get_story_keys_from_backlog(filter_query)
-        issue_numbers.extend(sprint_stories)
-        cur_sprint_index += 1
 
-    return issue_numbers[:number_of_elements]
+    def sprint_story_keys():
+        for sprint in sprints:
+            filter_query = f'Sprint = {sprint.id} AND status IN (Open, "To be Discussed") ORDER BY RANK ASC'
+            yield from JiraInterface.iter_story_keys(filter_query, page_size=number_of_elements)
 
+    # stops requesting further pages and sprints once enough keys were found
+    return list(itertools.islice(sprint_story_keys(), number_of_elements))
 
-if __name__ == '__main__':
-    main_path = Path(sys.argv[0])
+
+def main(args, main_path):
+    from webnotes import utilities
 
     number_of_issues = 3
     day = None
-    if len(sys.argv) > 1:
-        number_of_issues = int(sys.argv[1])
-    if len(sys.argv) > 2:
-        day = sys.argv[2]
+    if len(args) > 0:
+        number_of_issues = int(args[0])
+    if len(args) > 1:
+        day = args[1]
 
     issue_numbers = get_issue_numbers(number_of_issues)
 
@@ -94,4 +93,10 @@ if __name__ == '__main__':
 
     copy_as_html_to_clipboard(bullet_list)
 
-    print(f'Copied: {title}', end='')
+    return f'Copied: {title}'
+
+
+if __name__ == '__main__':
+    main_path = Path(sys.argv[0])
+    result = DaemonClient.run_workflow('SprintRefinement', main, sys.argv[1:], main_path.parent.parent)
+    print(result, end='')
@@ -7,25 +7,30 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from webnotes import NotesInterface
-from webnotes import FileAdjuster
+from webnotes import DaemonClient
 
 
-if __name__ == '__main__':
-    # get url and title from command-line arguments
-    main_path = Path(sys.argv[0])
-    notes_interface = NotesInterface.NotesInterface(main_path.parent.parent)
+def main(args, main_path):
+    from webnotes import NotesInterface
+    from webnotes import FileAdjuster
+    notes_interface = NotesInterface.NotesInterface(main_path)
 
-    new_story_points = int(sys.argv[1])
+    new_story_points = int(args[0])
 
-    url_arg = sys.argv[2]
-    website_title_arg = ' '.join(sys.argv[3:])
+    url_arg = args[1]
+    website_title_arg = ' '.join(args[2:])
 
     # get filename, create file if it does not exist
     file_to_open = notes_interface.get_or_create_file(url_arg, website_title_arg)
     complete_filepath = notes_interface.get_full_path(file_to_open)
 
-    result = FileAdjuster.adjust_file(complete_filepath, done_sp_in_sprint=new_story_points)
+    return FileAdjuster.adjust_file(complete_filepath, done_sp_in_sprint=new_story_points)
+
+
+if __name__ == '__main__':
+    # get url and title from command-line arguments
+    main_path = Path(sys.argv[0])
+    result = DaemonClient.run_workflow('addStoryPoints', main, sys.argv[1:], main_path.parent.parent)
 
     # pass to alfred
     print(result, end='')
@@ -7,23 +7,28 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from webnotes import NotesInterface
-from webnotes import FileAdjuster
+from webnotes import DaemonClient
 
 
-if __name__ == '__main__':
-    # get url and title from command-line arguments
-    main_path = Path(sys.argv[0])
-    notes_interface = NotesInterface.NotesInterface(main_path.parent.parent)
+def main(args, main_path):
+    from webnotes import NotesInterface
+    from webnotes import FileAdjuster
+    notes_interface = NotesInterface.NotesInterface(main_path)
 
-    url_arg = sys.argv[1]
-    website_title_arg = ' '.join(sys.argv[2:])
+    url_arg = args[0]
+    website_title_arg = ' '.join(args[1:])
 
     # get filename, create file if it does not exist
     file_to_open = notes_interface.get_or_create_file(url_arg, website_title_arg)
     complete_filepath = notes_interface.get_full_path(file_to_open)
 
-    result = FileAdjuster.adjust_file(complete_filepath)
+    return FileAdjuster.adjust_file(complete_filepath)
+
+
+if __name__ == '__main__':
+    # get url and title from command-line arguments
+    main_path = Path(sys.argv[0])
+    result = DaemonClient.run_workflow('close', main, sys.argv[1:], main_path.parent.parent)
 
     # pass to alfred
     print(result, end='')
@@ -7,15 +7,14 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from webnotes.utilities import get_issue_number_from_url, get_jira_url, get_url_title
-from webnotes import NotesInterface
+from webnotes import DaemonClient
 
-if __name__ == '__main__':
-    # get url and title from command-line arguments
-    main_path = Path(sys.argv[0])
 
-    url_arg = sys.argv[1]
-    website_title_arg = ' '.join(sys.argv[2:])
+def main(args, main_path):
+    from webnotes.utilities import get_issue_number_from_url, get_jira_url, get_url_title, handle_special_jira_cases
+
+    url_arg = args[0]
+    website_title_arg = ' '.join(args[1:])
 
     # get jira issue number
     issue_number = get_issue_number_from_url(url_arg)
@@ -27,7 +26,13 @@ if __name__ == '__main__':
             f'{issue_number} - Jira'
         url_arg = get_jira_url(issue_number)
     else:
-        url_arg, website_title_arg = NotesInterface.handle_special_jira_cases(url_arg, website_title_arg)
+        url_arg, website_title_arg = handle_special_jira_cases(url_arg, website_title_arg)
+
+    return f'{url_arg}\t{website_title_arg}'
 
-    result = f'{url_arg}\t{website_title_arg}'
+
+if __name__ == '__main__':
+    # get url and title from command-line arguments
+    main_path = Path(sys.argv[0])
+    result = DaemonClient.run_workflow('hyperlinks', main, sys.argv[1:], main_path.parent.parent)
     print(result, end='')
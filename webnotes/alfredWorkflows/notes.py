@@ -9,19 +9,24 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 # Now we can import from webnotes package
-from webnotes import NotesInterface
+from webnotes import DaemonClient
 
 
-if __name__ == '__main__':
-    # get url and title from command-line arguments
-    main_path = Path(sys.argv[0])
-    notes_interface = NotesInterface.NotesInterface(main_path.parent.parent)
+def main(args, main_path):
+    from webnotes import NotesInterface
+    notes_interface = NotesInterface.NotesInterface(main_path)
 
-    url_arg = sys.argv[1]
-    website_title_arg = ' '.join(sys.argv[2:])
+    url_arg = args[0]
+    website_title_arg = ' '.join(args[1:])
 
     # get filename, create file if it does not exist
-    file_to_open = notes_interface.get_or_create_file(url_arg, website_title_arg)
+    return notes_interface.get_or_create_file(url_arg, website_title_arg)
+
+
+if __name__ == '__main__':
+    # get url and title from command-line arguments
+    main_path = Path(sys.argv[0])
+    file_to_open = DaemonClient.run_workflow('notes', main, sys.argv[1:], main_path.parent.parent)
 
     # export to alfred, opens obsidian
     print(file_to_open, end='')
@@ -7,18 +7,17 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from webnotes import NotesInterface
-from webnotes import FileAdjuster
-from webnotes.utilities import get_issue_number_from_url
+from webnotes import DaemonClient
 
 
-if __name__ == '__main__':
-    # get url and title from command-line arguments
-    main_path = Path(sys.argv[0])
-    notes_interface = NotesInterface.NotesInterface(main_path.parent.parent)
+def main(args, main_path):
+    from webnotes import NotesInterface
+    from webnotes import FileAdjuster
+    from webnotes.utilities import get_issue_number_from_url
+    notes_interface = NotesInterface.NotesInterface(main_path)
 
-    url_arg = sys.argv[1]
-    website_title_arg = ' '.join(sys.argv[2:])
+    url_arg = args[0]
+    website_title_arg = ' '.join(args[1:])
 
     result = 'Not a Jira issue'
     # get filename, create file if it does not exist
@@ -34,5 +33,13 @@ if __name__ == '__main__':
             issue_nuber = get_issue_number_from_url(url_arg)
 
             result = f'{issue_nuber}: {remaining_sp}'
+    return result
+
+
+if __name__ == '__main__':
+    # get url and title from command-line arguments
+    main_path = Path(sys.argv[0])
+    result = DaemonClient.run_workflow('remaining', main, sys.argv[1:], main_path.parent.parent)
+
     # pass to alfred
     print(result, end='')
@@ -0,0 +1,26 @@
+import sys
+import os
+from pathlib import Path
+
+# Add the directory containing the webnotes package to sys.path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from webnotes import DaemonClient
+
+
+# Story point report over all Jira notes: sp_report.py [json|csv]
+def main(args, main_path):
+    from webnotes import NotesInterface
+    from webnotes import SpReport
+    notes_interface = NotesInterface.NotesInterface(main_path)
+
+    output_format = args[0].lower() if args else 'json'
+    return SpReport.build_report(notes_interface, main_path, output_format)
+
+
+if __name__ == '__main__':
+    main_path = Path(sys.argv[0])
+    result = DaemonClient.run_workflow('sp_report', main, sys.argv[1:], main_path.parent.parent)
+    print(result, end='')
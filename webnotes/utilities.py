@@ -1,11 +1,9 @@
-import os.path
 from enum import Enum
-from pathlib import Path
 import re
 import datetime
 import sys
 
-import xerox
+from webnotes.VaultIndex import get_vault_index
 
 # To avoid circular import issues, import JiraInterface functions inside the functions that need them
 # rather than at the module level
@@ -107,8 +105,9 @@ def get_current_sprint():
 
 
 def parse_index(index_file):
+    # index_file can be an open file or any iterable of lines
     result_dict = dict()
-    for line in index_file.readlines():
+    for line in index_file:
         line_split = line.split(DELIMITER)
         if len(line_split) > 1:
             link = line_split[0].split('?')[0]
@@ -122,13 +121,7 @@ def parse_index(index_file):
 
 
 def find(names, path):
-    for root, dirs, files in os.walk(path):
-        files = [x.rstrip() for x in files]
-        for name in names:
-            name = name.rstrip()
-            if name in files:
-                new_path = os.path.join(root, name)
-                return Path(new_path).relative_to(path).as_posix()
+    return get_vault_index(path).find(names)
 
 
 def get_issue_number_from_filename(filename):
@@ -146,14 +139,7 @@ def get_issue_number_from_url(url):
 
 
 def find_jira(issue_number, path, filename):
-    if not issue_number:
-        return
-    for root, dirs, files in os.walk(path):
-        files = [x.rstrip() for x in files]
-        for file in files:
-            if file.startswith(issue_number):
-                new_path = os.path.join(root, file)
-                return Path(new_path).relative_to(path).as_posix()
+    return get_vault_index(path).find_jira(issue_number)
 
 
 def get_jira_issue_link_from_pr_title(filename):
@@ -175,10 +161,14 @@ def get_url_title(number):
     from webnotes.JiraInterface import get_jira_issue
     jira_issue = get_jira_issue(number)
     if jira_issue:
-        return f'[{jira_issue.key}] {jira_issue.summary} - Jira'
+        return get_issue_title(jira_issue)
     return None
 
 
+def get_issue_title(jira_issue):
+    return f'[{jira_issue.key}] {jira_issue.summary} - Jira'
+
+
 def get_jira_url(number):
     return f'https://jiradg.atlassian.net/browse/{number}'
 
@@ -200,6 +190,8 @@ def handle_special_jira_cases(url, website_title):
             return new_url, new_website_title
         else:
             # maybe the issue number is alraedy in the clipboard
+            # Import inside function, the clipboard is only needed for this case
+            import xerox
             clipboard = xerox.paste()
             if 'OPA-' in clipboard or 'SUP-' in clipboard:
                 number = get_issue_number_from_url(clipboard)
@@ -0,0 +1,99 @@
+"""
+Benchmark for the story point report scan.
+
+    python webnotesTests/SpReportBenchmark.py [--notes 3000] [--body-kb 20] [--runs 5] [--cold]
+
+Generates a vault of Jira notes in a temp folder and times SpReport.scan_notes, once reading only
+the frontmatter of every note and once reading every note completely (as the scripts did before
+Frontmatter), each with one and with several worker threads. Both variants parse the same way, so
+the difference is the I/O. The report shows the median wall time. With --cold the page cache is
+dropped before every run (Linux, root only), otherwise all runs but the first read from memory.
+"""
+import argparse
+import os
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from webnotes import Frontmatter, SpReport  # noqa: E402
+
+DEFAULT_NOTES = 3000
+DEFAULT_BODY_KB = 20
+DEFAULT_RUNS = 5
+WORKER_COUNTS = (1, SpReport.DEFAULT_WORKERS)
+FOLDERS = 30
+
+
+def create_vault(root, notes, body_kb):
+    body = ('Some text of a refinement note. ' * 32 + '\n') * body_kb
+    for i in range(notes):
+        folder = os.path.join(root, f'folder {i % FOLDERS}')
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f'OPA-{i} Story.md'), 'w', encoding='utf-8') as file:
+            file.write(f'---\njira-link: https://jiradg.atlassian.net/browse/OPA-{i}\nTotal-SP: "5"\n'
+                       f'SP-done: "377: 2, 378: {i % 3}"\nInitiative: "ATK"\n---\n{body}')
+
+
+def read_properties_full(path):
+    """Frontmatter.read_properties, but reading the whole note and matching the frontmatter with a regex."""
+    with open(path, 'r', encoding='utf-8') as file:
+        match = re.search(r'^---\s*\n(.*?)\n---', file.read(), re.DOTALL)
+    return Frontmatter.parse_properties(match.group(1).split('\n')) if match else None
+
+
+def drop_caches():
+    os.sync()
+    with open('/proc/sys/vm/drop_caches', 'w') as file:
+        file.write('3')
+
+
+def time_runs(function, runs, cold=False):
+    durations = []
+    for _ in range(runs):
+        if cold:
+            drop_caches()
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure the story point report scan')
+    parser.add_argument('--notes', type=int, default=DEFAULT_NOTES)
+    parser.add_argument('--body-kb', type=int, default=DEFAULT_BODY_KB, help='approximate body size per note')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS)
+    parser.add_argument('--cold', action='store_true', help='drop the page cache before every run')
+    args = parser.parse_args(argv)
+
+    # in the home directory, /tmp may be a tmpfs that is never read from disk
+    root = tempfile.mkdtemp(prefix='sp_report_benchmark_', dir=os.path.expanduser('~'))
+    try:
+        create_vault(root, args.notes, args.body_kb)
+        found = len(SpReport.scan_notes([root]))
+        if found != args.notes:
+            raise RuntimeError(f'scan_notes found {found} of {args.notes} notes')
+
+        print(f'{args.notes} notes with ~{args.body_kb} KB body, {"cold" if args.cold else "warm"} page cache, '
+              f'median of {args.runs} runs')
+        for name, read_properties in (('frontmatter only', Frontmatter.read_properties),
+                                      ('full note', read_properties_full)):
+            with patch('webnotes.SpReport.Frontmatter.read_properties', read_properties):
+                for workers in WORKER_COUNTS:
+                    duration = time_runs(lambda: SpReport.scan_notes([root], max_workers=workers), args.runs, args.cold)
+                    print(f'{name:17} {workers:3} workers {duration * 1000:8.1f} ms')
+    finally:
+        shutil.rmtree(root)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Cold start benchmark for the alfred workflow scripts.
+
+    python webnotesTests/StartupBenchmark.py [--budget-ms 60] [--runs 5] [--top 5]
+
+Every script in webnotes/alfredWorkflows (and the SHARED_MODULES their main functions import) is
+imported in a fresh interpreter with -X importtime.
+The report shows the median import time of each script and the modules that cost the most.
+Exits with 1 if a script exceeds the budget or imports one of HEAVY_MODULES at startup.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKFLOWS_PATH = os.path.join(PROJECT_ROOT, 'webnotes', 'alfredWorkflows')
+
+# Only imported once a workflow actually needs them
+HEAVY_MODULES = ['requests', 'urllib3', 'xerox', 'pyperclip', 'webnotes.ConfluencePageNodes', 'webnotes.JiraInterface']
+DEFAULT_BUDGET_MS = 60
+DEFAULT_RUNS = 5
+
+
+# Imported by the workflows' main functions before any real work happens
+SHARED_MODULES = ['webnotes.NotesInterface', 'webnotes.FileAdjuster', 'webnotes.ConfluenceInterface']
+
+
+def get_workflow_modules():
+    return sorted(f'webnotes.alfredWorkflows.{filename[:-3]}' for filename in os.listdir(WORKFLOWS_PATH)
+                  if filename.endswith('.py') and filename != '__init__.py')
+
+
+def parse_importtime(stderr):
+    """
+    Returns:
+        dict: module -> (self_us, cumulative_us) for every line of -X importtime output
+    """
+    result = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        result[module.strip()] = (int(self_us), int(cumulative_us))
+    return result
+
+
+def measure(module):
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f'Importing {module} failed:\n{process.stderr}')
+    return parse_importtime(process.stderr)
+
+
+def get_heavy_imports(timings):
+    return [module for module in HEAVY_MODULES if module in timings]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure the cold start import time of the alfred workflows')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS)
+    parser.add_argument('--top', type=int, default=5, help='number of most expensive modules to list')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in get_workflow_modules() + SHARED_MODULES:
+        runs = [measure(module) for _ in range(args.runs)]
+        import_ms = statistics.median(timings[module][1] for timings in runs) / 1000
+        heavy = get_heavy_imports(runs[-1])
+        over_budget = import_ms > args.budget_ms
+        failed = failed or over_budget or bool(heavy)
+
+        status = 'FAIL' if over_budget or heavy else 'ok'
+        print(f'{status:4} {module:45} {import_ms:8.1f} ms')
+        if heavy:
+            print(f'     heavy modules imported at startup: {", ".join(heavy)}')
+        slowest = sorted(runs[-1].items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+        for name, (self_us, _) in slowest:
+            print(f'     {self_us / 1000:6.1f} ms  {name}')
+
+    print(f'budget: {args.budget_ms} ms per script')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
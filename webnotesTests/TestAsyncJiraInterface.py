@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from webnotes import AsyncJiraInterface
+from webnotes.AsyncJiraInterface import AsyncJiraClient, RateLimiter
+
+
+class ConcurrencyProbe:
+    """Stub for a JiraInterface call that records how many calls run at the same time."""
+
+    def __init__(self, result, delay=0.02):
+        self._result = result
+        self._delay = delay
+        self._lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.calls = []
+
+    def __call__(self, *args):
+        with self._lock:
+            self.calls.append(args)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(self._delay)
+            return self._result(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+def slower_for_earlier_keys(issue_key, *args):
+    # earlier keys finish last, so the result order cannot just follow completion order
+    time.sleep((10 - int(issue_key.split('-')[1])) * 0.005)
+    return f'issue {issue_key}'
+
+
+class TestAsyncJiraClient(unittest.TestCase):
+    def setUp(self):
+        patchers = [
+            patch('webnotes.JiraInterface.get_client', return_value=SimpleNamespace(base_url='https://jira.example')),
+            patch('webnotes.JiraInterface.get_issue_cache'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_client(self, method_name, *args, concurrency=8, rate_limit=0):
+        async def main():
+            client = AsyncJiraClient(concurrency, rate_limit)
+            return await getattr(client, method_name)(*args)
+
+        return asyncio.run(main())
+
+    def test_fetchIssues_callsFinishOutOfOrder_ResultsFollowTheKeys(self):
+        keys = ['OPA-1', 'OPA-2', 'OPA-3', 'OPA-1']
+
+        with patch('webnotes.JiraInterface.get_jira_issue', side_effect=slower_for_earlier_keys) as get_jira_issue:
+            result = self.run_client('fetch_issues', keys, True)
+
+        self.assertEqual(['OPA-1', 'OPA-2', 'OPA-3'], list(result))
+        self.assertEqual({key: f'issue {key}' for key in keys}, result)
+        self.assertEqual(3, get_jira_issue.call_count)
+        get_jira_issue.assert_any_call('OPA-2', True)
+
+    def test_getTransitionsMany_severalKeys_TransitionsPerKey(self):
+        with patch('webnotes.JiraInterface.get_transitions', side_effect=lambda key: [{'id': key}]):
+            result = self.run_client('get_transitions_many', ['OPA-2', 'OPA-1'])
+
+        self.assertEqual({'OPA-2': [{'id': 'OPA-2'}], 'OPA-1': [{'id': 'OPA-1'}]}, result)
+        self.assertEqual(['OPA-2', 'OPA-1'], list(result))
+
+    def test_transitionMany_callsFinishOutOfOrder_ResultsInInputOrder(self):
+        pairs = [(f'OPA-{i}', '151') for i in range(1, 6)]
+
+        with patch('webnotes.JiraInterface.transition_issue',
+                   side_effect=lambda key, transition_id: slower_for_earlier_keys(key)) as transition_issue:
+            result = self.run_client('transition_many', pairs)
+
+        self.assertEqual([f'issue OPA-{i}' for i in range(1, 6)], result)
+        self.assertEqual(5, transition_issue.call_count)
+
+    def test_fetchIssues_moreKeysThanConcurrency_ConcurrencyIsCapped(self):
+        probe = ConcurrencyProbe(lambda key, force_refresh: key)
+        keys = [f'OPA-{i}' for i in range(12)]
+
+        with patch('webnotes.JiraInterface.get_jira_issue', side_effect=probe):
+            result = self.run_client('fetch_issues', keys, concurrency=3)
+
+        self.assertEqual(12, len(probe.calls))
+        self.assertEqual(3, probe.max_running)
+        self.assertEqual(dict(zip(keys, keys)), result)
+
+    def test_transitionMany_rateLimit_RequestStartsAreSpacedOut(self):
+        starts = []
+
+        def transition_issue(key, transition_id):
+            starts.append(time.monotonic())
+
+        with patch('webnotes.JiraInterface.transition_issue', side_effect=transition_issue):
+            self.run_client('transition_many', [(f'OPA-{i}', '151') for i in range(5)], rate_limit=20)
+
+        # 5 starts at 20 per second span 4 intervals of 50 ms, less the scheduling delay of the first one
+        self.assertGreaterEqual(starts[-1] - starts[0], 0.16)
+
+    def test_syncFacade_configuredLimits_ClientIsCreatedWithThem(self):
+        with patch.object(AsyncJiraInterface, 'init_config', return_value=(2, 0)), \
+                patch('webnotes.JiraInterface.get_jira_issue', return_value='issue'):
+            self.assertEqual({'OPA-1': 'issue'}, AsyncJiraInterface.fetch_issues(['OPA-1']))
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_wait_severalCallers_StartsAreSpreadOverOneIntervalEach(self):
+        async def main():
+            limiter = RateLimiter(20)
+            loop = asyncio.get_running_loop()
+            begin = loop.time()
+            starts = []
+
+            async def start():
+                await limiter.wait()
+                starts.append(loop.time() - begin)
+
+            await asyncio.gather(*[start() for _ in range(4)])
+            return sorted(starts)
+
+        starts = asyncio.run(main())
+
+        # the first caller starts right away, the fourth one three intervals of 50 ms later
+        self.assertLess(starts[0], 0.04)
+        self.assertGreaterEqual(starts[-1], 0.14)
+
+    def test_wait_rateZero_NoDelay(self):
+        async def main():
+            limiter = RateLimiter(0)
+            start = time.monotonic()
+            for _ in range(100):
+                await limiter.wait()
+            return time.monotonic() - start
+
+        self.assertLess(asyncio.run(main()), 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import shutil
+import socket
+import stat
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from webnotes import DaemonClient
+from webnotes.Daemon import Daemon, DaemonRunningError
+from webnotes.DaemonClient import DaemonError
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.mkdir('temp')
+        self.socket_path = os.path.join('temp', 'daemon.sock')
+
+    def tearDown(self):
+        shutil.rmtree('temp')
+
+    def test_init_staleSocketFile_SocketIsReplaced(self):
+        with open(self.socket_path, 'w'):
+            pass
+
+        daemon = Daemon('temp', self.socket_path)
+        daemon.server_close()
+
+        self.assertTrue(stat.S_ISSOCK(os.stat(self.socket_path).st_mode))
+
+    def test_init_daemonAlreadyListening_SocketIsNotTaken(self):
+        daemon = Daemon('temp', self.socket_path)
+        thread = threading.Thread(target=daemon.handle_request)
+        thread.start()
+        try:
+            self.assertRaises(DaemonRunningError, Daemon, 'temp', self.socket_path)
+        finally:
+            thread.join()
+            daemon.server_close()
+        self.assertTrue(os.path.exists(self.socket_path))
+
+    def test_init_newSocket_OnlyOwnerCanAccess(self):
+        daemon = Daemon('temp', self.socket_path)
+        daemon.server_close()
+
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.socket_path).st_mode) & 0o777)
+
+    def test_send_ping_DaemonAnswers(self):
+        daemon = Daemon('temp', self.socket_path)
+        thread = threading.Thread(target=daemon.handle_request)
+        thread.start()
+        try:
+            response = DaemonClient.send({'command': 'ping'}, self.socket_path)
+        finally:
+            thread.join()
+            daemon.server_close()
+
+        self.assertEqual('pong', response['output'])
+
+
+class TestDaemonClient(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.mkdir('temp')
+        # a server that accepts connections but never answers, like a daemon stuck in a workflow
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket_path = os.path.join('temp', 'hanging.sock')
+        self.server.bind(self.socket_path)
+        self.server.listen()
+
+    def tearDown(self):
+        self.server.close()
+        shutil.rmtree('temp')
+
+    def test_communicate_noResponse_DaemonErrorAfterTimeout(self):
+        client = DaemonClient.connect(self.socket_path)
+
+        self.assertRaises(DaemonError, DaemonClient.communicate, client, {'command': 'ping'}, 0.1)
+
+    def run_workflow(self, main):
+        with patch('webnotes.DaemonClient.is_enabled', return_value=True), \
+                patch('webnotes.DaemonClient.get_request_timeout', return_value=0.1), \
+                patch('webnotes.DaemonClient.get_socket_path', return_value=self.socket_path):
+            return DaemonClient.run_workflow('JiraClose', main, ['arg'], 'temp')
+
+    def test_runWorkflow_daemonHangs_WorkflowIsNotRunTwice(self):
+        main = MagicMock(return_value='output')
+
+        self.assertRaises(DaemonError, self.run_workflow, main)
+
+        main.assert_not_called()
+
+    def test_runWorkflow_requestCannotBeSent_WorkflowRunsInProcess(self):
+        main = MagicMock(return_value='output')
+        client = MagicMock()
+        client.sendall.side_effect = BrokenPipeError
+
+        with patch('webnotes.DaemonClient.connect', return_value=client):
+            result = self.run_workflow(main)
+
+        self.assertEqual('output', result)
+        main.assert_called_once_with(['arg'], 'temp')
+
+if __name__ == '__main__':
+    unittest.main()
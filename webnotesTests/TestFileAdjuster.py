@@ -0,0 +1,105 @@
+import os
+import shutil
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from webnotes import Frontmatter
+from webnotes.FileAdjuster import adjust_files
+
+JIRA_URL = 'https://jiradg.atlassian.net/browse/'
+
+
+def write_note(name, issue_key=None, total_sp='5', sp_done='"375: 2"'):
+    path = os.path.join('temp', name)
+    lines = ['---']
+    if issue_key:
+        lines.append(f'jira-link: {JIRA_URL}{issue_key}')
+    lines += [f'Total-SP: {total_sp}', f'SP-done: {sp_done}', '---', 'Body']
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(lines) + '\n')
+    return path
+
+
+def sp_done(path):
+    return Frontmatter.read_properties(path)['SP-done']
+
+
+class TestAdjustFiles(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.mkdir('temp')
+        patcher = patch('webnotes.FileAdjuster.get_current_sprint', return_value=377)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree('temp')
+
+    def test_adjustFiles_duplicatePaths_NoteIsAdjustedOnce(self):
+        path = write_note('a.md', 'OPA-1')
+
+        reports = adjust_files([path, path])
+
+        self.assertEqual(1, len(reports))
+        self.assertEqual('Added remaining SP (3) to current Sprint (377)', reports[0]['result'])
+        self.assertEqual('"375: 2, 377: 3"', sp_done(path))
+
+    def test_adjustFiles_missingTotalSp_FetchedWithOneBulkRequest(self):
+        paths = [write_note('a.md', 'OPA-2', total_sp='""'), write_note('b.md', 'OPA-1', total_sp=''),
+                 write_note('c.md', 'OPA-3')]
+        issues = [SimpleNamespace(key='OPA-1', story_points=8), SimpleNamespace(key='OPA-2', story_points=4)]
+
+        with patch('webnotes.JiraInterface.get_jira_issues', return_value=issues) as get_jira_issues:
+            reports = adjust_files(paths)
+
+        get_jira_issues.assert_called_once_with(['OPA-1', 'OPA-2'])
+        self.assertEqual([True, True, False], [report['fetched_sp'] for report in reports])
+        self.assertEqual('"375: 2, 377: 2"', sp_done(paths[0]))
+        self.assertEqual('"375: 2, 377: 6"', sp_done(paths[1]))
+
+    def test_adjustFiles_jiraIssuesPassedIn_JiraIsNotRequested(self):
+        path = write_note('a.md', 'OPA-1', total_sp='""')
+
+        with patch('webnotes.JiraInterface.get_jira_issues') as get_jira_issues:
+            reports = adjust_files([path], jira_issues={'OPA-1': SimpleNamespace(key='OPA-1', story_points=3)})
+
+        get_jira_issues.assert_not_called()
+        self.assertTrue(reports[0]['ok'])
+        self.assertEqual('"375: 2, 377: 1"', sp_done(path))
+
+    def test_adjustFiles_invalidNotes_ErrorIsReportedPerNote(self):
+        paths = [os.path.join('temp', 'missing.md'), write_note('no-jira.md'), write_note('a.md', 'OPA-1')]
+
+        reports = adjust_files(paths)
+
+        self.assertEqual([False, False, True], [report['ok'] for report in reports])
+        self.assertEqual('File does not exist: ' + paths[0], reports[0]['result'])
+        self.assertEqual('Not a jira story', reports[1]['result'])
+        self.assertEqual('OPA-1', reports[2]['issue_key'])
+
+    def test_adjustFiles_bulkFetchFails_OnlyNotesWithoutTotalSpFail(self):
+        paths = [write_note('a.md', 'OPA-1', total_sp='""'), write_note('b.md', 'OPA-2')]
+
+        with patch('webnotes.JiraInterface.get_jira_issues', side_effect=ConnectionError('offline')):
+            reports = adjust_files(paths)
+
+        self.assertFalse(reports[0]['ok'])
+        self.assertTrue(reports[0]['result'].startswith('Error processing file'))
+        self.assertEqual('"375: 2"', sp_done(paths[0]))
+        self.assertTrue(reports[1]['ok'])
+        self.assertEqual('"375: 2, 377: 3"', sp_done(paths[1]))
+
+    def test_adjustFiles_returnRemainingSp_NotesAreNotWritten(self):
+        path = write_note('a.md', 'OPA-1')
+        mtime = os.stat(path).st_mtime_ns
+
+        reports = adjust_files([path], return_remaining_sp=True)
+
+        self.assertEqual(3, reports[0]['result'])
+        self.assertEqual(mtime, os.stat(path).st_mtime_ns)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import shutil
+import unittest
+from unittest.mock import patch
+
+from webnotes import Frontmatter
+
+
+def write(path, content):
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        file.write(content)
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        return file.read()
+
+
+class TestFrontmatter(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.mkdir('temp')
+        self.path = os.path.join('temp', 'note.md')
+
+    def tearDown(self):
+        shutil.rmtree('temp')
+
+    def test_readProperties_noteWithFrontmatter_PropertiesInFileOrder(self):
+        write(self.path, '---\njira-link: https://x/OPA-1\ntags:\n  - a\nTotal-SP: "3"\n---\nbody: no property\n')
+
+        result = Frontmatter.read_properties(self.path)
+
+        self.assertEqual(['jira-link', 'tags', 'Total-SP'], list(result))
+        self.assertEqual('"3"', result['Total-SP'])
+
+    def test_readProperties_noFrontmatter_None(self):
+        write(self.path, 'just text\n---\n')
+
+        self.assertIsNone(Frontmatter.read_properties(self.path))
+
+    def test_updateProperties_existingProperty_OnlyThatLineChanges(self):
+        body = 'line\r\n' * 100000
+        write(self.path, f'---\r\nTotal-SP: 3\r\nSP-done: ""\r\n---\r\n{body}')
+
+        result = Frontmatter.update_properties(self.path, {'SP-done': '"377: 3"', 'New': 'x'}, add_missing=False)
+
+        self.assertTrue(result)
+        self.assertEqual(f'---\r\nTotal-SP: 3\r\nSP-done: "377: 3"\r\n---\r\n{body}', read(self.path))
+
+    def test_updateProperties_missingProperty_PropertyIsAppended(self):
+        write(self.path, '---\nlink: www.a.com\n---\nbody')
+
+        Frontmatter.update_properties(self.path, {'SP-done': '"1: 1"'})
+
+        self.assertEqual('---\nlink: www.a.com\nSP-done: "1: 1"\n---\nbody', read(self.path))
+
+    def test_readProperties_indentedProperty_PropertyIsRead(self):
+        write(self.path, '---\n  jira-link: https://x/OPA-1\n\tTotal-SP: 3\ntags:\n  - a\n---\n')
+
+        result = Frontmatter.read_properties(self.path)
+
+        self.assertEqual({'jira-link': 'https://x/OPA-1', 'Total-SP': '3', 'tags': ''}, result)
+
+    def test_updateProperties_headerGrowsOrShrinks_BodyIsCopiedInChunks(self):
+        body = ''.join(f'line {i}\n' for i in range(1000))
+        write(self.path, f'---\nSP-done: ""\n---\n{body}')
+
+        with patch('webnotes.Frontmatter.COPY_BUFFER_SIZE', 7):
+            Frontmatter.update_properties(self.path, {'SP-done': '"375: 2, 376: 1, 377: 3"'})
+            self.assertEqual(f'---\nSP-done: "375: 2, 376: 1, 377: 3"\n---\n{body}', read(self.path))
+
+            Frontmatter.update_properties(self.path, {'SP-done': '"1: 1"'})
+            self.assertEqual(f'---\nSP-done: "1: 1"\n---\n{body}', read(self.path))
+
+    def test_updateProperties_interruptedWhileCopyingBody_NoteIsUnchanged(self):
+        write(self.path, '---\nSP-done: ""\n---\nbody')
+
+        with patch('webnotes.Frontmatter.shutil.copyfileobj', side_effect=KeyboardInterrupt):
+            self.assertRaises(KeyboardInterrupt, Frontmatter.update_properties, self.path, {'SP-done': '"1: 1"'})
+
+        self.assertEqual('---\nSP-done: ""\n---\nbody', read(self.path))
+        self.assertEqual(['note.md'], os.listdir('temp'))
+
+    def test_updateProperties_symlinkedNote_TargetIsReplaced(self):
+        target = os.path.join('temp', 'target.md')
+        write(target, '---\nSP-done: ""\n---\nbody')
+        os.chmod(target, 0o600)
+        os.symlink('target.md', self.path)
+
+        Frontmatter.update_properties(self.path, {'SP-done': '"1: 1"'})
+
+        self.assertTrue(os.path.islink(self.path))
+        self.assertEqual('---\nSP-done: "1: 1"\n---\nbody', read(target))
+        self.assertEqual(0o600, os.stat(target).st_mode & 0o777)
+
+    def test_updateProperties_valuesUnchanged_NoteIsNotWritten(self):
+        write(self.path, '---\nSP-done: "1: 1"\n---\nbody')
+        inode = os.stat(self.path).st_ino
+
+        self.assertTrue(Frontmatter.update_properties(self.path, {'SP-done': '"1: 1"'}))
+
+        self.assertEqual(inode, os.stat(self.path).st_ino)
+
+    @unittest.skipUnless(hasattr(os, 'setxattr'), 'no extended attributes on this platform')
+    def test_updateProperties_noteWithExtendedAttribute_AttributeIsKept(self):
+        write(self.path, '---\nSP-done: ""\n---\nbody')
+        try:
+            os.setxattr(self.path, 'user.webnotes', b'tag')
+        except OSError:
+            self.skipTest('file system without user extended attributes')
+
+        Frontmatter.update_properties(self.path, {'SP-done': '"1: 1"'})
+
+        self.assertEqual(b'tag', os.getxattr(self.path, 'user.webnotes'))
+
+
+if __name__ == '__main__':
+    unittest.main()
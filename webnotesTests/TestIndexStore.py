@@ -0,0 +1,111 @@
+import os
+import shutil
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from webnotes import IndexStore
+from webnotes.IndexStore import TextIndexStore, SqliteIndexStore
+
+
+def read_lines(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.readlines()
+
+
+class TestTextIndexStore(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.mkdir('temp')
+        self.index_filename = os.path.join('temp', 'index.txt')
+        self.testee = TextIndexStore(self.index_filename)
+
+    def tearDown(self):
+        shutil.rmtree('temp')
+
+    def test_set_newEntry_EntryIsAppended(self):
+        self.testee.write({'www.a.com': 'a.md'})
+
+        self.testee.set('www.b.com', 'b.md')
+
+        self.assertEqual({'www.a.com': 'a.md', 'www.b.com': 'b.md'}, self.testee.get())
+        self.assertEqual(['www.a.com漢a.md\n', 'www.b.com漢b.md\n'], read_lines(self.index_filename))
+
+    def test_set_unchangedEntry_FileIsNotWritten(self):
+        self.testee.write({'www.a.com': 'a.md'})
+        mtime = os.stat(self.index_filename).st_mtime_ns
+
+        self.testee.set('www.a.com', 'a.md')
+
+        self.assertEqual(mtime, os.stat(self.index_filename).st_mtime_ns)
+        self.assertEqual(['www.a.com漢a.md\n'], read_lines(self.index_filename))
+
+    def test_set_changedEntry_LastLineWins(self):
+        self.testee.write({'www.a.com': 'a.md'})
+
+        self.testee.set('www.a.com', 'moved/a.md')
+
+        self.assertEqual({'www.a.com': 'moved/a.md'}, TextIndexStore(self.index_filename).get())
+
+    def test_get_fileChangedByOtherProcess_IndexIsReloaded(self):
+        self.testee.write({'www.a.com': 'a.md'})
+        TextIndexStore(self.index_filename).set('www.b.com', 'b.md')
+
+        result = self.testee.get()
+
+        self.assertEqual({'www.a.com': 'a.md', 'www.b.com': 'b.md'}, result)
+
+    def test_set_manySupersededLines_JournalIsCompacted(self):
+        for i in range(IndexStore.COMPACT_MIN_LINES + 1):
+            self.testee.set('www.a.com', f'{i}.md')
+
+        self.assertEqual({'www.a.com': f'{IndexStore.COMPACT_MIN_LINES}.md'}, self.testee.get())
+        self.assertEqual(1, len(read_lines(self.index_filename)))
+
+    def test_set_concurrentWriters_NoEntryIsLost(self):
+        self.testee.write({})
+
+        def add_entries(writer):
+            store = TextIndexStore(self.index_filename)
+            for i in range(50):
+                store.set(f'www.{writer}-{i}.com', f'{writer}-{i}.md')
+
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(add_entries, range(4)))
+
+        self.assertEqual(200, len(TextIndexStore(self.index_filename).get()))
+
+
+class TestSqliteIndexStore(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.mkdir('temp')
+        self.index_filename = os.path.join('temp', 'index.txt')
+
+    def tearDown(self):
+        shutil.rmtree('temp')
+
+    def test_init_existingTextIndex_EntriesAreMigratedAndIndexed(self):
+        TextIndexStore(self.index_filename).write({'https://jiradg.atlassian.net/browse/OPA-1': 'jira/OPA-1 Story.md'})
+
+        testee = SqliteIndexStore(os.path.join('temp', 'index.sqlite'), 'temp', migrate_from=self.index_filename)
+
+        self.assertEqual('jira/OPA-1 Story.md', testee.lookup('https://jiradg.atlassian.net/browse/OPA-1'))
+        self.assertEqual(['jira/OPA-1 Story.md'], testee.find_by_basename('OPA-1 Story.md'))
+        self.assertEqual(['jira/OPA-1 Story.md'], testee.find_by_issue_key('OPA-1'))
+
+    def test_update_fromOtherThread_EntriesAreVisibleInCreatingThread(self):
+        testee = SqliteIndexStore(os.path.join('temp', 'index.sqlite'), 'temp')
+        testee.set('www.a.com', 'a.md')
+
+        with ThreadPoolExecutor(1) as executor:
+            executor.submit(testee.update, {'www.b.com': 'b.md'}).result()
+            executor.submit(testee.remove, ['www.a.com']).result()
+            self.assertEqual({'www.b.com': 'b.md'}, executor.submit(testee.get).result())
+
+        self.assertEqual({'www.b.com': 'b.md'}, testee.get())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import json
+import os
+import shutil
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from webnotes import JiraInterface
+from webnotes.IssueCache import IssueCache
+
+
+def issue_data(key='OPA-1', status='Open', updated='2024-01-01T10:00:00.000+0100'):
+    return {'key': key, 'fields': {'summary': 'Story', 'customfield_10013': 3, 'status': {'name': status},
+                                   'updated': updated}}
+
+
+def response(status_code, data=None):
+    return MagicMock(status_code=status_code, content=json.dumps(data or {}).encode('utf-8'))
+
+
+class TestIssueCache(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.mkdir('temp')
+        self.testee = IssueCache(os.path.join('temp', 'cache.sqlite'), ttl=60)
+
+    def tearDown(self):
+        shutil.rmtree('temp')
+
+    def test_get_youngerThanTtl_EntryIsFresh(self):
+        self.testee.put(issue_data())
+
+        self.assertEqual((issue_data(), True), self.testee.get('OPA-1'))
+
+    def test_get_olderThanTtl_EntryIsStale(self):
+        self.testee.put(issue_data())
+
+        with patch('webnotes.IssueCache.time.time', return_value=time.time() + 61):
+            self.assertEqual((issue_data(), False), self.testee.get('OPA-1'))
+
+    def test_touch_staleEntry_EntryIsFreshAgain(self):
+        self.testee.put(issue_data())
+
+        with patch('webnotes.IssueCache.time.time', return_value=time.time() + 61):
+            self.testee.touch('OPA-1')
+            self.assertTrue(self.testee.get('OPA-1')[1])
+
+    def test_invalidate_cachedEntry_EntryIsRemoved(self):
+        self.testee.put(issue_data())
+
+        self.testee.invalidate('OPA-1')
+
+        self.assertIsNone(self.testee.get('OPA-1'))
+
+
+class TestGetJiraIssue(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.mkdir('temp')
+        self.cache = IssueCache(os.path.join('temp', 'cache.sqlite'), ttl=60)
+        self.client = MagicMock()
+        patches = [patch('webnotes.JiraInterface.get_issue_cache', return_value=self.cache),
+                   patch('webnotes.JiraInterface.get_client', return_value=self.client)]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree('temp')
+
+    def test_getJiraIssue_freshEntry_JiraIsNotRequested(self):
+        self.cache.put(issue_data())
+
+        result = JiraInterface.get_jira_issue('OPA-1')
+
+        self.assertEqual('Open', result.status)
+        self.client.get.assert_not_called()
+
+    def test_getJiraIssue_forceRefresh_IssueIsFetchedAndCached(self):
+        self.cache.put(issue_data())
+        self.client.get.return_value = response(200, issue_data(status='Closed'))
+
+        result = JiraInterface.get_jira_issue('OPA-1', force_refresh=True)
+
+        self.assertEqual('Closed', result.status)
+        self.assertEqual('Closed', self.cache.get('OPA-1')[0]['fields']['status']['name'])
+
+    def test_getJiraIssue_staleEntryUnchangedOnJira_CachedIssueIsServed(self):
+        self.cache.put(issue_data())
+        self.client.get.return_value = response(200, {'fields': {'updated': issue_data()['fields']['updated']}})
+
+        with patch('webnotes.IssueCache.time.time', return_value=time.time() + 61):
+            result = JiraInterface.get_jira_issue('OPA-1')
+            self.assertTrue(self.cache.get('OPA-1')[1])
+
+        self.assertEqual('Open', result.status)
+        self.assertEqual(1, self.client.get.call_count)
+        self.assertEqual({'fields': 'updated'}, self.client.get.call_args.kwargs['params'])
+
+    def test_getJiraIssue_staleEntryChangedOnJira_IssueIsRefetched(self):
+        self.cache.put(issue_data())
+        self.client.get.side_effect = [response(200, {'fields': {'updated': '2024-02-01T10:00:00.000+0100'}}),
+                                       response(200, issue_data(status='Closed'))]
+
+        with patch('webnotes.IssueCache.time.time', return_value=time.time() + 61):
+            result = JiraInterface.get_jira_issue('OPA-1')
+
+        self.assertEqual('Closed', result.status)
+        self.assertEqual(2, self.client.get.call_count)
+
+    def test_transitionIssue_success_CachedIssueIsInvalidated(self):
+        self.cache.put(issue_data())
+        self.client.post.return_value = response(204)
+
+        result = JiraInterface.transition_issue('OPA-1', '151')
+
+        self.assertEqual('OPA-1', result)
+        self.assertIsNone(self.cache.get('OPA-1'))
+
+    def test_transitionIssue_failure_CachedIssueIsKept(self):
+        self.cache.put(issue_data())
+        self.client.post.return_value = MagicMock(status_code=400, text='error')
+
+        JiraInterface.transition_issue('OPA-1', '151')
+
+        self.assertIsNotNone(self.cache.get('OPA-1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
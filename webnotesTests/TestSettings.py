@@ -0,0 +1,131 @@
+import configparser
+import os
+import shutil
+import unittest
+from unittest.mock import patch
+
+from webnotes import JiraInterface, Settings, TopicClassifier
+from webnotes.Settings import get_settings
+
+
+def write_config(path, content, mtime):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(content)
+    os.utime(path, (mtime, mtime))
+
+
+class TestSettings(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.mkdir('temp')
+        self.config_path = os.path.join('temp', 'config.ini')
+
+    def tearDown(self):
+        shutil.rmtree('temp')
+
+    def test_getSettings_unchangedFile_CachedSettingsAreReturned(self):
+        write_config(self.config_path, '[API]\njira_board_id = 1\n', 1000000000)
+        settings = get_settings(self.config_path)
+
+        self.assertIs(settings, get_settings(self.config_path))
+        self.assertEqual('1', settings.get('API', 'jira_board_id'))
+
+    def test_getSettings_fileEdited_NewValuesAreLoaded(self):
+        write_config(self.config_path, '[API]\njira_board_id = 1\n', 1000000000)
+        get_settings(self.config_path)
+
+        write_config(self.config_path, '[API]\njira_board_id = 2\n[CACHE]\nttl = 60\n', 1000000001)
+        settings = get_settings(self.config_path)
+
+        self.assertEqual(2, settings.getint('API', 'jira_board_id'))
+        self.assertEqual(60.0, settings.getfloat('CACHE', 'ttl'))
+
+    def test_getSettings_missingFile_BehavesLikeEmptyConfigParser(self):
+        settings = get_settings(os.path.join('temp', 'missing.ini'))
+        config = configparser.ConfigParser()
+        config.read(os.path.join('temp', 'missing.ini'))
+
+        self.assertEqual(config.has_section('API'), settings.has_section('API'))
+        self.assertEqual(config.get('API', 'jira_token', fallback='x'), settings.get('API', 'jira_token', fallback='x'))
+        self.assertEqual(config.getboolean('DAEMON', 'enabled', fallback=False),
+                         settings.getboolean('DAEMON', 'enabled', fallback=False))
+        self.assertRaises(configparser.NoSectionError, config.get, 'API', 'jira_token')
+        self.assertRaises(configparser.NoSectionError, settings.get, 'API', 'jira_token')
+
+    def test_getSettings_fileCreatedLater_FileIsLoaded(self):
+        self.assertFalse(get_settings(self.config_path).has_section('API'))
+
+        write_config(self.config_path, '[API]\njira_board_id = 1\n', 1000000000)
+
+        self.assertEqual('1', get_settings(self.config_path).get('API', 'jira_board_id'))
+
+    def test_get_missingOption_NoOptionErrorLikeConfigParser(self):
+        write_config(self.config_path, '[API]\njira_board_id = 1\n', 1000000000)
+
+        self.assertRaises(configparser.NoOptionError, get_settings(self.config_path).get, 'API', 'jira_token')
+        self.assertIsNone(get_settings(self.config_path).getint('API', 'pool_size', fallback=None))
+
+
+class TestReloadedSingletons(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.mkdir('temp')
+        self.config_path = os.path.join('temp', 'config.ini')
+        write_config(self.config_path, '[API]\njira_custom_domain = a.example\njira_email = e\njira_token = 1\n'
+                                       'jira_board_id = 1\n[CACHE]\nenabled = false\n[TOPICS]\ntopics = ATK\n',
+                     1000000000)
+        patchers = [
+            # other tests load a config of the same path and mtime
+            patch.dict(Settings._settings, clear=True),
+            patch('webnotes.JiraInterface.get_settings', side_effect=lambda: get_settings(self.config_path)),
+            patch.object(TopicClassifier, 'CONFIG_PATH', self.config_path),
+        ]
+        patchers += [patch.object(JiraInterface, name, None)
+                     for name in ('_client', '_issue_cache', '_transition_resolver')]
+        patchers.append(patch.object(TopicClassifier, '_default_classifier', None))
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree('temp')
+
+    def edit_config(self, old, new):
+        with open(self.config_path, 'r', encoding='utf-8') as file:
+            content = file.read()
+        write_config(self.config_path, content.replace(old, new), 1000000001)
+
+    def test_getClient_unchangedConfig_SameClient(self):
+        self.assertIs(JiraInterface.get_client(), JiraInterface.get_client())
+
+    def test_getClient_configEdited_ClientIsCreatedAgain(self):
+        client = JiraInterface.get_client()
+
+        self.edit_config('a.example', 'b.example')
+
+        self.assertIsNot(client, JiraInterface.get_client())
+        self.assertEqual('https://b.example', JiraInterface.get_client().base_url)
+
+    def test_getIssueCache_cacheEnabledInConfig_CacheIsCreated(self):
+        self.assertIsNone(JiraInterface.get_issue_cache())
+        resolver = JiraInterface.get_transition_resolver()
+
+        self.edit_config('enabled = false', f'enabled = true\npath = {os.path.join("temp", "cache.sqlite")}')
+
+        self.assertIsNotNone(JiraInterface.get_issue_cache())
+        self.assertIsNot(resolver, JiraInterface.get_transition_resolver())
+        self.assertEqual(os.path.join('temp', 'cache.sqlite'), JiraInterface.get_transition_resolver().path)
+
+    def test_getDefaultClassifier_topicsEdited_NewTopicsAreUsed(self):
+        classifier = TopicClassifier.get_default_classifier()
+        self.assertIs(classifier, TopicClassifier.get_default_classifier())
+
+        self.edit_config('topics = ATK', 'topics = ETK')
+
+        self.assertEqual(['ETK'], TopicClassifier.get_default_classifier().topics)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import csv
+import io
+import os
+import shutil
+import unittest
+from unittest.mock import patch
+
+from webnotes import Settings, SpReport
+from webnotes.NotesInterface import NotesInterface
+
+
+def write_note(folder, name, properties, body='Body\n'):
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, name)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('---\n' + ''.join(f'{key}: {value}\n' for key, value in properties.items()) + '---\n' + body)
+    return path
+
+
+def note(total_sp, sp_done, initiative='ATK', status='Open'):
+    return {'path': '', 'issue_key': '', 'total_sp': total_sp, 'sp_done': sp_done, 'initiative': initiative,
+            'status': status}
+
+
+class TestSpReport(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.mkdir('temp')
+        self.jira_folder = os.path.join('temp', 'jira')
+
+    def tearDown(self):
+        shutil.rmtree('temp')
+
+    def test_aggregate_severalNotes_SumsPerSprintInitiativeAndStatus(self):
+        notes = [note(5, {377: 2, 378: 1}, 'ATK', 'In Progress'), note(3, {378: 3}, 'ETK', 'Done'),
+                 note(None, {}, 'ATK', 'Open')]
+
+        report = SpReport.aggregate(notes, current_sprint=378)
+
+        self.assertEqual(378, report['current_sprint'])
+        self.assertEqual({'notes': 3, 'total_sp': 8, 'done_sp': 6, 'remaining_sp': 2}, report['totals'])
+        self.assertEqual({377: {'notes': 1, 'done_sp': 2}, 378: {'notes': 2, 'done_sp': 4}}, report['sprints'])
+        self.assertEqual({'notes': 2, 'total_sp': 5, 'done_sp': 3, 'remaining_sp': 2}, report['initiatives']['ATK'])
+        self.assertEqual({'notes': 1, 'total_sp': 3, 'done_sp': 3, 'remaining_sp': 0}, report['statuses']['Done'])
+
+    def test_aggregate_moreDoneThanTotal_RemainingIsNotNegative(self):
+        report = SpReport.aggregate([note(2, {377: 5})], current_sprint=377)
+
+        self.assertEqual(0, report['totals']['remaining_sp'])
+
+    def test_readNoteSp_noStatusProperty_StatusIsDerivedFromSp(self):
+        path = write_note(self.jira_folder, 'a.md', {'jira-link': 'https://x/browse/OPA-1', 'Total-SP': '"5"',
+                                                     'SP-done': '"377: 2"', 'Initiative': '"ATK"'})
+
+        result = SpReport.read_note_sp(path)
+
+        self.assertEqual('OPA-1', result['issue_key'])
+        self.assertEqual(5, result['total_sp'])
+        self.assertEqual({377: 2}, result['sp_done'])
+        self.assertEqual('ATK', result['initiative'])
+        self.assertEqual('In Progress', result['status'])
+
+    def test_readNoteSp_noJiraLink_None(self):
+        path = write_note(self.jira_folder, 'a.md', {'link': 'https://x'})
+
+        self.assertIsNone(SpReport.read_note_sp(path))
+
+    def test_scanNotes_symlinkBackToFolder_NotesAreReadOnce(self):
+        write_note(os.path.join(self.jira_folder, 'sub'), 'a.md', {'jira-link': 'https://x/browse/OPA-1'})
+        write_note(self.jira_folder, 'b.md', {'jira-link': 'https://x/browse/OPA-2', 'Status': 'Done'})
+        os.symlink(os.path.abspath(self.jira_folder), os.path.join(self.jira_folder, 'sub', 'loop'))
+
+        notes = SpReport.scan_notes([self.jira_folder, os.path.join('temp', 'missing')])
+
+        self.assertEqual(['OPA-1', 'OPA-2'], sorted(note['issue_key'] for note in notes))
+        self.assertEqual({'Unknown', 'Done'}, {note['status'] for note in notes})
+
+    def test_toCsv_report_OneRowPerGroup(self):
+        report = SpReport.aggregate([note(5, {378: 2})], current_sprint=378)
+
+        rows = list(csv.reader(io.StringIO(SpReport.to_csv(report))))
+
+        self.assertEqual(['group', 'name', 'notes', 'total_sp', 'done_sp', 'remaining_sp'], rows[0])
+        self.assertEqual(['total', '', '1', '5', '2', '3'], rows[1])
+        self.assertEqual(['sprint', '378 (current)', '1', '', '2', ''], rows[2])
+        self.assertEqual(['initiative', 'ATK', '1', '5', '2', '3'], rows[3])
+
+    def test_getJiraFolders_configuredFolders_PrFolderIsIncluded(self):
+        with open(os.path.join('temp', 'config.ini'), 'w', encoding='utf-8') as file:
+            file.write('[OPTIONS]\npath = vault\njira_template_path = t\njira_folder_name = Jira\n'
+                       'jira_sup_template_path = t\njira_sup_folder_name = Jira-Sup\n'
+                       'jira_pr_template_path = t\njira_pr_folder_name = Jira-PR\nindex_path = vault\n')
+
+        with patch.dict(Settings._settings, clear=True):
+            folders = NotesInterface('temp').get_jira_folders()
+
+        self.assertEqual([os.path.join('vault', 'Jira'), os.path.join('vault', 'Jira-Sup'),
+                          os.path.join('vault', 'Jira-PR')], folders)
+
+
+if __name__ == '__main__':
+    unittest.main()
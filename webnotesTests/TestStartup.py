@@ -0,0 +1,22 @@
+import subprocess
+import sys
+import unittest
+
+from StartupBenchmark import HEAVY_MODULES, PROJECT_ROOT, SHARED_MODULES, get_workflow_modules
+
+
+def get_heavy_imports(module):
+    code = f'import sys, {module}; print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    process = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return [name for name in process.stdout.strip().split(',') if name]
+
+
+class TestStartup(unittest.TestCase):
+    def test_import_workflowScripts_NoHeavyModuleIsImported(self):
+        for module in get_workflow_modules() + SHARED_MODULES:
+            with self.subTest(module=module):
+                self.assertEqual([], get_heavy_imports(module))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from webnotes.TopicClassifier import DEFAULT_MEMO_TTL, TopicClassifier
+
+
+class TestTopicClassifier(unittest.TestCase):
+    def setUp(self):
+        self.testee = TopicClassifier(['ATK', 'ETK', 'Sorting'], {'Sortierung': 'Sorting'})
+
+    def test_classify_topicInParentSummary_TopicIsReturned(self):
+        result = self.testee.classify('OPA-1', 'Epic about etk things', 'Some story')
+
+        self.assertEqual(result, 'ETK')
+
+    def test_classify_multipleTopicsInParentSummary_HighestPriorityIsReturned(self):
+        result = self.testee.classify('OPA-1', 'ETK and ATK', 'Some story')
+
+        self.assertEqual(result, 'ATK')
+
+    def test_classify_noTopicInParentSummary_StorySummaryIsUsedAsFallback(self):
+        result = self.testee.classify('OPA-1', 'Some epic', 'Story about ATK')
+
+        self.assertEqual(result, 'ATK')
+
+    def test_classify_noTopicAtAll_NoneIsReturned(self):
+        result = self.testee.classify('OPA-1', 'Some epic', 'Some story')
+
+        self.assertIsNone(result)
+
+    def test_classify_aliasInParentSummary_CanonicalTopicIsReturned(self):
+        result = self.testee.classify('OPA-1', 'Neue Sortierung', 'Some story')
+
+        self.assertEqual(result, 'Sorting')
+
+    def test_classify_sameParentKey_ParentResultIsMemoized(self):
+        self.testee.classify('OPA-1', 'ATK epic', 'Some story')
+
+        result = self.testee.classify('OPA-1', 'changed summary', 'Some story')
+
+        self.assertEqual(result, 'ATK')
+
+    def test_classify_memoizedTopicExpired_ParentIsClassifiedAgain(self):
+        self.testee.classify('OPA-1', 'ATK epic', 'Some story')
+
+        with patch('webnotes.TopicClassifier.time.monotonic', return_value=time.monotonic() + DEFAULT_MEMO_TTL + 1):
+            result = self.testee.classify('OPA-1', 'ETK epic', 'Some story')
+
+        self.assertEqual(result, 'ETK')
+
+    def test_classify_moreParentsThanMemoSize_LeastRecentlyUsedIsDropped(self):
+        testee = TopicClassifier(['ATK', 'ETK'], memo_size=2)
+        testee.classify('OPA-1', 'ATK epic', 'Some story')
+        testee.classify('OPA-2', 'ATK epic', 'Some story')
+        testee.classify('OPA-1', 'ignored', 'Some story')
+
+        testee.classify('OPA-3', 'ATK epic', 'Some story')
+
+        self.assertEqual(['OPA-1', 'OPA-3'], list(testee._parent_topics))
+        self.assertEqual(testee.classify('OPA-2', 'ETK epic', 'Some story'), 'ETK')
+
+    def test_clear_memoizedTopic_ParentIsClassifiedAgain(self):
+        self.testee.classify('OPA-1', 'ATK epic', 'Some story')
+
+        self.testee.clear()
+
+        self.assertEqual(self.testee.classify('OPA-1', 'ETK epic', 'Some story'), 'ETK')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import shutil
+import sqlite3
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from webnotes.TransitionResolver import TransitionResolver
+
+TRANSITIONS = [
+    {'id': '11', 'name': 'Done', 'to': {'name': 'Closed'}},
+    {'id': '21', 'name': 'Finish', 'to': {'name': 'Done'}},
+    {'id': '31', 'name': 'Start Progress', 'to': {'name': 'In Progress'}},
+]
+
+
+def issue(key='OPA-1', issue_type='Story', status='Open'):
+    return SimpleNamespace(key=key, issue_type=issue_type, status=status)
+
+
+class TestTransitionResolver(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.mkdir('temp')
+        self.path = os.path.join('temp', 'transitions.sqlite')
+        self.get_transitions = MagicMock(return_value=TRANSITIONS)
+        self.testee = TransitionResolver(self.path, self.get_transitions)
+
+    def tearDown(self):
+        shutil.rmtree('temp')
+
+    def test_resolve_transitionNameEqualsOtherTargetStatus_TargetStatusWins(self):
+        self.assertEqual('21', self.testee.resolve(issue(), 'Done'))
+        self.assertEqual('11', self.testee.resolve(issue(), 'closed'))
+
+    def test_resolve_onlyTransitionNameMatches_TransitionIdIsReturned(self):
+        self.assertEqual('31', self.testee.resolve(issue(), 'Start Progress'))
+
+    def test_resolve_unknownTarget_NoneIsReturned(self):
+        self.assertIsNone(self.testee.resolve(issue(), 'Rejected'))
+
+    def test_resolve_sameWorkflowState_TransitionsAreFetchedOnce(self):
+        self.testee.resolve(issue('OPA-1'), 'Closed')
+        self.testee.resolve(issue('OPA-2'), 'Closed')
+
+        self.get_transitions.assert_called_once_with('OPA-1')
+
+    def test_resolve_otherStatusOrIssueType_TransitionsAreFetchedAgain(self):
+        self.testee.resolve(issue('OPA-1'), 'Closed')
+        self.testee.resolve(issue('OPA-2', status='In Progress'), 'Closed')
+        self.testee.resolve(issue('OPA-3', issue_type='Bug'), 'Closed')
+
+        self.assertEqual(3, self.get_transitions.call_count)
+
+    def test_resolve_newResolverOnSameFile_MappingIsReadFromDisk(self):
+        self.testee.resolve(issue(), 'Closed')
+        get_transitions = MagicMock()
+
+        result = TransitionResolver(self.path, get_transitions).resolve(issue('OPA-2'), 'Done')
+
+        self.assertEqual('21', result)
+        get_transitions.assert_not_called()
+
+    def test_resolve_getTransitionsFails_EmptyMappingIsNotCached(self):
+        self.get_transitions.return_value = []
+        self.assertIsNone(self.testee.resolve(issue(), 'Closed'))
+
+        self.get_transitions.return_value = TRANSITIONS
+        self.assertEqual('11', self.testee.resolve(issue(), 'Closed'))
+
+        self.assertEqual(2, self.get_transitions.call_count)
+        self.assertEqual('11', TransitionResolver(self.path, MagicMock()).resolve(issue(), 'Closed'))
+
+    def test_forget_cachedState_TransitionsAreFetchedAgain(self):
+        self.testee.resolve(issue(), 'Closed')
+
+        self.testee.forget(issue())
+        self.testee.resolve(issue(), 'Closed')
+
+        self.assertEqual(2, self.get_transitions.call_count)
+        connection = sqlite3.connect(self.path)
+        self.assertEqual(1, connection.execute('SELECT COUNT(*) FROM transitions').fetchone()[0])
+        connection.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
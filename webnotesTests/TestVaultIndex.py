@@ -0,0 +1,58 @@
+import os
+import shutil
+import unittest
+
+from webnotes.VaultIndex import VaultIndex
+
+
+def touch(*parts):
+    path = os.path.join('temp', *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8'):
+        pass
+
+
+class TestVaultIndex(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.mkdir('temp')
+        touch('Jira-Issues', 'OPA-123 Story - Jira.md')
+        touch('notes', 'deep', 'Some note.md')
+        self.cache_path = os.path.join('temp', 'vault_index.json')
+
+    def tearDown(self):
+        shutil.rmtree('temp')
+
+    def test_find_nestedNote_RelativePathIsReturned(self):
+        testee = VaultIndex('temp')
+
+        self.assertEqual('notes/deep/Some note.md', testee.find(['Other.md', 'Some note.md']))
+        self.assertIsNone(testee.find(['Other.md']))
+
+    def test_findJira_issueKeyPrefix_NoteIsFound(self):
+        testee = VaultIndex('temp')
+
+        self.assertEqual('Jira-Issues/OPA-123 Story - Jira.md', testee.find_jira('OPA-123'))
+        self.assertIsNone(testee.find_jira('OPA-12'))
+
+    def test_find_noteMovedAfterIndexing_IndexIsRefreshed(self):
+        testee = VaultIndex('temp', self.cache_path)
+        testee.find(['Some note.md'])
+
+        os.rename(os.path.join('temp', 'notes', 'deep', 'Some note.md'), os.path.join('temp', 'notes', 'Some note.md'))
+
+        self.assertEqual('notes/Some note.md', VaultIndex('temp', self.cache_path).find(['Some note.md']))
+        self.assertEqual('notes/Some note.md', testee.find(['Some note.md']))
+
+    def test_refresh_symlinkBackToRoot_NotesAreIndexedOnce(self):
+        os.symlink(os.path.abspath('temp'), os.path.join('temp', 'notes', 'loop'))
+        testee = VaultIndex('temp')
+
+        testee.refresh()
+
+        self.assertEqual({'Jira-Issues/OPA-123 Story - Jira.md', 'notes/deep/Some note.md'}, testee.paths())
+
+
+if __name__ == '__main__':
+    unittest.main()
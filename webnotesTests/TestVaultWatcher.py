@@ -0,0 +1,42 @@
+import os
+import shutil
+import unittest
+
+from webnotes.IndexStore import TextIndexStore
+from webnotes.VaultWatcher import VaultWatcher
+
+
+class TestVaultWatcher(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists('temp'):
+            shutil.rmtree('temp')
+        os.makedirs(os.path.join('temp', 'notes'))
+        self.store = TextIndexStore(os.path.join('temp', 'index.txt'))
+        self.store.write({'www.a.com': 'a.md', 'www.b.com': 'b.md'})
+        self.testee = VaultWatcher(os.path.join('temp', 'notes'), self.store, debounce=60)
+
+    def tearDown(self):
+        shutil.rmtree('temp')
+
+    def test_applyDiff_movedAndDeletedNotes_IndexIsUpdatedOnFlush(self):
+        self.testee.apply_diff({'a.md', 'b.md'}, {'archive/a.md'})
+
+        self.assertFalse(self.testee.flush())
+        self.assertEqual({'www.a.com': 'a.md', 'www.b.com': 'b.md'}, self.store.get())
+
+        self.assertTrue(self.testee.flush(force=True))
+        self.assertEqual({'www.a.com': 'archive/a.md'}, TextIndexStore(self.store.path).get())
+
+    def test_onCreated_noteWithLinkHeader_NoteIsIndexed(self):
+        full_path = os.path.join('temp', 'notes', 'c.md')
+        with open(full_path, 'w', encoding='utf-8') as file:
+            file.write('---\nlink: www.c.com?x=1\n---\n')
+
+        self.testee.on_created(full_path)
+        self.testee.flush(force=True)
+
+        self.assertEqual('c.md', self.store.lookup('www.c.com'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -40,6 +40,9 @@ class TestWebnotes(unittest.TestCase):
     def tearDown(self):
         # reset index file
         os.remove('index.txt')
+        for filename in ['vault_index.json', 'index.txt.lock']:
+            if os.path.exists(filename):
+                os.remove(filename)
         # empty temp folder
         shutil.rmtree('temp')
 